@@ -1,95 +1,53 @@
 import os
 import subprocess
+from indice_busqueda import normalizar
+from reglas_parametros import ReglasParametros
+from deteccion_instalador import MSI
 
-def filter_aplicaciones(aplicaciones, filtro):
-    """Devuelve una lista de tuplas (nombre, ruta) filtradas por `filtro` (insensible a mayúsculas)."""
+_reglas_parametros = None
+
+def filter_aplicaciones(aplicaciones, filtro, indice=None):
+    """Devuelve una lista de tuplas (nombre, ruta) filtradas por `filtro` (insensible a mayúsculas y acentos).
+
+    Cada palabra del filtro debe aparecer en el nombre o en la ruta. Con un
+    `IndiceBusqueda` del mismo catálogo se evita recorrer todas las entradas.
+    """
     if not aplicaciones:
         return []
-    filtro = (filtro or '').strip().lower()
+    if indice is not None and indice.aplicaciones is aplicaciones:
+        return indice.filtrar(filtro)
+    palabras = normalizar(filtro).split()
     resultado = []
     for nombre, ruta in aplicaciones.items():
-        if not filtro:
+        if not palabras:
             resultado.append((nombre, ruta))
         else:
-            if filtro in nombre.lower() or filtro in (ruta or '').lower():
+            texto = f"{normalizar(nombre)}\n{normalizar(ruta)}"
+            if all(palabra in texto for palabra in palabras):
                 resultado.append((nombre, ruta))
     return resultado
 
-def obtener_parametros_silenciosos(ruta_instalador):
+def cargar_reglas_parametros(adicional=None):
+    """(Re)compila las reglas de parámetros silenciosos con los ajustes de config.json"""
+    global _reglas_parametros
+    _reglas_parametros = ReglasParametros(adicional=adicional)
+    return _reglas_parametros
+
+def obtener_parametros_silenciosos(ruta_instalador, tecnologia=None):
     """Devuelve parámetros ultra-silenciosos forzados"""
-    nombre_archivo = os.path.basename(ruta_instalador).lower()
-    
-    # PARÁMETROS MÁS AGRESIVOS PARA FORZAR SILENCIO
-    parametros_ultra_silenciosos = {
-        # Navegadores
-        'chrome': ['--silent', '--install', '--force', '--do-not-launch-chrome'],
-        'googlechrome': ['--silent', '--install', '--force', '--do-not-launch-chrome'],
-        'firefox': ['-ms', '-ma'],
-        'brave': ['--silent', '--install', '--do-not-launch-brave'],
-        'opera': ['/silent', '/install', '/launchopera=0'],
-        
-        # Suite Adobe
-        'adobereader': ['/sAll', '/rs', '/rps', '/msi', '/quiet', '/norestart', '/suppressmsg'],
-        'acrord': ['/sAll', '/rs', '/rps', '/msi', '/quiet', '/norestart', '/suppressmsg'],
-        'acrobat': ['/sAll', '/rs', '/rps', '/msi', '/quiet', '/norestart', '/suppressmsg'],
-        
-        # Compresores
-        'winrar': ['/S', '/D=C:\\Program Files\\WinRAR'],
-        'rar': ['/S', '/D=C:\\Program Files\\WinRAR'],
-        '7z': ['/S', '/D=C:\\Program Files\\7-Zip'],
-        '7zip': ['/S', '/D=C:\\Program Files\\7-Zip'],
-        
-        # Multimedia
-        'vlc': ['/S', '/quiet', '/norestart', '/no-run'],
-        'codec': ['/S', '/quick', '/silent'],
-        
-        # Utilidades
-        'notepad++': ['/S', '/D=C:\\Program Files\\Notepad++'],
-        'python': ['/quiet', 'InstallAllUsers=1', 'PrependPath=1', 'Include_test=0', 'AssociateFiles=0', 'Shortcuts=0'],
-        'java': ['INSTALL_SILENT=1', 'STATIC=0', 'WEB_JAVA=0', 'WEB_JAVA_SECURITY_LEVEL=H', 'AUTO_UPDATE=0'],
-        
-        # Comunicación
-        'zoom': ['/quiet', '/norestart', '/nogoogle'],
-        'teams': ['-s', '--disable-auto-start'],
-        'discord': ['--silent', '--do-not-run'],
-        
-        # Office
-        'office': ['/quiet', '/norestart', '/config', 'config.xml'],
-        '365': ['/quiet', '/norestart', '/config', 'config.xml'],
-        
-        # Aplicaciones específicas
-        'polichequeos': ['/VERYSILENT', '/SUPPRESSMSGBOXES', '/NORESTART', '/SP-'],
-        'biocom': ['/VERYSILENT', '/SUPPRESSMSGBOXES', '/NORESTART', '/SP-'],
-        'tablero': ['/VERYSILENT', '/SUPPRESSMSGBOXES', '/NORESTART', '/SP-'],
-        'ergo': ['/VERYSILENT', '/SUPPRESSMSGBOXES', '/NORESTART', '/SP-'],
-        'trii': ['/VERYSILENT', '/SUPPRESSMSGBOXES', '/NORESTART', '/SP-'],
-        'vnc': ['/VERYSILENT', '/SUPPRESSMSGBOXES', '/NORESTART', '/SP-'],
-        'openvpn': ['/VERYSILENT', '/SUPPRESSMSGBOXES', '/NORESTART', '/SP-'],
-    }
-    
-    # Buscar parámetros específicos
-    for clave, parametros in parametros_ultra_silenciosos.items():
-        if clave in nombre_archivo:
-            return [ruta_instalador] + parametros
-    
-    # PARÁMETROS POR DEFECTO SUPER AGRESIVOS
-    parametros_por_defecto = [
-        '/VERYSILENT',           # Muy silencioso
-        '/SUPPRESSMSGBOXES',     # Suprimir todos los mensajes
-        '/NORESTART',            # No reiniciar
-        '/SP-',                  # No mostrar "este programa es confiable"
-        '/NOCANCEL',             # No permitir cancelar
-        '/CLOSEAPPLICATIONS',    # Cerrar aplicaciones si es necesario
-        '/RESTARTAPPLICATIONS',  # Reiniciar aplicaciones después
-        '/LOG',                  # Log para debugging
-        '/ALLUSERS',             # Instalar para todos los usuarios
-    ]
-    
-    return [ruta_instalador] + parametros_por_defecto
+    reglas = _reglas_parametros or cargar_reglas_parametros()
+    # Reglas en parametros_silenciosos.json: gana la más específica; si ninguna
+    # coincide se usan los de la tecnología detectada o los por defecto (estilo Inno Setup)
+    parametros = list(reglas.parametros_para(os.path.basename(ruta_instalador).lower(), tecnologia))
+    if tecnologia == MSI:
+        # Los paquetes de Windows Installer se lanzan a través de msiexec
+        accion = '/p' if ruta_instalador.lower().endswith('.msp') else '/i'
+        return ['msiexec', accion, ruta_instalador] + parametros
+    return [ruta_instalador] + parametros
 
-def preparar_instalacion_especifica(app_name, ruta):
+def preparar_instalacion_especifica(app_name, ruta, tecnologia=None):
     """Prepara la configuración de instalación forzando modo silencioso"""
-    parametros = obtener_parametros_silenciosos(ruta)
+    parametros = obtener_parametros_silenciosos(ruta, tecnologia)
     
     # Timeout más largo para instalaciones silenciosas
     timeout = 600  # 10 minutos
@@ -97,7 +55,7 @@ def preparar_instalacion_especifica(app_name, ruta):
     return {
         'parametros': parametros,
         'timeout': timeout,
-        'flags': subprocess.CREATE_NO_WINDOW  # Flag para NO crear ventana
+        'flags': getattr(subprocess, 'CREATE_NO_WINDOW', 0)  # Flag para NO crear ventana (solo Windows)
     }
 
 # Funciones de compatibilidad (mantener por si acaso)
@@ -1,19 +1,23 @@
-import subprocess
-import ctypes
 import socket
+import logging
 import tkinter as tk
 from tkinter import ttk, messagebox
-import getpass
+from sondeos_inicio import SondeosInicio
+from shell_persistente import shell_compartido
+
+logger = logging.getLogger(__name__)
 
 
 class AutenticacionCredenciales:
     """Maneja la autenticación de credenciales de dominio y administrador
     (Extraída desde `instalador_app.py` para modularidad)."""
-    def __init__(self, root):
+    def __init__(self, root, configuracion=None):
         self.root = root
         self.credenciales_dominio = None
         self.credenciales_admin = None
         self.hostname = socket.gethostname()
+        # Los sondeos del equipo empiezan ya, en paralelo, mientras se construye la ventana
+        self.sondeos = SondeosInicio.desde_configuracion(configuracion).iniciar()
         self.colores = {
             'bg': '#f1f5f9',
             'card_bg': '#ffffff',
@@ -34,112 +38,31 @@ class AutenticacionCredenciales:
                 f"(ConvertTo-SecureString '{password.replace(chr(39), chr(39)+chr(39))}' -AsPlainText -Force));"
                 f"$proc = Start-Process -FilePath 'cmd.exe' -ArgumentList '/c','echo test' "
                 f"-Credential $cred -Wait -PassThru -WindowStyle Hidden -RedirectStandardOutput NUL;"
-                f"exit $proc.ExitCode"
-            )
-
-            proceso = subprocess.Popen(
-                ['powershell.exe', '-NoProfile', '-Command', script_test],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                shell=False,
-                creationflags=subprocess.CREATE_NO_WINDOW
+                f"$global:LASTEXITCODE = $proc.ExitCode"
             )
 
-            stdout, stderr = proceso.communicate(timeout=5)
-            return proceso.returncode == 0
+            # PowerShell ya arrancado (ver `shell_persistente`): el timeout solo cubre la validación
+            shell = shell_compartido()
+            if not shell.ping(timeout=30):
+                return False
+            return shell.ejecutar(script_test, timeout=5)['codigo'] == 0
         except:
             return False
 
-    def _has_stored_credential_for_server(self, server_ip='10.99.8.108', share_path='\\\\10.99.8.108\\aplicaciones'):
-        """Comprueba si en Credential Manager hay una entrada relacionada con el servidor
-        y si esa entrada permite acceder al share indicado (Test-Path).
-        Devuelve True si existe credencial almacenada y la ruta es accesible."""
-        try:
-            # Listar credenciales guardadas
-            proc = subprocess.run(['cmdkey', '/list'], capture_output=True, text=True)
-            out = (proc.stdout or '') + (proc.stderr or '')
-            # DEBUG: mostrar salida de cmdkey para diagnóstico
-            print(f"[DEBUG][auth] cmdkey output:\n{out}")
-            # Buscamos específicamente si hay una credencial para el dominio ua\
-            # porque la política requiere credenciales del dominio 'ua\<usuario>'
-            has_ua = 'ua\\' in out.lower() or 'ua\\' in out
-            has_server = server_ip in out or share_path in out
-            if (has_ua or has_server):
-                # Probar acceso al share usando PowerShell Test-Path
-                p = subprocess.run([
-                    'powershell.exe', '-NoProfile', '-Command',
-                    f"Test-Path '{share_path}'"
-                ], capture_output=True, text=True)
-                stdout = (p.stdout or '').strip().lower()
-                # DEBUG: mostrar resultado de Test-Path
-                print(f"[DEBUG][auth] Test-Path '{share_path}' -> {stdout}")
-                if 'true' in stdout:
-                    return True
-        except Exception:
-            pass
-        return False
+    def _has_stored_credential_for_server(self):
+        """Comprueba si en Credential Manager hay una credencial del dominio ua\\ (o del
+        servidor) y si con ella el share es accesible. Ver `SondeosInicio`."""
+        return self.sondeos.resultados()['credencial_dominio']
 
     def _get_current_whoami(self):
-        try:
-            p = subprocess.run(['whoami'], capture_output=True, text=True)
-            return (p.stdout or '').strip()
-        except Exception:
-            # Fallback a getpass
-            user = getpass.getuser()
-            try:
-                hostname = socket.gethostname()
-                return f"{hostname}\\{user}"
-            except Exception:
-                return user
+        return self.sondeos.resultados()['whoami']
 
     def _is_user_in_local_administrators(self):
         """Comprueba si el usuario actual pertenece al grupo de Administradores locales."""
-        # Primero intentar la verificación rápida y fiable
-        try:
-            if bool(ctypes.windll.shell32.IsUserAnAdmin()):
-                return True
-        except Exception:
-            # Si falla, continuamos con fallback textual
-            pass
-
-        try:
-            who = self._get_current_whoami()
-            # Obtener solo el nombre de cuenta (parte después de la barra invertida)
-            if '\\' in who:
-                account = who.split('\\', 1)[1]
-            else:
-                account = who
-
-            # Listar miembros del grupo Administrators (nombre en inglés puede diferir en sistemas localizados)
-            p = subprocess.run(['net', 'localgroup', 'Administrators'], capture_output=True, text=True)
-            out = (p.stdout or '').lower()
-            # Verificamos si aparece el nombre de cuenta completo o la parte simple
-            if account.lower() in out or who.lower() in out:
-                return True
-        except Exception:
-            pass
-
-        return False
+        return self.sondeos.resultados()['administrador_local']
 
     def mostrar_dialogo_autenticacion(self):
         """Muestra el diálogo de autenticación al iniciar la app"""
-        auth_window = tk.Toplevel(self.root)
-        auth_window.title("Autenticación Requerida")
-        auth_window.configure(bg=self.colores['bg'])
-        auth_window.resizable(False, False)
-
-        # Size and center on screen
-        width, height = 520, 380
-        auth_window.update_idletasks()
-        sw = auth_window.winfo_screenwidth()
-        sh = auth_window.winfo_screenheight()
-        x = (sw - width) // 2
-        y = (sh - height) // 2
-        auth_window.geometry(f"{width}x{height}+{x}+{y}")
-
-        auth_window.transient(self.root)
-        auth_window.grab_set()
-
         # Pre-checks: credencial ua\ en Credential Manager + acceso al share
         has_ua_cred = False
         try:
@@ -151,16 +74,12 @@ class AutenticacionCredenciales:
         try:
             is_local_admin = self._is_user_in_local_administrators()
         except Exception:
-            # Fallback a IsUserAnAdmin (elevado)
-            try:
-                is_local_admin = bool(ctypes.windll.shell32.IsUserAnAdmin())
-            except Exception:
-                is_local_admin = False
+            is_local_admin = False
 
         # Si ya existe credencial del dominio (ua\...) y el usuario local es admin,
-        # podemos continuar sin pedir credenciales.
-        # DEBUG: imprimir valores detectados antes de decidir
-        print(f"[DEBUG][auth] has_ua_cred={has_ua_cred}, is_local_admin={is_local_admin}, whoami={self._get_current_whoami()}")
+        # podemos continuar sin pedir credenciales (ni crear la ventana).
+        logger.debug(f"Comprobaciones previas: has_ua_cred={has_ua_cred}, is_local_admin={is_local_admin}, "
+                     f"whoami={self._get_current_whoami()}")
         if has_ua_cred and is_local_admin:
             self.credenciales_dominio = None
             # Usamos el usuario local actual sin contraseña (ejecución con usuario existente)
@@ -170,6 +89,23 @@ class AutenticacionCredenciales:
             }
             return True
 
+        auth_window = tk.Toplevel(self.root)
+        auth_window.title("Autenticación Requerida")
+        auth_window.configure(bg=self.colores['bg'])
+        auth_window.resizable(False, False)
+
+        # Size and center on screen
+        width, height = 520, 380
+        auth_window.update_idletasks()
+        sw = auth_window.winfo_screenwidth()
+        sh = auth_window.winfo_screenheight()
+        x = (sw - width) // 2
+        y = (sh - height) // 2
+        auth_window.geometry(f"{width}x{height}+{x}+{y}")
+
+        auth_window.transient(self.root)
+        auth_window.grab_set()
+
         # Header (centered)
         header_frame = tk.Frame(auth_window, bg=self.colores['primary'])
         header_frame.pack(fill=tk.X)
@@ -185,6 +121,9 @@ class AutenticacionCredenciales:
         # Decidir qué campos mostrar
         show_domain = not has_ua_cred
         show_admin = not is_local_admin
+        if show_admin:
+            # Arrancar PowerShell mientras el usuario escribe la contraseña
+            shell_compartido().iniciar_en_segundo_plano()
 
         # --- Dominio (mostrar solo si no hay credencial almacenada) ---
         if show_domain:
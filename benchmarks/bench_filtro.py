@@ -0,0 +1,69 @@
+"""Mide el filtrado de aplicaciones sobre un catálogo sintético.
+
+Uso: python benchmarks/bench_filtro.py [cantidad]
+"""
+import os
+import sys
+import random
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from apps_manager import filter_aplicaciones
+from indice_busqueda import IndiceBusqueda
+
+PALABRAS = ['Gestión', 'Configuración', 'Facturación', 'Nómina', 'Contabilidad', 'Cámara',
+            'Chrome', 'Firefox', 'Adobe', 'Reader', 'Office', 'Teams', 'Zoom', 'Python',
+            'Biocom', 'Tablero', 'Policheques', 'Ergo', 'OpenVPN', 'Código', 'Señal', 'Año']
+CONSULTAS = ['configuracion', 'nomina 2', 'chrome', 'zz', 'ad', 'cámara señal', 'xyzw']
+
+
+def generar_catalogo(cantidad, semilla=1):
+    aleatorio = random.Random(semilla)
+    catalogo = {}
+    for i in range(cantidad):
+        nombre = f"{aleatorio.choice(PALABRAS)} {aleatorio.choice(PALABRAS)} {i}"
+        carpeta = aleatorio.choice(PALABRAS).lower()
+        catalogo[nombre] = f"\\\\servidor\\instaladores\\{carpeta}\\setup_{i}.exe"
+    return catalogo
+
+
+def medir(funcion, repeticiones=50):
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - inicio) / repeticiones * 1000
+
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    catalogo = generar_catalogo(cantidad)
+
+    inicio = time.perf_counter()
+    indice = IndiceBusqueda(catalogo)
+    print(f"Catálogo: {cantidad} entradas, índice construido en {(time.perf_counter() - inicio) * 1000:.0f} ms")
+    print(f"{'consulta':<16}{'resultados':>11}{'lineal ms':>12}{'índice ms':>12}")
+    for consulta in CONSULTAS:
+        esperado = filter_aplicaciones(catalogo, consulta)
+        obtenido = filter_aplicaciones(catalogo, consulta, indice=indice)
+        assert esperado == obtenido, consulta
+        lineal = medir(lambda: filter_aplicaciones(catalogo, consulta), repeticiones=5)
+
+        def indexado():
+            indice._ultima_mascara = None  # Sin el atajo incremental
+            filter_aplicaciones(catalogo, consulta, indice=indice)
+        print(f"{consulta:<16}{len(obtenido):>11}{lineal:>12.2f}{medir(indexado):>12.3f}")
+
+    # Escritura letra a letra, como en el buscador
+    consulta = 'facturacion nomina'
+    tiempos = []
+    indice.buscar('')
+    for i in range(1, len(consulta) + 1):
+        inicio = time.perf_counter()
+        indice.filtrar(consulta[:i])
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    print(f"Tecleo de '{consulta}': máx {max(tiempos):.3f} ms, medio {sum(tiempos) / len(tiempos):.3f} ms por pulsación")
+
+
+if __name__ == '__main__':
+    main()
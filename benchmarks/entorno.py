@@ -0,0 +1,159 @@
+"""Entorno simulado para los benchmarks: instaladores de prueba, recurso
+compartido local con latencia y comandos de Windows falsos.
+
+Todo se crea dentro de un directorio temporal; nada depende de Windows ni
+del servidor real.
+"""
+import os
+import sys
+import stat
+import time
+import shutil
+import builtins
+import tempfile
+import contextlib
+
+# En POSIX el código de salida se trunca a 8 bits: 3010 llega como 194 y
+# 1618 como 82. La configuración de los benchmarks los clasifica igual.
+CODIGO_REINICIO = 3010 % 256
+CODIGO_REINTENTAR = 1618 % 256
+
+PLANTILLA_INSTALADOR = '''#!{python}
+import sys, time
+DURACION = {duracion!r}
+LINEAS = {lineas!r}
+CODIGO = {codigo!r}
+inicio = time.monotonic()
+for i in range(LINEAS):
+    print(f"[{{i}}] copiando componente {{i}} de {{LINEAS}}")
+restante = DURACION - (time.monotonic() - inicio)
+if restante > 0:
+    time.sleep(restante)
+sys.exit(CODIGO)
+'''
+
+# Comandos de Windows que el motor y la autenticación invocan. Cada uno
+# espera `<NOMBRE>_ESPERA` segundos (variable de entorno) antes de responder.
+SHIMS = {
+    'cmdkey': 'echo "Destino: Domain:target=10.99.8.108"; printf \'Usuario: ua\\\\adm\\n\'',
+    'net': 'case "$1" in localgroup) echo "Miembros"; echo "$(id -un)";; *) echo "Se ha completado el comando correctamente.";; esac',
+    'powershell': 'echo True',
+    'powershell.exe': 'echo True',
+    'whoami': 'printf \'equipo\\\\%s\\n\' "$(id -un)"',
+}
+
+
+def crear_instalador(directorio, nombre, duracion=0.0, lineas=0, codigo=0):
+    """Crea un instalador de prueba ejecutable (script Python con extensión .exe)"""
+    ruta = os.path.join(directorio, nombre)
+    with open(ruta, 'w', encoding='utf-8', newline='\n') as f:
+        f.write(PLANTILLA_INSTALADOR.format(python=sys.executable, duracion=duracion,
+                                            lineas=lineas, codigo=codigo))
+    os.chmod(ruta, os.stat(ruta).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    return ruta
+
+
+def crear_archivo(directorio, nombre, tamano_mb):
+    """Archivo de datos aleatorios (para medir copias de instaladores grandes)"""
+    os.makedirs(directorio, exist_ok=True)
+    ruta = os.path.join(directorio, nombre)
+    bloque = os.urandom(1024 * 1024)
+    with open(ruta, 'wb') as f:
+        for _ in range(tamano_mb):
+            f.write(bloque)
+    return ruta
+
+
+def crear_shims(directorio, esperas=None):
+    """Crea los comandos falsos (cmdkey, net, powershell, whoami) en `directorio`"""
+    os.makedirs(directorio, exist_ok=True)
+    for nombre, cuerpo in SHIMS.items():
+        variable = nombre.split('.')[0].upper() + '_ESPERA'
+        ruta = os.path.join(directorio, nombre)
+        with open(ruta, 'w', encoding='utf-8', newline='\n') as f:
+            f.write(f'#!/bin/sh\nsleep "${{{variable}:-{(esperas or {}).get(nombre, 0)}}}"\n{cuerpo}\n')
+        os.chmod(ruta, 0o755)
+    return directorio
+
+
+@contextlib.contextmanager
+def latencia_simulada(raiz, por_archivo=0.0, por_stat=0.0):
+    """Añade latencia a `open` y `os.stat` de las rutas bajo `raiz` (el recurso simulado).
+
+    Emula el coste de abrir y consultar archivos en un recurso SMB lento.
+    """
+    raiz = os.path.abspath(raiz)
+    abrir, consultar = builtins.open, os.stat
+
+    def en_recurso(ruta):
+        try:
+            return os.path.abspath(os.fspath(ruta)).startswith(raiz)
+        except TypeError:
+            return False  # Descriptores de archivo
+
+    def open_lento(ruta, *args, **kwargs):
+        if por_archivo and en_recurso(ruta):
+            time.sleep(por_archivo)
+        return abrir(ruta, *args, **kwargs)
+
+    def stat_lento(ruta, *args, **kwargs):
+        if por_stat and en_recurso(ruta):
+            time.sleep(por_stat)
+        return consultar(ruta, *args, **kwargs)
+
+    builtins.open, os.stat = open_lento, stat_lento
+    try:
+        yield
+    finally:
+        builtins.open, os.stat = abrir, consultar
+
+
+class EntornoSimulado:
+    """Directorio temporal con `recurso/` (el share), `datos/` (LOCALAPPDATA) y `bin/` (shims)"""
+
+    def __init__(self, esperas_shims=None, conservar=False):
+        self.base = tempfile.mkdtemp(prefix='bench_instalador_')
+        self.recurso = os.path.join(self.base, 'recurso')
+        self.datos = os.path.join(self.base, 'datos')
+        self.bin = os.path.join(self.base, 'bin')
+        self.conservar = conservar
+        for directorio in (self.recurso, self.datos):
+            os.makedirs(directorio)
+        crear_shims(self.bin, esperas_shims)
+        self._entorno_original = None
+
+    def __enter__(self):
+        self._entorno_original = {clave: os.environ.get(clave) for clave in ('PATH', 'LOCALAPPDATA', 'TEMP')}
+        os.environ['PATH'] = self.bin + os.pathsep + os.environ.get('PATH', '')
+        os.environ['LOCALAPPDATA'] = self.datos
+        os.environ['TEMP'] = self.datos
+        return self
+
+    def __exit__(self, *exc):
+        for clave, valor in self._entorno_original.items():
+            if valor is None:
+                os.environ.pop(clave, None)
+            else:
+                os.environ[clave] = valor
+        if not self.conservar:
+            shutil.rmtree(self.base, ignore_errors=True)
+
+    def instalador(self, nombre, subcarpeta='', **kwargs):
+        directorio = os.path.join(self.recurso, subcarpeta)
+        os.makedirs(directorio, exist_ok=True)
+        return crear_instalador(directorio, nombre, **kwargs)
+
+    def configuracion(self, aplicaciones, **secciones):
+        """config.json mínimo para el motor, con todo dentro del directorio temporal"""
+        configuracion = {
+            'aplicaciones': aplicaciones,
+            'cache': {'directorio': os.path.join(self.datos, 'cache')},
+            'planificacion': {'maximo_concurrente': 2, 'pausa_entre_instalaciones': 0,
+                              'reintentos': {'maximo': 1, 'espera_base': 0.1, 'espera_maxima': 0.1}},
+            'codigos_salida': {'comun': {'reinicio': [CODIGO_REINICIO], 'reintentar': [CODIGO_REINTENTAR]}},
+            'historial': {'ruta': os.path.join(self.datos, 'historial.db')},
+            'logs': {'directorio': os.path.join(self.datos, 'logs')},
+            'indice_recurso': {'raices': [self.recurso], 'ruta_indice': os.path.join(self.datos, 'indice.json')},
+        }
+        configuracion.update(secciones)
+        return configuracion
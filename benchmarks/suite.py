@@ -0,0 +1,328 @@
+"""Suite de benchmarks del instalador sobre un entorno simulado (funciona en Linux).
+
+Mide la cola completa, la copia a la caché, el filtrado, la reconstrucción
+de la lista, el arranque y el índice del recurso compartido, y guarda los
+resultados en JSON para comparar entre versiones.
+
+Uso: python benchmarks/suite.py [--rapido] [--solo cola,copia,...] [--salida archivo.json]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import subprocess
+from datetime import datetime
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+RAIZ = os.path.dirname(DIRECTORIO)
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, DIRECTORIO)
+
+from entorno import EntornoSimulado, latencia_simulada, crear_archivo, CODIGO_REINICIO
+
+MB = 1024 * 1024
+
+
+class AutenticacionPrueba:
+    credenciales_admin = {'usuario': 'equipo\\admin', 'password': 'prueba'}
+    credenciales_dominio = None
+
+
+def _eventos_silenciosos():
+    from motor_instalacion import EventosInstalacion
+
+    class EventosSilenciosos(EventosInstalacion):
+        def mostrar_mensaje(self, mensaje):
+            pass
+
+        def mostrar_resumen_instalacion(self, exitosos, fallidos, total, tiempos=None):
+            pass
+
+    return EventosSilenciosos()
+
+
+def _motor_sobre_recurso(entorno, aplicaciones, configuracion):
+    """Motor que trata `entorno.recurso` como el recurso compartido.
+
+    En Linux las rutas del entorno no son UNC, así que sin esto el motor las
+    daría por locales y la cola no pasaría por el prefetch, la caché ni la copia.
+    """
+    from motor_instalacion import MotorInstalacion
+
+    class MotorRecursoSimulado(MotorInstalacion):
+        def es_ruta_red(self, ruta):
+            return os.path.abspath(ruta).startswith(entorno.recurso + os.sep) or super().es_ruta_red(ruta)
+
+    return MotorRecursoSimulado(aplicaciones, configuracion, AutenticacionPrueba(), eventos=_eventos_silenciosos())
+
+
+def _percentil(valores, p):
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))]
+
+
+def _ms(segundos):
+    return round(segundos * 1000, 3)
+
+
+# ----------------------------------------------------------------------
+# Benchmarks
+# ----------------------------------------------------------------------
+def bench_cola(rapido):
+    """Tiempo de pared de una cola de instaladores de prueba frente a su duración pura.
+
+    Los instaladores están en el recurso simulado (con latencia), así que el
+    sobrecoste incluye traerlos a la caché local como en un equipo real.
+    """
+    duracion = 0.1 if rapido else 0.4
+    perfiles = [
+        ('Ligera', dict(duracion=duracion)),
+        ('Habladora', dict(duracion=duracion, lineas=5000 if rapido else 50000)),
+        ('Con reinicio', dict(duracion=duracion, codigo=CODIGO_REINICIO)),
+        ('Fallida', dict(duracion=duracion / 2, codigo=1)),
+    ] + [(f"App {i}", dict(duracion=duracion)) for i in range(2 if rapido else 8)]
+    with EntornoSimulado() as entorno:
+        aplicaciones = {nombre: entorno.instalador(f"app_{i}.exe", **opciones)
+                        for i, (nombre, opciones) in enumerate(perfiles)}
+        configuracion = entorno.configuracion(aplicaciones)
+        motor = _motor_sobre_recurso(entorno, aplicaciones, configuracion)
+        with latencia_simulada(entorno.recurso, por_archivo=0.02, por_stat=0.005):
+            inicio = time.perf_counter()
+            estados = motor.ejecutar_cola_instalacion_silenciosa(list(aplicaciones))
+            total = time.perf_counter() - inicio
+        cache = motor.cache.resumen_estadisticas()
+    # La fallida se ejecuta dos veces (usuario actual y broker elevado)
+    puro = sum(o['duracion'] for _, o in perfiles) + perfiles[3][1]['duracion']
+    return {
+        'apps': len(perfiles),
+        'segundos': round(total, 3),
+        'ejecucion_pura': round(puro, 3),
+        'sobrecoste_por_app_ms': _ms((total - puro) / len(perfiles)),
+        'estados': {estado: list(estados.values()).count(estado) for estado in set(estados.values())},
+        'reinicio_requerido': len(motor.reinicio_requerido),
+        'copias_a_cache': cache['fallos'],
+        'servidas_desde_cache': cache['aciertos'],
+    }
+
+
+def bench_copia(rapido):
+    """Copia de la red a la caché (fallo) y servicio desde la caché (acierto) con latencia simulada"""
+    from cache_instaladores import CacheInstaladores
+    tamanos = [8] if rapido else [16, 128]
+    resultados = []
+    with EntornoSimulado() as entorno:
+        cache = CacheInstaladores(directorio=os.path.join(entorno.datos, 'cache'))
+        for tamano in tamanos:
+            ruta = crear_archivo(os.path.join(entorno.recurso, 'grandes'), f"instalador_{tamano}mb.exe", tamano)
+            with latencia_simulada(entorno.recurso, por_archivo=0.05, por_stat=0.01):
+                inicio = time.perf_counter()
+                cache.obtener(ruta)
+                frio = time.perf_counter() - inicio
+                inicio = time.perf_counter()
+                cache.obtener(ruta)
+                caliente = time.perf_counter() - inicio
+            resultados.append({'mb': tamano, 'fallo_s': round(frio, 3),
+                               'mb_por_segundo': round(tamano / frio, 1), 'acierto_ms': _ms(caliente)})
+            cache.liberar()
+    return {'latencia_apertura_ms': 50, 'latencia_stat_ms': 10, 'archivos': resultados}
+
+
+def bench_filtro(rapido):
+    """Latencia de filter_aplicaciones con y sin índice"""
+    from apps_manager import filter_aplicaciones
+    from indice_busqueda import IndiceBusqueda
+    from bench_filtro import generar_catalogo, CONSULTAS
+    cantidad = 2000 if rapido else 10000
+    catalogo = generar_catalogo(cantidad)
+    inicio = time.perf_counter()
+    indice = IndiceBusqueda(catalogo)
+    construccion = time.perf_counter() - inicio
+
+    indexadas, lineales = [], []
+    for consulta in CONSULTAS:
+        for _ in range(10):
+            indice._ultima_mascara = None  # Sin el atajo incremental
+            inicio = time.perf_counter()
+            filter_aplicaciones(catalogo, consulta, indice=indice)
+            indexadas.append(time.perf_counter() - inicio)
+        inicio = time.perf_counter()
+        filter_aplicaciones(catalogo, consulta)
+        lineales.append(time.perf_counter() - inicio)
+    return {
+        'catalogo': cantidad,
+        'indice_construccion_ms': _ms(construccion),
+        'indice_p50_ms': _ms(statistics.median(indexadas)),
+        'indice_p95_ms': _ms(_percentil(indexadas, 95)),
+        'indice_max_ms': _ms(max(indexadas)),
+        'lineal_p50_ms': _ms(statistics.median(lineales)),
+    }
+
+
+def bench_lista(rapido):
+    """Reconstrucción de la lista virtual (necesita una pantalla para Tk)"""
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception as e:  # Sin tkinter o sin pantalla (p.ej. CI sin Xvfb)
+        return {'omitido': f"Tk no disponible: {e}"}
+    try:
+        from lista_virtual import ListaVirtualAplicaciones
+        from styles import setup_styles
+        from bench_filtro import generar_catalogo
+        root.withdraw()
+        colores = setup_styles(root)
+        lista = ListaVirtualAplicaciones(root, colores, esta_seleccionada=lambda app: False,
+                                         al_alternar=lambda app, valor: None)
+        root.update()
+        elementos = list(generar_catalogo(2000 if rapido else 10000).items())
+        tiempos = []
+        for i in range(20):
+            inicio = time.perf_counter()
+            lista.establecer_elementos(elementos[i % 2:])
+            root.update_idletasks()
+            tiempos.append(time.perf_counter() - inicio)
+        return {'elementos': len(elementos), 'reconstruccion_p50_ms': _ms(statistics.median(tiempos)),
+                'reconstruccion_max_ms': _ms(max(tiempos)), 'filas_creadas': len(lista.filas)}
+    finally:
+        root.destroy()
+
+
+def bench_arranque(rapido):
+    """Arranque en frío de la línea de comandos y sondeos de la autenticación"""
+    from sondeos_inicio import SondeosInicio
+    repeticiones = 3 if rapido else 7
+    esperas = {'cmdkey': 0.2, 'net': 0.3, 'whoami': 0.05}
+    with EntornoSimulado(esperas_shims=esperas) as entorno:
+        ruta_config = os.path.join(entorno.base, 'config.json')
+        with open(ruta_config, 'w', encoding='utf-8') as f:
+            json.dump(entorno.configuracion({'App': entorno.instalador('app.exe')}), f)
+
+        def medir_proceso(comando):
+            tiempos = []
+            for _ in range(repeticiones):
+                inicio = time.perf_counter()
+                subprocess.run(comando, cwd=RAIZ, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+                tiempos.append(time.perf_counter() - inicio)
+            return _ms(statistics.median(tiempos))
+
+        linea_comandos = medir_proceso([sys.executable, '-m', 'instalador_app', '--config', ruta_config, 'list'])
+        importar_motor = medir_proceso([sys.executable, '-c', 'import motor_instalacion'])
+
+        # Los mismos sondeos uno tras otro, como antes de lanzarlos en paralelo
+        serie = SondeosInicio(recurso=entorno.recurso)
+        inicio = time.perf_counter()
+        for sondeo in (serie._sondear_credencial, serie._sondear_recurso, serie._sondear_whoami,
+                       serie._sondear_grupo_administradores):
+            sondeo()
+        en_serie = time.perf_counter() - inicio
+
+        ruta_cache = os.path.join(entorno.datos, 'sondeos.json')
+        frio = SondeosInicio(recurso=entorno.recurso, ruta_cache=ruta_cache).iniciar()
+        frio.resultados()
+        caliente = SondeosInicio(recurso=entorno.recurso, ruta_cache=ruta_cache).iniciar()
+        caliente.resultados()
+    return {
+        'cli_list_ms': linea_comandos,
+        'importar_motor_ms': importar_motor,
+        'sondeos_en_serie_ms': _ms(en_serie),
+        'sondeos_frio_ms': _ms(frio.tiempos.get('total', 0)),
+        'sondeos_cache_ms': _ms(caliente.tiempos.get('cache', 0)),
+        'sondeos_resultado': frio.resultados(),
+    }
+
+
+def bench_indice_recurso(rapido):
+    """Escaneo completo e incremental del recurso simulado y resolución por nombre"""
+    from indice_recurso import IndiceRecurso
+    carpetas, por_carpeta = (20, 10) if rapido else (200, 10)
+    with EntornoSimulado() as entorno:
+        for c in range(carpetas):
+            directorio = os.path.join(entorno.recurso, f"area_{c // 20}", f"carpeta_{c}")
+            os.makedirs(directorio)
+            for a in range(por_carpeta):
+                with open(os.path.join(directorio, f"setup_{c}_{a}.exe"), 'wb') as f:
+                    f.write(b'MZ' + bytes(1022))
+        indice = IndiceRecurso([entorno.recurso], ruta_indice=os.path.join(entorno.datos, 'indice.json'))
+        with latencia_simulada(entorno.recurso, por_archivo=0.001, por_stat=0.001):
+            completo = indice.escanear()
+            sin_cambios = indice.escanear()
+            with open(os.path.join(entorno.recurso, 'area_0', 'carpeta_0', 'nuevo.exe'), 'wb') as f:
+                f.write(b'MZ')
+            un_cambio = indice.escanear()
+        nombres = [f"setup_{c}_{c % por_carpeta}.exe" for c in range(carpetas)]
+        inicio = time.perf_counter()
+        for _ in range(100):
+            for nombre in nombres:
+                indice.resolver(nombre)
+        resolucion = (time.perf_counter() - inicio) / (100 * len(nombres))
+    return {
+        'archivos': completo['archivos'],
+        'escaneo_completo_ms': _ms(completo['duracion']),
+        'escaneo_sin_cambios_ms': _ms(sin_cambios['duracion']),
+        'escaneo_un_cambio_ms': _ms(un_cambio['duracion']),
+        'carpetas_releidas_un_cambio': un_cambio['directorios_listados'],
+        'resolver_us': round(resolucion * 1e6, 2),
+    }
+
+
+BENCHMARKS = {
+    'cola': bench_cola,
+    'copia': bench_copia,
+    'filtro': bench_filtro,
+    'lista': bench_lista,
+    'arranque': bench_arranque,
+    'indice_recurso': bench_indice_recurso,
+}
+
+
+def version_repositorio():
+    try:
+        return subprocess.run(['git', 'describe', '--always', '--dirty'], cwd=RAIZ, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rapido', action='store_true', help='tamaños reducidos (para CI)')
+    parser.add_argument('--solo', help=f"lista separada por comas: {','.join(BENCHMARKS)}")
+    parser.add_argument('--salida', help='archivo JSON de resultados (por defecto benchmarks/resultados/)')
+    args = parser.parse_args()
+
+    nombres = args.solo.split(',') if args.solo else list(BENCHMARKS)
+    desconocidos = [nombre for nombre in nombres if nombre not in BENCHMARKS]
+    if desconocidos:
+        parser.error(f"benchmarks desconocidos: {', '.join(desconocidos)}")
+
+    informe = {
+        'version': version_repositorio(),
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'rapido': args.rapido,
+        'resultados': {},
+    }
+    for nombre in nombres:
+        inicio = time.perf_counter()
+        try:
+            resultado = BENCHMARKS[nombre](args.rapido)
+        except Exception as e:
+            resultado = {'error': repr(e)}
+        informe['resultados'][nombre] = resultado
+        print(f"{nombre:<16}{time.perf_counter() - inicio:>7.1f}s  {json.dumps(resultado, ensure_ascii=False)}")
+
+    salida = args.salida or os.path.join(DIRECTORIO, 'resultados',
+                                         f"{datetime.now():%Y%m%d-%H%M%S}_{informe['version'] or 'local'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(salida)), exist_ok=True)
+    with open(salida, 'w', encoding='utf-8') as f:
+        json.dump(informe, f, indent=2, ensure_ascii=False)
+    print(f"Resultados guardados en {salida}")
+    return 1 if any('error' in r for r in informe['resultados'].values()) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,95 @@
+import time
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+FRECUENCIA_HZ = 20   # Refrescos de la ventana por segundo como máximo
+
+
+class EstadoInterfaz:
+    """Últimos valores publicados por los hilos de trabajo para la ventana.
+
+    `publicar` solo guarda el valor bajo un lock (no toca Tk ni encola nada):
+    si llegan mil cambios de estado entre dos refrescos, la ventana aplica
+    únicamente el último.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._valores = {}
+        self._pendientes = set()
+        self.publicados = 0
+        self.aplicados = 0
+
+    def publicar(self, clave, valor):
+        with self._lock:
+            self._valores[clave] = valor
+            self._pendientes.add(clave)
+            self.publicados += 1
+
+    def tomar(self):
+        """{clave: último valor} de lo que cambió desde la última llamada"""
+        with self._lock:
+            if not self._pendientes:
+                return {}
+            cambios = {clave: self._valores[clave] for clave in self._pendientes}
+            self._pendientes.clear()
+            self.aplicados += len(cambios)
+        return cambios
+
+    def valor(self, clave, por_defecto=None):
+        with self._lock:
+            return self._valores.get(clave, por_defecto)
+
+
+class BombaInterfaz:
+    """Único bucle `root.after` que refresca la ventana a frecuencia fija.
+
+    En cada latido pasa a `aplicar(cambios)` lo que cambió en `estado` y
+    ejecuta las tareas periódicas que tocan (`cada(segundos, funcion)`), así
+    el trabajo de Tk por segundo está acotado aunque los eventos lleguen
+    mucho más deprisa.
+    """
+
+    def __init__(self, root, aplicar, estado=None, frecuencia=FRECUENCIA_HZ):
+        self.root = root
+        self.aplicar = aplicar
+        self.estado = estado or EstadoInterfaz()
+        self.intervalo_ms = max(int(1000 / max(frecuencia, 1)), 10)
+        self._tareas = []      # [[cada cuántos latidos, función]]
+        self._latidos = 0
+        self._id_after = None
+        self.duracion_maxima = 0.0   # Latido más lento (segundos), para diagnosticar la ventana
+
+    def cada(self, segundos, funcion):
+        """Ejecuta `funcion()` en el hilo de Tk cada `segundos` (redondeado a latidos)"""
+        self._tareas.append([max(round(segundos * 1000 / self.intervalo_ms), 1), funcion])
+        return self
+
+    def iniciar(self):
+        if self._id_after is None:
+            self._id_after = self.root.after(self.intervalo_ms, self._latido)
+        return self
+
+    def detener(self):
+        if self._id_after is not None:
+            self.root.after_cancel(self._id_after)
+            self._id_after = None
+
+    def _latido(self):
+        inicio = time.perf_counter()
+        self._latidos += 1
+        try:
+            cambios = self.estado.tomar()
+            if cambios:
+                self.aplicar(cambios)
+            for cada, funcion in self._tareas:
+                if self._latidos % cada == 0:
+                    funcion()
+        except Exception:
+            # Un fallo al pintar no debe parar los refrescos siguientes
+            logger.exception("Error refrescando la ventana")
+        finally:
+            self.duracion_maxima = max(self.duracion_maxima, time.perf_counter() - inicio)
+            self._id_after = self.root.after(self.intervalo_ms, self._latido)
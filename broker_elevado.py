@@ -0,0 +1,346 @@
+import os
+import sys
+import json
+import time
+import queue
+import socket
+import secrets
+import logging
+import argparse
+import threading
+import subprocess
+from supervision import ArbolProcesos, InstalacionInactiva, opciones_popen
+from salida_instalador import lineas_acotadas
+
+logger = logging.getLogger(__name__)
+
+CREATE_NO_WINDOW = getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+HIGH_PRIORITY_CLASS = getattr(subprocess, 'HIGH_PRIORITY_CLASS', 0)
+
+TIMEOUT_CONEXION = 60   # Segundos para que el broker arranque y se conecte
+# El token de la sesión viaja en el entorno del broker: la línea de comandos de
+# cualquier proceso la puede leer cualquier usuario del equipo (WMI, ps)
+VARIABLE_TOKEN = 'INSTALADOR_BROKER_TOKEN'
+MARGEN_TIMEOUT = 30     # El cliente espera algo más que el broker antes de darlo por perdido
+
+# Protocolo: un objeto JSON por línea (UTF-8) sobre una conexión TCP local.
+#   broker -> cliente:  hola {token, pid} · linea {id, etiqueta, texto} · fin {id, codigo}
+#                       inactivo {id, segundos} · timeout {id, inactividad?} · error {id, mensaje} · pong
+#   cliente -> broker:  instalar {id, comando, shell, timeout, codificacion, inactividad, terminar_inactivos}
+#                       cancelar {id} · ping · salir
+# El broker no escucha: se conecta al puerto que abrió la interfaz y se
+# identifica con el token recibido al arrancar (en su entorno, no en la línea
+# de comandos), así ningún otro proceso del equipo puede pedirle que ejecute nada.
+
+
+def _enviar(archivo, lock, mensaje):
+    with lock:
+        archivo.write(json.dumps(mensaje, ensure_ascii=False) + '\n')
+        archivo.flush()
+
+
+class ServidorBroker:
+    """Lado elevado: ejecuta los instaladores que recibe y devuelve su salida y código"""
+
+    def __init__(self, conexion):
+        self.conexion = conexion
+        self._entrada = conexion.makefile('r', encoding='utf-8')
+        self._salida = conexion.makefile('w', encoding='utf-8')
+        self._lock = threading.Lock()
+        self._arboles = {}
+
+    def enviar(self, mensaje):
+        try:
+            _enviar(self._salida, self._lock, mensaje)
+        except OSError:
+            pass  # La interfaz se cerró: el bucle principal terminará
+
+    def _leer_flujo(self, id_trabajo, flujo, etiqueta, codificacion):
+        try:
+            for linea in lineas_acotadas(flujo):
+                texto = linea.decode(codificacion, errors='ignore')
+                self.enviar({'tipo': 'linea', 'id': id_trabajo, 'etiqueta': etiqueta, 'texto': texto})
+        except (OSError, ValueError):
+            pass
+        finally:
+            flujo.close()
+
+    def _instalar(self, mensaje):
+        id_trabajo = mensaje['id']
+        try:
+            proceso = subprocess.Popen(
+                mensaje['comando'], shell=mensaje.get('shell', False),
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                **opciones_popen(creationflags=CREATE_NO_WINDOW | HIGH_PRIORITY_CLASS)
+            )
+            arbol = self._arboles[id_trabajo] = ArbolProcesos.crear(proceso)
+        except OSError as e:
+            self.enviar({'tipo': 'error', 'id': id_trabajo, 'mensaje': str(e)})
+            return
+        codificacion = mensaje.get('codificacion') or 'latin-1'
+        lectores = [threading.Thread(target=self._leer_flujo, args=(id_trabajo, flujo, etiqueta, codificacion),
+                                     daemon=True)
+                    for flujo, etiqueta in ((proceso.stdout, 'OUT'), (proceso.stderr, 'ERR'))]
+        for lector in lectores:
+            lector.start()
+        try:
+            codigo = arbol.esperar(
+                mensaje.get('timeout'), inactividad=mensaje.get('inactividad'),
+                terminar_inactivos=mensaje.get('terminar_inactivos', False),
+                al_inactivo=lambda segundos: self.enviar({'tipo': 'inactivo', 'id': id_trabajo, 'segundos': segundos}))
+            for lector in lectores:
+                lector.join(1 if arbol.residuales else 5)
+            self.enviar({'tipo': 'fin', 'id': id_trabajo, 'codigo': codigo})
+        except InstalacionInactiva as e:
+            self.enviar({'tipo': 'timeout', 'id': id_trabajo, 'inactividad': e.inactividad})
+        except subprocess.TimeoutExpired:
+            self.enviar({'tipo': 'timeout', 'id': id_trabajo})
+        finally:
+            self._arboles.pop(id_trabajo, None)
+            arbol.cerrar()
+
+    def atender(self):
+        """Atiende peticiones hasta recibir `salir` o perder la conexión"""
+        try:
+            for linea in self._entrada:
+                try:
+                    mensaje = json.loads(linea)
+                except ValueError:
+                    continue
+                tipo = mensaje.get('tipo')
+                if tipo == 'instalar':
+                    threading.Thread(target=self._instalar, args=(mensaje,), daemon=True).start()
+                elif tipo == 'cancelar':
+                    arbol = self._arboles.get(mensaje.get('id'))
+                    if arbol:
+                        arbol.terminar()
+                elif tipo == 'ping':
+                    self.enviar({'tipo': 'pong'})
+                elif tipo == 'salir':
+                    break
+        except OSError:
+            pass
+        finally:
+            # Sin interfaz no queda nadie que espere a los instaladores en curso
+            for arbol in list(self._arboles.values()):
+                arbol.terminar()
+            self.conexion.close()
+
+
+class ClienteBroker:
+    """Lado de la interfaz (sin privilegios): arranca el broker una vez y le envía trabajos.
+
+    `lanzador(comando, entorno)` arranca el proceso del broker con los
+    privilegios adecuados y las variables de `entorno` añadidas (ver
+    `lanzador_con_credenciales`); por defecto lo lanza con el usuario actual,
+    que es lo que se usa fuera de Windows.
+    """
+
+    def __init__(self, lanzador=None, timeout_conexion=TIMEOUT_CONEXION):
+        self.lanzador = lanzador or lanzador_usuario_actual
+        self.timeout_conexion = timeout_conexion
+        self.pid = None
+        self._conexion = None
+        self._salida = None
+        self._lock_envio = threading.Lock()
+        self._lock = threading.Lock()
+        self._trabajos = {}     # {id: Queue de mensajes}
+        self._siguiente_id = 0
+        self._pong = threading.Event()
+
+    @property
+    def activo(self):
+        return self._conexion is not None
+
+    def comando_broker(self, puerto):
+        return [sys.executable, os.path.abspath(__file__), '--conectar', f"127.0.0.1:{puerto}"]
+
+    def iniciar(self):
+        """Arranca el broker y espera a que se conecte. Lanza ConnectionError si no lo hace"""
+        token = secrets.token_hex(16)
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as servidor:
+            servidor.bind(('127.0.0.1', 0))
+            servidor.listen()
+            self.lanzador(self.comando_broker(servidor.getsockname()[1]), {VARIABLE_TOKEN: token})
+            limite = time.monotonic() + self.timeout_conexion
+            while True:
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    raise ConnectionError(f"El broker elevado no se conectó en {self.timeout_conexion}s")
+                servidor.settimeout(restante)
+                try:
+                    conexion, _ = servidor.accept()
+                except socket.timeout:
+                    continue
+                conexion.settimeout(restante)
+                entrada = conexion.makefile('r', encoding='utf-8')
+                try:
+                    hola = json.loads(entrada.readline() or '{}')
+                except (OSError, ValueError):
+                    hola = {}
+                if hola.get('tipo') == 'hola' and secrets.compare_digest(str(hola.get('token', '')), token):
+                    break
+                # Conexión ajena al broker: se descarta y se sigue esperando
+                conexion.close()
+        conexion.settimeout(None)
+        self.pid = hola.get('pid')
+        self._conexion = conexion
+        self._salida = conexion.makefile('w', encoding='utf-8')
+        threading.Thread(target=self._leer, args=(entrada,), daemon=True).start()
+        logger.info(f"Broker elevado conectado (PID {self.pid})")
+        return self
+
+    def _leer(self, entrada):
+        try:
+            for linea in entrada:
+                try:
+                    mensaje = json.loads(linea)
+                except ValueError:
+                    continue
+                if mensaje.get('tipo') == 'pong':
+                    self._pong.set()
+                    continue
+                with self._lock:
+                    cola = self._trabajos.get(mensaje.get('id'))
+                if cola is not None:
+                    cola.put(mensaje)
+        except OSError:
+            pass
+        finally:
+            # Conexión perdida: se despierta a todos los que esperan un resultado
+            with self._lock:
+                self._conexion = None
+                for cola in self._trabajos.values():
+                    cola.put(None)
+
+    def _enviar(self, mensaje):
+        if self._conexion is None:
+            raise ConnectionError("El broker elevado no está conectado")
+        _enviar(self._salida, self._lock_envio, mensaje)
+
+    def ping(self, timeout=5):
+        """Comprobación de salud: True si el broker responde"""
+        self._pong.clear()
+        try:
+            self._enviar({'tipo': 'ping'})
+        except (OSError, ConnectionError):
+            return False
+        return self._pong.wait(timeout)
+
+    def ejecutar(self, comando, timeout, shell=False, codificacion='latin-1', al_recibir_linea=None,
+                 inactividad=None, terminar_inactivos=False, al_inactivo=None):
+        """Ejecuta un instalador en el broker y devuelve su código de salida.
+
+        `al_recibir_linea(texto, etiqueta)` recibe la salida a medida que llega
+        y `al_inactivo(segundos)` el aviso de árbol sin actividad (ver
+        `ArbolProcesos.esperar`). Relanza `subprocess.TimeoutExpired` si el
+        instalador agota su tiempo (`InstalacionInactiva` si se detuvo por
+        inactividad) y `ConnectionError` si se pierde el broker.
+        """
+        with self._lock:
+            self._siguiente_id += 1
+            id_trabajo = self._siguiente_id
+            cola = self._trabajos[id_trabajo] = queue.Queue()
+        try:
+            self._enviar({'tipo': 'instalar', 'id': id_trabajo, 'comando': comando, 'shell': shell,
+                          'timeout': timeout, 'codificacion': codificacion,
+                          'inactividad': inactividad, 'terminar_inactivos': terminar_inactivos})
+            while True:
+                try:
+                    mensaje = cola.get(timeout=timeout + MARGEN_TIMEOUT)
+                except queue.Empty:
+                    self._enviar({'tipo': 'cancelar', 'id': id_trabajo})
+                    raise subprocess.TimeoutExpired(comando, timeout)
+                if mensaje is None:
+                    raise ConnectionError("Se perdió la conexión con el broker elevado")
+                tipo = mensaje['tipo']
+                if tipo == 'linea':
+                    if al_recibir_linea:
+                        al_recibir_linea(mensaje['texto'], mensaje.get('etiqueta', 'OUT'))
+                elif tipo == 'inactivo':
+                    if al_inactivo:
+                        al_inactivo(mensaje['segundos'])
+                elif tipo == 'fin':
+                    return mensaje['codigo']
+                elif tipo == 'timeout':
+                    if mensaje.get('inactividad') is not None:
+                        raise InstalacionInactiva(comando, timeout, mensaje['inactividad'])
+                    raise subprocess.TimeoutExpired(comando, timeout)
+                elif tipo == 'error':
+                    raise OSError(mensaje.get('mensaje'))
+        finally:
+            with self._lock:
+                self._trabajos.pop(id_trabajo, None)
+
+    def cerrar(self):
+        """Pide al broker que termine (mata los instaladores que sigan en curso)"""
+        conexion = self._conexion
+        if conexion is None:
+            return
+        try:
+            self._enviar({'tipo': 'salir'})
+        except (OSError, ConnectionError):
+            pass
+        try:
+            conexion.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        conexion.close()
+        self._conexion = None
+
+
+def _comillas_ps(texto):
+    return "'" + str(texto).replace("'", "''") + "'"
+
+
+def lanzador_usuario_actual(comando, entorno):
+    """Lanzador por defecto: el broker con el usuario actual (fuera de Windows o sin elevación)"""
+    return subprocess.Popen(comando, env={**os.environ, **entorno}, creationflags=CREATE_NO_WINDOW)
+
+
+def lanzador_con_credenciales(usuario, password, shell=None):
+    """Lanzador que arranca el broker como `usuario` mediante el PowerShell persistente.
+
+    La contraseña y el token viajan por la tubería del shell persistente: no
+    aparecen en la línea de comandos ni en ningún archivo. El token se deja
+    en el entorno del shell solo mientras dura Start-Process, que lo hereda
+    al broker.
+    """
+    def lanzar(comando, entorno):
+        from shell_persistente import shell_compartido
+        # Start-Process une los argumentos con espacios: cada uno va entre comillas dobles si hace falta
+        argumentos = subprocess.list2cmdline(comando[1:])
+        variables = ''.join(f"$env:{nombre} = {_comillas_ps(valor)};" for nombre, valor in entorno.items())
+        limpiar = ''.join(f"Remove-Item Env:{nombre} -ErrorAction SilentlyContinue;" for nombre in entorno)
+        script = (
+            f"$cred = New-Object System.Management.Automation.PSCredential({_comillas_ps(usuario)}, "
+            f"(ConvertTo-SecureString {_comillas_ps(password)} -AsPlainText -Force));"
+            f"{variables}"
+            f"try {{ Start-Process -FilePath {_comillas_ps(comando[0])} -ArgumentList {_comillas_ps(argumentos)} "
+            f"-WorkingDirectory {_comillas_ps(os.path.dirname(os.path.abspath(__file__)))} "
+            f"-Credential $cred -WindowStyle Hidden -ErrorAction Stop }} finally {{ {limpiar} }}"
+        )
+        resultado = (shell or shell_compartido()).ejecutar(script, timeout=TIMEOUT_CONEXION)
+        if resultado['codigo'] != 0:
+            raise ConnectionError(f"No se pudo arrancar el broker elevado: {resultado['salida'].strip()}")
+    return lanzar
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Broker elevado del Instalador MultiApp')
+    parser.add_argument('--conectar', required=True, help='host:puerto de la interfaz')
+    args = parser.parse_args(argv)
+    token = os.environ.pop(VARIABLE_TOKEN, None)
+    if not token:
+        parser.error(f"falta el token de sesión en la variable de entorno {VARIABLE_TOKEN}")
+    host, puerto = args.conectar.rsplit(':', 1)
+    conexion = socket.create_connection((host, int(puerto)), timeout=TIMEOUT_CONEXION)
+    conexion.settimeout(None)
+    servidor = ServidorBroker(conexion)
+    servidor.enviar({'tipo': 'hola', 'token': token, 'pid': os.getpid()})
+    servidor.atender()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,314 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import logging
+import tempfile
+import threading
+from copia_archivos import copiar_archivo
+
+
+def directorio_cache_por_defecto():
+    """Devuelve la carpeta por defecto de la caché (persistente entre ejecuciones)"""
+    base = os.environ.get('LOCALAPPDATA') or os.environ.get('TEMP') or tempfile.gettempdir()
+    return os.path.join(base, 'InstaladorMultiApp', 'cache_instaladores')
+
+
+class CacheInstaladores:
+    """Caché local de instaladores direccionada por contenido con desalojo LRU.
+
+    Cada origen se identifica por (ruta, tamaño, mtime). Esa clave apunta al hash
+    SHA-256 del contenido, y el archivo local se guarda en una carpeta por hash
+    conservando el nombre original (algunos instaladores dependen de él).
+    """
+
+    ARCHIVO_INDICE = 'indice_cache.json'
+    MARGEN_LIBRE = 512 * 1024 * 1024  # No llenar el disco hasta el último byte
+    VIDA_PARCIALES = 7 * 24 * 3600  # Copias a medias que ya no se reanudarán
+
+    def __init__(self, directorio=None, limite_mb=20480, tamano_buffer_mb=8):
+        self.directorio = directorio or directorio_cache_por_defecto()
+        self.limite_bytes = int(limite_mb) * 1024 * 1024
+        self.tamano_buffer = int(tamano_buffer_mb) * 1024 * 1024
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.RLock()
+        self._fijados = set()
+        self.estadisticas = {
+            'aciertos': 0,
+            'fallos': 0,
+            'bytes_servidos': 0,
+            'bytes_copiados': 0,
+            'desalojos': 0,
+        }
+        os.makedirs(self.directorio, exist_ok=True)
+        self.indice = self._cargar_indice()
+        self._limpiar_parciales()
+
+    @classmethod
+    def desde_configuracion(cls, config):
+        """Crea la caché a partir de la sección `cache` de config.json"""
+        config = config or {}
+        return cls(directorio=config.get('directorio'),
+                   limite_mb=config.get('limite_mb', 20480),
+                   tamano_buffer_mb=config.get('tamano_buffer_mb', 8))
+
+    # ------------------------------------------------------------------
+    # Índice persistente
+    # ------------------------------------------------------------------
+    def _ruta_indice(self):
+        return os.path.join(self.directorio, self.ARCHIVO_INDICE)
+
+    def _cargar_indice(self):
+        """Carga el índice y descarta entradas cuyo archivo ya no existe"""
+        indice = {'fuentes': {}, 'blobs': {}}
+        try:
+            with open(self._ruta_indice(), 'r', encoding='utf-8') as f:
+                datos = json.load(f)
+            indice['fuentes'] = datos.get('fuentes', {})
+            indice['blobs'] = datos.get('blobs', {})
+        except FileNotFoundError:
+            return indice
+        except Exception as e:
+            self.logger.warning(f"Índice de caché dañado, se reconstruye: {e}")
+            return indice
+
+        for id_blob, blob in list(indice['blobs'].items()):
+            ruta = os.path.join(self.directorio, blob['ruta'])
+            if not os.path.isfile(ruta) or os.path.getsize(ruta) != blob['tamano']:
+                del indice['blobs'][id_blob]
+        return indice
+
+    def _guardar_indice(self):
+        ruta = self._ruta_indice()
+        temporal = ruta + '.tmp'
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump(self.indice, f, indent=2, ensure_ascii=False)
+        os.replace(temporal, ruta)
+
+    @staticmethod
+    def _clave_origen(ruta_origen, stat):
+        return f"{os.path.normcase(ruta_origen)}|{stat.st_size}|{int(stat.st_mtime)}"
+
+    @staticmethod
+    def _id_blob(hash_contenido, nombre):
+        return f"{hash_contenido}/{nombre}"
+
+    def _ruta_blob(self, id_blob):
+        return os.path.join(self.directorio, *id_blob.split('/'))
+
+    # ------------------------------------------------------------------
+    # API pública
+    # ------------------------------------------------------------------
+    def obtener(self, ruta_origen, ruta_lectura=None, progreso=None):
+        """Devuelve la ruta local del instalador, copiándolo solo si no está en caché.
+
+        `ruta_lectura` permite leer desde otra ruta (p.ej. una unidad mapeada)
+        manteniendo la clave de la ruta original. `progreso` se pasa al motor
+        de copia (ver `copia_archivos.copiar_archivo`).
+        """
+        ruta_lectura = ruta_lectura or ruta_origen
+        stat = os.stat(ruta_lectura)
+        clave = self._clave_origen(ruta_origen, stat)
+        nombre = os.path.basename(ruta_origen)
+
+        with self._lock:
+            fuente = self.indice['fuentes'].get(clave)
+            if fuente:
+                ruta_local = self._materializar(fuente['hash'], nombre)
+                if ruta_local:
+                    self.estadisticas['aciertos'] += 1
+                    self.estadisticas['bytes_servidos'] += stat.st_size
+                    self.logger.info(f"Caché: acierto para {nombre}")
+                    return ruta_local
+            self.estadisticas['fallos'] += 1
+
+        # Nombre estable por clave: si la copia se corta, la próxima vez se reanuda
+        temporal = os.path.join(self.directorio,
+                                '.' + hashlib.sha1(clave.encode('utf-8')).hexdigest())
+        hash_contenido = copiar_archivo(ruta_lectura, temporal,
+                                        tamano_buffer=self.tamano_buffer, progreso=progreso)
+
+        with self._lock:
+            id_blob = self._id_blob(hash_contenido, nombre)
+            destino = self._ruta_blob(id_blob)
+            os.makedirs(os.path.dirname(destino), exist_ok=True)
+            os.replace(temporal, destino)
+            self.indice['blobs'][id_blob] = {
+                'ruta': id_blob,
+                'tamano': stat.st_size,
+                'ultimo_uso': time.time(),
+            }
+            self.indice['fuentes'][clave] = {
+                'hash': hash_contenido,
+                'ruta_origen': ruta_origen,
+                'tamano': stat.st_size,
+                'mtime': stat.st_mtime,
+            }
+            self._fijados.add(id_blob)
+            self.estadisticas['bytes_copiados'] += stat.st_size
+            self._desalojar()
+            self._guardar_indice()
+            return destino
+
+    def liberar(self, ruta_local=None):
+        """Permite desalojar un archivo ya usado (o todos si no se indica ruta)"""
+        with self._lock:
+            if ruta_local is None:
+                self._fijados.clear()
+                return
+            try:
+                relativa = os.path.relpath(ruta_local, self.directorio).replace(os.sep, '/')
+            except ValueError:
+                # Ruta en otra unidad: no pertenece a la caché
+                return
+            self._fijados.discard(relativa)
+
+    def hash_de(self, ruta_local):
+        """Hash de contenido de un archivo servido por la caché (None si no es de la caché)"""
+        try:
+            relativa = os.path.relpath(ruta_local, self.directorio).replace(os.sep, '/')
+        except ValueError:
+            return None
+        with self._lock:
+            if relativa in self.indice['blobs']:
+                return relativa.split('/', 1)[0]
+        return None
+
+    def esta_en_cache(self, ruta_origen):
+        """Indica si el origen ya está en caché sin copiar nada"""
+        try:
+            stat = os.stat(ruta_origen)
+        except OSError:
+            return False
+        with self._lock:
+            fuente = self.indice['fuentes'].get(self._clave_origen(ruta_origen, stat))
+            if not fuente:
+                return False
+            return any(id_blob.startswith(fuente['hash'] + '/') for id_blob in self.indice['blobs'])
+
+    def verificar_espacio(self, rutas_origen):
+        """Comprueba antes de empezar que hay espacio para toda la cola.
+
+        Si falta espacio intenta desalojar entradas LRU que la cola no necesita.
+        Devuelve un dict con `suficiente`, `necesario` y `disponible` (bytes).
+        """
+        necesario = 0
+        hashes_cola = set()
+        for ruta in rutas_origen:
+            try:
+                stat = os.stat(ruta)
+            except OSError:
+                continue
+            with self._lock:
+                fuente = self.indice['fuentes'].get(self._clave_origen(ruta, stat))
+            if fuente:
+                hashes_cola.add(fuente['hash'])
+            else:
+                necesario += stat.st_size
+
+        with self._lock:
+            disponible = shutil.disk_usage(self.directorio).free - self.MARGEN_LIBRE
+            if necesario > disponible:
+                disponible += self._desalojar(liberar_bytes=necesario - disponible,
+                                              conservar_hashes=hashes_cola)
+                self._guardar_indice()
+
+        if necesario > self.limite_bytes:
+            self.logger.warning("La cola supera el límite de la caché; se desalojarán copias durante la instalación")
+
+        return {
+            'suficiente': necesario <= disponible,
+            'necesario': necesario,
+            'disponible': max(disponible, 0),
+        }
+
+    def resumen_estadisticas(self):
+        """Devuelve las estadísticas de uso con la tasa de aciertos"""
+        with self._lock:
+            resumen = dict(self.estadisticas)
+            consultas = resumen['aciertos'] + resumen['fallos']
+            resumen['tasa_aciertos'] = (resumen['aciertos'] / consultas) if consultas else 0.0
+            resumen['tamano_total'] = self._tamano_total()
+            return resumen
+
+    # ------------------------------------------------------------------
+    # Internos
+    # ------------------------------------------------------------------
+    def _materializar(self, hash_contenido, nombre):
+        """Devuelve el blob con ese hash y nombre; si solo existe con otro nombre lo duplica localmente"""
+        id_blob = self._id_blob(hash_contenido, nombre)
+        blob = self.indice['blobs'].get(id_blob)
+        if blob and os.path.isfile(self._ruta_blob(id_blob)):
+            blob['ultimo_uso'] = time.time()
+            self._fijados.add(id_blob)
+            self._guardar_indice()
+            return self._ruta_blob(id_blob)
+
+        for otro_id, otro in self.indice['blobs'].items():
+            if otro_id.startswith(hash_contenido + '/') and os.path.isfile(self._ruta_blob(otro_id)):
+                destino = self._ruta_blob(id_blob)
+                try:
+                    os.link(self._ruta_blob(otro_id), destino)
+                except OSError:
+                    shutil.copy2(self._ruta_blob(otro_id), destino)
+                self.indice['blobs'][id_blob] = {
+                    'ruta': id_blob,
+                    'tamano': otro['tamano'],
+                    'ultimo_uso': time.time(),
+                }
+                self._fijados.add(id_blob)
+                self._guardar_indice()
+                return destino
+        return None
+
+    def _limpiar_parciales(self):
+        """Elimina copias interrumpidas demasiado antiguas para reanudarlas"""
+        limite = time.time() - self.VIDA_PARCIALES
+        for nombre in os.listdir(self.directorio):
+            if not nombre.startswith('.') or '.partial' not in nombre:
+                continue
+            ruta = os.path.join(self.directorio, nombre)
+            try:
+                if os.path.getmtime(ruta) < limite:
+                    os.remove(ruta)
+            except OSError:
+                pass
+
+    def _tamano_total(self):
+        return sum(blob['tamano'] for blob in self.indice['blobs'].values())
+
+    def _desalojar(self, liberar_bytes=0, conservar_hashes=()):
+        """Elimina las entradas menos usadas recientemente hasta cumplir el límite.
+
+        Devuelve los bytes liberados.
+        """
+        exceso = max(self._tamano_total() - self.limite_bytes, liberar_bytes)
+        liberados = 0
+        candidatos = sorted(self.indice['blobs'].items(), key=lambda item: item[1]['ultimo_uso'])
+        for id_blob, blob in candidatos:
+            if liberados >= exceso:
+                break
+            if id_blob in self._fijados or id_blob.split('/', 1)[0] in conservar_hashes:
+                continue
+            ruta = self._ruta_blob(id_blob)
+            try:
+                if os.path.exists(ruta):
+                    os.remove(ruta)
+                carpeta = os.path.dirname(ruta)
+                if not os.listdir(carpeta):
+                    os.rmdir(carpeta)
+            except OSError as e:
+                self.logger.warning(f"No se pudo desalojar {id_blob}: {e}")
+                continue
+            del self.indice['blobs'][id_blob]
+            liberados += blob['tamano']
+            self.estadisticas['desalojos'] += 1
+            self.logger.info(f"Caché: desalojado {id_blob}")
+
+        # Las fuentes que ya no apuntan a ningún blob se olvidan
+        hashes_vivos = {id_blob.split('/', 1)[0] for id_blob in self.indice['blobs']}
+        for clave, fuente in list(self.indice['fuentes'].items()):
+            if fuente['hash'] not in hashes_vivos:
+                del self.indice['fuentes'][clave]
+        return liberados
@@ -0,0 +1,74 @@
+import os
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Clases de resultado
+EXITO = 'exito'
+REINICIO = 'reinicio'        # Instalado, pero pide reiniciar el equipo
+REINTENTAR = 'reintentar'    # Fallo transitorio: volver a intentar más tarde
+FATAL = 'fatal'
+CLASES = (EXITO, REINICIO, REINTENTAR, FATAL)
+
+ARCHIVO_CODIGOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'codigos_salida.json')
+
+
+def cargar_clasificacion(ruta=ARCHIVO_CODIGOS, adicional=None):
+    """Carga la tabla de códigos por familia y le aplica los ajustes de config.json.
+
+    Devuelve {familia: {codigo: clase, 'por_defecto': clase}} ya resuelto
+    (cada familia hereda de 'comun').
+    """
+    try:
+        with open(ruta, 'r', encoding='utf-8') as f:
+            datos = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.error(f"No se pudo cargar {ruta}: {e}")
+        datos = {'comun': {EXITO: [0], REINICIO: [3010, 1641], REINTENTAR: [1618], 'por_defecto': FATAL}}
+
+    for familia, clases in (adicional or {}).items():
+        destino = datos.setdefault(familia, {})
+        for clase, valor in clases.items():
+            if clase == 'por_defecto':
+                destino[clase] = valor
+            else:
+                destino[clase] = list(destino.get(clase, [])) + list(valor)
+
+    comun = datos.get('comun', {})
+    tabla = {}
+    for familia, clases in datos.items():
+        if familia.startswith('_'):
+            continue
+        resuelta = {'por_defecto': clases.get('por_defecto', comun.get('por_defecto', FATAL))}
+        for origen in (comun, clases) if familia != 'comun' else (comun,):
+            for clase in CLASES:
+                for codigo in origen.get(clase, []):
+                    resuelta[int(codigo)] = clase
+        tabla[familia] = resuelta
+    return tabla
+
+
+class ClasificadorCodigos:
+    """Traduce el código de salida de un instalador a una clase de resultado"""
+
+    def __init__(self, adicional=None):
+        self.tabla = cargar_clasificacion(adicional=adicional)
+
+    @staticmethod
+    def familia_por_nombre(ruta_instalador):
+        """Familia deducida del archivo cuando no hay una mejor detección"""
+        if os.path.splitext(ruta_instalador)[1].lower() in ('.msi', '.msp'):
+            return 'msi'
+        return 'comun'
+
+    def clasificar(self, codigo, familia='comun'):
+        tabla = self.tabla.get(familia) or self.tabla.get('comun', {'por_defecto': FATAL})
+        # Los códigos HRESULT pueden llegar sin signo desde Windows
+        if codigo is not None and codigo > 0x7FFFFFFF:
+            codigo -= 0x100000000
+        return tabla.get(codigo, tabla['por_defecto'])
+
+    @staticmethod
+    def es_exito(clase):
+        return clase in (EXITO, REINICIO)
@@ -0,0 +1,174 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+TAMANO_BUFFER_POR_DEFECTO = 8 * 1024 * 1024
+INTERVALO_PUNTO_CONTROL = 64 * 1024 * 1024  # Cada cuántos bytes se confirma el offset en disco
+INTERVALO_PROGRESO = 0.25  # Segundos mínimos entre avisos de progreso
+
+
+def formatear_bytes(cantidad):
+    """Devuelve un tamaño legible (B, KB, MB, GB)"""
+    cantidad = float(cantidad)
+    for unidad in ('B', 'KB', 'MB', 'GB'):
+        if cantidad < 1024 or unidad == 'GB':
+            return f"{cantidad:.0f} {unidad}" if unidad == 'B' else f"{cantidad:.1f} {unidad}"
+        cantidad /= 1024
+
+
+def formatear_duracion(segundos):
+    """Devuelve una duración como M:SS o H:MM:SS"""
+    if segundos is None:
+        return '--:--'
+    segundos = int(segundos)
+    horas, resto = divmod(segundos, 3600)
+    minutos, segundos = divmod(resto, 60)
+    if horas:
+        return f"{horas}:{minutos:02d}:{segundos:02d}"
+    return f"{minutos}:{segundos:02d}"
+
+
+class MedidorVelocidad:
+    """Calcula bytes/s (media exponencial) y ETA a partir de avisos de avance"""
+
+    def __init__(self, total, suavizado=0.3):
+        self.total = total
+        self.suavizado = suavizado
+        self.velocidad = 0.0
+        self._ultimo_tiempo = time.monotonic()
+        self._ultimos_bytes = 0
+
+    def actualizar(self, copiados):
+        ahora = time.monotonic()
+        intervalo = ahora - self._ultimo_tiempo
+        if intervalo > 0:
+            instantanea = (copiados - self._ultimos_bytes) / intervalo
+            if self.velocidad:
+                self.velocidad = self.suavizado * instantanea + (1 - self.suavizado) * self.velocidad
+            else:
+                self.velocidad = instantanea
+        self._ultimo_tiempo = ahora
+        self._ultimos_bytes = copiados
+
+    def eta(self, copiados):
+        if self.velocidad <= 0:
+            return None
+        return max(self.total - copiados, 0) / self.velocidad
+
+
+def _leer_punto_control(ruta_control):
+    try:
+        with open(ruta_control, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _guardar_punto_control(ruta_control, datos):
+    temporal = ruta_control + '.tmp'
+    with open(temporal, 'w', encoding='utf-8') as f:
+        json.dump(datos, f)
+    os.replace(temporal, ruta_control)
+
+
+def copiar_archivo(origen, destino, tamano_buffer=TAMANO_BUFFER_POR_DEFECTO, progreso=None,
+                   reanudar=True, reintentos=3, espera_reintento=2.0):
+    """Copia `origen` en `destino` por bloques y devuelve el SHA-256 del contenido.
+
+    Escribe primero en `destino.partial` y guarda el último offset confirmado en
+    `destino.partial.json`; si la copia se corta (p.ej. se cae la sesión SMB) se
+    reanuda desde ese offset, tanto dentro de la misma llamada (hasta `reintentos`
+    veces) como en una ejecución posterior. El hash se calcula durante la copia,
+    sin una segunda lectura del origen.
+
+    `progreso(copiados, total, bytes_por_segundo, eta_segundos)` se invoca como
+    mucho cada INTERVALO_PROGRESO segundos y una vez al terminar.
+    """
+    stat = os.stat(origen)
+    total = stat.st_size
+    parcial = destino + '.partial'
+    ruta_control = parcial + '.json'
+    firma = {'origen': origen, 'tamano': total, 'mtime': stat.st_mtime}
+
+    sha = hashlib.sha256()
+    offset = 0
+    control = _leer_punto_control(ruta_control) if reanudar else None
+    if (control and os.path.exists(parcial)
+            and all(control.get(k) == v for k, v in firma.items())
+            and control.get('offset', 0) <= os.path.getsize(parcial)):
+        offset = control['offset']
+        # Descartar lo escrito después del último punto de control y
+        # reconstruir el hash leyendo solo la copia local
+        with open(parcial, 'r+b') as f:
+            f.truncate(offset)
+            while True:
+                bloque = f.read(tamano_buffer)
+                if not bloque:
+                    break
+                sha.update(bloque)
+        logger.info(f"Reanudando copia de {os.path.basename(origen)} desde {formatear_bytes(offset)}")
+    else:
+        open(parcial, 'wb').close()
+
+    medidor = MedidorVelocidad(total)
+    medidor._ultimos_bytes = offset
+    ultimo_aviso = 0.0
+    intentos = 0
+
+    while True:
+        try:
+            with open(origen, 'rb') as f_origen, open(parcial, 'r+b') as f_destino:
+                f_origen.seek(offset)
+                f_destino.seek(offset)
+                confirmado = offset
+                while True:
+                    bloque = f_origen.read(tamano_buffer)
+                    if not bloque:
+                        break
+                    f_destino.write(bloque)
+                    sha.update(bloque)
+                    offset += len(bloque)
+
+                    if offset - confirmado >= INTERVALO_PUNTO_CONTROL:
+                        f_destino.flush()
+                        os.fsync(f_destino.fileno())
+                        _guardar_punto_control(ruta_control, dict(firma, offset=offset))
+                        confirmado = offset
+
+                    ahora = time.monotonic()
+                    if progreso and ahora - ultimo_aviso >= INTERVALO_PROGRESO:
+                        medidor.actualizar(offset)
+                        progreso(offset, total, medidor.velocidad, medidor.eta(offset))
+                        ultimo_aviso = ahora
+                f_destino.flush()
+                os.fsync(f_destino.fileno())
+            break
+        except (FileNotFoundError, PermissionError):
+            raise
+        except OSError as e:
+            intentos += 1
+            if intentos > reintentos:
+                raise
+            # Lo escrito hasta ahora está en disco: guardar punto de control y reintentar
+            _guardar_punto_control(ruta_control, dict(firma, offset=offset))
+            logger.warning(f"Copia interrumpida en {formatear_bytes(offset)} ({e}); "
+                           f"reintento {intentos}/{reintentos}")
+            time.sleep(espera_reintento * intentos)
+
+    if offset != total:
+        raise OSError(f"Copia incompleta de {origen}: {offset} de {total} bytes")
+
+    if progreso:
+        medidor.actualizar(offset)
+        progreso(offset, total, medidor.velocidad, 0)
+
+    shutil.copystat(origen, parcial)
+    os.replace(parcial, destino)
+    if os.path.exists(ruta_control):
+        os.remove(ruta_control)
+    return sha.hexdigest()
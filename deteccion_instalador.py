@@ -0,0 +1,193 @@
+import os
+import json
+import struct
+import hashlib
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Tecnologías de instalador reconocidas
+MSI = 'msi'
+INNO = 'inno'
+NSIS = 'nsis'
+INSTALLSHIELD = 'installshield'
+WIX_BURN = 'wix-burn'
+SQUIRREL = 'squirrel'
+DESCONOCIDA = 'desconocida'
+
+# Familia de códigos de salida (codigos_salida.json) de cada tecnología
+FAMILIAS = {MSI: 'msi', WIX_BURN: 'msi', INNO: 'inno', NSIS: 'nsis'}
+
+FIRMA_OLE = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+FIRMA_VERSION = b'\xbd\x04\xef\xfe'  # VS_FIXEDFILEINFO.dwSignature (0xFEEF04BD)
+LIMITE_CABECERA = 4 * 1024 * 1024  # Cabecera + recursos, donde van los textos de versión
+LIMITE_OVERLAY = 1024 * 1024       # Inicio de los datos añadidos tras la última sección
+VERSION_DETECCION = 1              # Subirla invalida los veredictos guardados
+
+# Marcas en orden de prioridad; se buscan en ASCII y en UTF-16 (recursos de versión)
+MARCAS = (
+    (NSIS, (b'NullsoftInst',)),
+    (INNO, (b'Inno Setup Setup Data', b'Inno Setup Messages', b'rDlPtS')),
+    (INSTALLSHIELD, (b'InstallShield',)),
+    (SQUIRREL, (b'SquirrelSetup', b'Squirrel.Windows', b'Squirrel')),
+)
+
+
+def familia_de_tecnologia(tecnologia):
+    """Familia de códigos de salida para la tecnología, o None si no hay una específica"""
+    return FAMILIAS.get(tecnologia)
+
+
+def _secciones_pe(f, tamano):
+    """Lee la tabla de secciones de un PE. Devuelve (nombres, inicio_overlay) o None"""
+    f.seek(0)
+    dos = f.read(64)
+    if len(dos) < 64 or dos[:2] != b'MZ':
+        return None
+    inicio_pe = struct.unpack_from('<I', dos, 0x3C)[0]
+    if inicio_pe + 24 > tamano:
+        return None
+    f.seek(inicio_pe)
+    cabecera = f.read(24)
+    if cabecera[:4] != b'PE\0\0':
+        return None
+    cantidad, = struct.unpack_from('<H', cabecera, 6)
+    tamano_opcional, = struct.unpack_from('<H', cabecera, 20)
+    f.seek(inicio_pe + 24 + tamano_opcional)
+    tabla = f.read(40 * cantidad)
+    nombres, fin = [], 0
+    for i in range(cantidad):
+        entrada = tabla[i * 40:(i + 1) * 40]
+        if len(entrada) < 40:
+            break
+        nombres.append(entrada[:8].rstrip(b'\0').decode('ascii', errors='replace'))
+        tamano_datos, inicio_datos = struct.unpack_from('<II', entrada, 16)
+        fin = max(fin, inicio_datos + tamano_datos)
+    return nombres, fin
+
+
+def _buscar_marcas(*bloques):
+    for tecnologia, marcas in MARCAS:
+        for marca in marcas:
+            variantes = (marca, marca.decode('ascii').encode('utf-16-le'))
+            for bloque in bloques:
+                if any(variante in bloque for variante in variantes):
+                    return tecnologia, marca.decode('ascii')
+    return None
+
+
+def analizar_instalador(ruta):
+    """Identifica la tecnología del instalador leyendo solo cabeceras y firmas.
+
+    Reconoce MSI/MSP (documento OLE), WiX Burn (sección .wixburn) y, en el
+    resto de ejecutables PE, las marcas de NSIS, Inno Setup, InstallShield y
+    Squirrel en la cabecera/recursos o al inicio del overlay. Devuelve
+    {'tecnologia': ..., 'motivo': ...}; no depende de Windows.
+    """
+    tamano = os.path.getsize(ruta)
+    with open(ruta, 'rb') as f:
+        inicio = f.read(8)
+        if inicio == FIRMA_OLE:
+            return {'tecnologia': MSI, 'motivo': 'documento OLE (Windows Installer)'}
+        pe = _secciones_pe(f, tamano)
+        if pe is None:
+            return {'tecnologia': DESCONOCIDA, 'motivo': 'no es un ejecutable PE ni un MSI'}
+        secciones, inicio_overlay = pe
+        if '.wixburn' in secciones:
+            return {'tecnologia': WIX_BURN, 'motivo': 'sección .wixburn'}
+
+        f.seek(0)
+        cabecera = f.read(min(LIMITE_CABECERA, inicio_overlay or LIMITE_CABECERA))
+        overlay = b''
+        if 0 < inicio_overlay < tamano:
+            f.seek(inicio_overlay)
+            overlay = f.read(LIMITE_OVERLAY)
+
+    encontrada = _buscar_marcas(overlay, cabecera)
+    if encontrada:
+        return {'tecnologia': encontrada[0], 'motivo': f"marca '{encontrada[1]}'"}
+    return {'tecnologia': DESCONOCIDA, 'motivo': 'ejecutable PE sin marcas conocidas'}
+
+
+def version_archivo(ruta):
+    """Versión del ejecutable (VS_FIXEDFILEINFO de sus recursos), p.ej. '23.1.0.4', o None"""
+    tamano = os.path.getsize(ruta)
+    with open(ruta, 'rb') as f:
+        pe = _secciones_pe(f, tamano)
+        if pe is None:
+            return None
+        f.seek(0)
+        imagen = f.read(min(LIMITE_CABECERA, pe[1] or LIMITE_CABECERA))
+    posicion = imagen.find(FIRMA_VERSION)
+    if posicion < 0 or posicion + 16 > len(imagen):
+        return None
+    ms, ls = struct.unpack_from('<II', imagen, posicion + 8)
+    return f"{ms >> 16}.{ms & 0xFFFF}.{ls >> 16}.{ls & 0xFFFF}"
+
+
+class DetectorInstaladores:
+    """Detecta la tecnología de cada instalador y guarda el veredicto por hash de contenido.
+
+    Así cada archivo se analiza una sola vez aunque cambie de nombre o de
+    ruta. El hash lo aporta la caché de instaladores cuando lo conoce; si no,
+    se calcula (y se recuerda por ruta + tamaño + mtime durante la sesión).
+    """
+
+    ARCHIVO = 'deteccion_instaladores.json'
+
+    def __init__(self, directorio):
+        self.ruta = os.path.join(directorio, self.ARCHIVO)
+        self._lock = threading.Lock()
+        self._hashes = {}
+        self.veredictos = self._cargar()
+
+    def _cargar(self):
+        try:
+            with open(self.ruta, 'r', encoding='utf-8') as f:
+                datos = json.load(f)
+            if datos.get('version') == VERSION_DETECCION:
+                return datos.get('veredictos', {})
+        except (OSError, ValueError):
+            pass
+        return {}
+
+    def _guardar(self):
+        temporal = self.ruta + '.tmp'
+        try:
+            os.makedirs(os.path.dirname(self.ruta), exist_ok=True)
+            with open(temporal, 'w', encoding='utf-8') as f:
+                json.dump({'version': VERSION_DETECCION, 'veredictos': self.veredictos}, f, indent=1)
+            os.replace(temporal, self.ruta)
+        except OSError as e:
+            logger.warning(f"No se pudo guardar {self.ruta}: {e}")
+
+    def hash_archivo(self, ruta):
+        """SHA-256 del archivo, calculado una vez por ruta + tamaño + mtime"""
+        stat = os.stat(ruta)
+        clave = f"{os.path.normcase(os.path.abspath(ruta))}|{stat.st_size}|{int(stat.st_mtime)}"
+        if clave not in self._hashes:
+            sha = hashlib.sha256()
+            with open(ruta, 'rb') as f:
+                for bloque in iter(lambda: f.read(1024 * 1024), b''):
+                    sha.update(bloque)
+            self._hashes[clave] = sha.hexdigest()
+        return self._hashes[clave]
+
+    def detectar(self, ruta, hash_contenido=None):
+        """Devuelve {'tecnologia', 'motivo'} del instalador, analizándolo solo la primera vez"""
+        hash_contenido = hash_contenido or self.hash_archivo(ruta)
+        with self._lock:
+            veredicto = self.veredictos.get(hash_contenido)
+        if veredicto:
+            return veredicto
+        try:
+            veredicto = analizar_instalador(ruta)
+        except (OSError, struct.error) as e:
+            logger.warning(f"No se pudo analizar {ruta}: {e}")
+            return {'tecnologia': DESCONOCIDA, 'motivo': str(e)}
+        logger.info(f"{os.path.basename(ruta)}: {veredicto['tecnologia']} ({veredicto['motivo']})")
+        with self._lock:
+            self.veredictos[hash_contenido] = veredicto
+            self._guardar()
+        return veredicto
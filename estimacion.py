@@ -0,0 +1,185 @@
+import time
+import threading
+from statistics import median
+from copia_archivos import formatear_duracion
+
+DURACION_POR_DEFECTO = 60.0  # Segundos previstos para una app sin historial
+MUESTRAS = 10                # Intentos exitosos recientes que se consideran
+TOPE_EN_CURSO = 0.95         # Una app en curso nunca cuenta como terminada
+MARGEN_ATIPICO = 1.5         # real > previsto * margen: se resalta en el resumen
+
+
+class EstimadorDuraciones:
+    """Prevé cuánto tardará cada app a partir de sus instalaciones exitosas anteriores"""
+
+    def __init__(self, historial, muestras=MUESTRAS):
+        self.historial = historial
+        self.muestras = muestras
+
+    def prevision(self, app_name):
+        """Devuelve {'duracion', 'copia', 'bytes', 'muestras'} (medianas de los últimos intentos exitosos)"""
+        intentos = [i for i in self.historial.intentos(app_name, limite=self.muestras * 3)
+                    if i['estado'] == 'exitoso' and i['duracion_total']][:self.muestras]
+        if not intentos:
+            return {'duracion': None, 'copia': 0.0, 'bytes': 0, 'muestras': 0}
+        return {
+            'duracion': median(i['duracion_total'] for i in intentos),
+            'copia': median(i['duracion_copia'] or 0.0 for i in intentos),
+            'bytes': median(i['bytes_instalador'] or 0 for i in intentos),
+            'muestras': len(intentos),
+        }
+
+    def previsiones(self, cola):
+        """Previsión de cada app de la cola; las que no tienen historial usan la mediana del resto"""
+        previsiones = {app_name: self.prevision(app_name) for app_name in cola}
+        conocidas = [p['duracion'] for p in previsiones.values() if p['duracion']]
+        por_defecto = median(conocidas) if conocidas else DURACION_POR_DEFECTO
+        for prevision in previsiones.values():
+            if not prevision['duracion']:
+                prevision['duracion'] = por_defecto
+        return previsiones
+
+
+class ProgresoPonderado:
+    """Avance de la cola ponderado por la duración prevista de cada app.
+
+    Una app de 40 minutos pesa 40 veces más que una de 1 minuto. Mientras una
+    app se copia avanza según los bytes copiados (en la parte de su duración
+    que corresponde a la copia) y mientras se instala según el tiempo
+    transcurrido frente al previsto. La copia prevista de una app que se
+    copiaba otras veces sale de su tamaño mediano y la velocidad de la red en
+    esta cola, así una red lenta hoy pesa más que la mediana histórica. Es
+    seguro llamarlo desde varios hilos.
+    """
+
+    def __init__(self, cola, previsiones, rutas=None):
+        self.cola = list(cola)
+        self.previsiones = previsiones
+        self.rutas = {ruta: app_name for app_name, ruta in (rutas or {}).items()}
+        self.total_previsto = sum(previsiones[app]['duracion'] for app in self.cola) or 1.0
+        self.inicio = time.monotonic()
+        self._lock = threading.Lock()
+        self._copia = {}      # {app: fracción copiada}
+        self._en_curso = {}   # {app: inicio de la instalación}
+        self._reales = {}     # {app: (duración real, estado)}
+        self._inicios = {}    # {app: primer momento en que empezó a prepararse}
+        self.bytes_por_segundo = 0.0
+        self.velocidad_copia = 0.0   # Última velocidad observada (no vuelve a 0 entre copias)
+
+    def _copia_prevista(self, app_name):
+        prevision = self.previsiones[app_name]
+        # Solo si se copiaba otras veces: en local `bytes` es el tamaño, pero no hay copia
+        if prevision['copia'] and prevision['bytes'] and self.velocidad_copia:
+            return prevision['bytes'] / self.velocidad_copia
+        return prevision['copia']
+
+    def _duracion_prevista(self, app_name):
+        prevision = self.previsiones[app_name]
+        return max(prevision['duracion'] - prevision['copia'] + self._copia_prevista(app_name), 1e-6)
+
+    def _parte_copia(self, app_name):
+        return min(self._copia_prevista(app_name) / self._duracion_prevista(app_name), 1.0)
+
+    def actualizar_copia(self, ruta, copiados, total, velocidad):
+        """Avance de la copia de un instalador (la ruta de red de `aplicaciones`)"""
+        app_name = self.rutas.get(ruta)
+        with self._lock:
+            self.bytes_por_segundo = velocidad if copiados < total else 0.0
+            if velocidad > 0:
+                self.velocidad_copia = velocidad
+            if app_name:
+                self._copia[app_name] = (copiados / total) if total else 1.0
+
+    def preparando(self, app_name):
+        """La app tomó un hueco de la cola (puede esperar todavía a su copia)"""
+        with self._lock:
+            self._inicios.setdefault(app_name, time.monotonic())
+
+    def instalando(self, app_name):
+        """El instalador de la app empezó a ejecutarse"""
+        with self._lock:
+            self._en_curso[app_name] = time.monotonic()
+
+    def terminar(self, app_name, estado):
+        ahora = time.monotonic()
+        with self._lock:
+            self._en_curso.pop(app_name, None)
+            inicio = self._inicios.get(app_name)
+            self._reales[app_name] = ((ahora - inicio) if inicio is not None else None, estado)
+
+    def _avance_app(self, app_name, ahora):
+        if app_name in self._reales:
+            return 1.0
+        parte_copia = self._parte_copia(app_name)
+        avance = parte_copia * self._copia.get(app_name, 0.0)
+        if app_name in self._en_curso:
+            ejecucion = max(self._duracion_prevista(app_name) * (1 - parte_copia), 1e-6)
+            transcurrido = ahora - self._en_curso[app_name]
+            avance = parte_copia + (1 - parte_copia) * min(transcurrido / ejecucion, 1.0)
+        return min(avance, TOPE_EN_CURSO)
+
+    def instantanea(self):
+        """Devuelve {'fraccion', 'eta', 'terminadas', 'total', 'bytes_por_segundo'}"""
+        ahora = time.monotonic()
+        with self._lock:
+            duraciones = {app: self._duracion_prevista(app) for app in self.cola}
+            hecho = sum(duraciones[app] * self._avance_app(app, ahora) for app in self.cola)
+            total_previsto = sum(duraciones.values()) or 1.0
+            terminadas = len(self._reales)
+            velocidad = self.bytes_por_segundo
+        fraccion = min(hecho / total_previsto, 1.0)
+        transcurrido = ahora - self.inicio
+        if fraccion >= 1.0:
+            eta = 0.0
+        elif fraccion >= 0.1 and transcurrido > 5:
+            # Con suficiente avance se extrapola el ritmo real (incluye paralelismo y desvíos)
+            eta = transcurrido * (1 - fraccion) / fraccion
+        else:
+            eta = total_previsto - hecho
+        return {'fraccion': fraccion, 'eta': eta, 'terminadas': terminadas,
+                'total': len(self.cola), 'bytes_por_segundo': velocidad}
+
+    def estados_apps(self):
+        """{app: (fase, avance de la copia o None)}; fase: pendiente | preparando | instalando | estado final"""
+        with self._lock:
+            estados = {}
+            for app_name in self.cola:
+                if app_name in self._reales:
+                    fase = self._reales[app_name][1]
+                elif app_name in self._en_curso:
+                    fase = 'instalando'
+                elif app_name in self._inicios:
+                    fase = 'preparando'
+                else:
+                    fase = 'pendiente'
+                estados[app_name] = (fase, self._copia.get(app_name))
+        return estados
+
+    def tiempos(self):
+        """[{'app', 'previsto', 'real', 'estado', 'muestras'}] en el orden de la cola"""
+        with self._lock:
+            reales = dict(self._reales)
+        return [{'app': app_name,
+                 'previsto': self.previsiones[app_name]['duracion'],
+                 'real': reales.get(app_name, (None, None))[0],
+                 'estado': reales.get(app_name, (None, 'pendiente'))[1],
+                 'muestras': self.previsiones[app_name]['muestras']}
+                for app_name in self.cola]
+
+
+def formatear_tiempos(tiempos):
+    """Texto 'real vs previsto' por app para el resumen; marca con ⚠️ las que se desviaron"""
+    lineas = []
+    for tiempo in tiempos:
+        if tiempo['real'] is None:
+            lineas.append(f"• {tiempo['app']}: {tiempo['estado']}")
+            continue
+        texto = f"• {tiempo['app']}: {formatear_duracion(tiempo['real'])}"
+        if tiempo['muestras']:
+            texto += f" (previsto {formatear_duracion(tiempo['previsto'])})"
+            if tiempo['real'] > tiempo['previsto'] * MARGEN_ATIPICO:
+                texto += " ⚠️"
+        else:
+            texto += " (sin historial)"
+        lineas.append(texto)
+    return "\n".join(lineas)
@@ -0,0 +1,88 @@
+import os
+import json
+import time
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Formas de ejecutar un instalador, en el orden por defecto
+USUARIO_ACTUAL = 'usuario_actual'
+CREDENCIALES_ADMIN = 'credenciales_admin'
+ESTRATEGIAS = (USUARIO_ACTUAL, CREDENCIALES_ADMIN)
+
+
+class TablaEstrategias:
+    """Recuerda qué estrategia de ejecución funcionó para cada app e instalador.
+
+    La clave es la app más el hash del instalador: una versión nueva vuelve a
+    empezar por el orden por defecto. Si la estrategia aprendida falla se
+    prueban las demás y se aprende la que funcione.
+    """
+
+    ARCHIVO = 'estrategias_aprendidas.json'
+
+    def __init__(self, directorio):
+        self.ruta = os.path.join(directorio, self.ARCHIVO)
+        self._lock = threading.Lock()
+        self.tabla = self._cargar()
+
+    def _cargar(self):
+        try:
+            with open(self.ruta, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _guardar(self):
+        temporal = self.ruta + '.tmp'
+        try:
+            os.makedirs(os.path.dirname(self.ruta), exist_ok=True)
+            with open(temporal, 'w', encoding='utf-8') as f:
+                json.dump(self.tabla, f, indent=1, ensure_ascii=False)
+            os.replace(temporal, self.ruta)
+        except OSError as e:
+            logger.warning(f"No se pudo guardar {self.ruta}: {e}")
+
+    @staticmethod
+    def _clave(app_name, hash_contenido):
+        return f"{app_name}|{hash_contenido or ''}"
+
+    def orden_para(self, app_name, hash_contenido):
+        """Estrategias a probar: primero la que funcionó la última vez"""
+        with self._lock:
+            entrada = self.tabla.get(self._clave(app_name, hash_contenido))
+        if not entrada or entrada.get('estrategia') not in ESTRATEGIAS:
+            return list(ESTRATEGIAS)
+        return [entrada['estrategia']] + [e for e in ESTRATEGIAS if e != entrada['estrategia']]
+
+    def registrar(self, app_name, hash_contenido, estrategia, exitoso):
+        """Anota el resultado de una estrategia; las exitosas pasan a ser las preferidas"""
+        clave = self._clave(app_name, hash_contenido)
+        with self._lock:
+            entrada = self.tabla.setdefault(clave, {'app': app_name, 'hash': hash_contenido,
+                                                    'estrategia': None, 'exitos': {}, 'fallos': {}})
+            contadores = entrada['exitos' if exitoso else 'fallos']
+            contadores[estrategia] = contadores.get(estrategia, 0) + 1
+            if exitoso:
+                entrada['estrategia'] = estrategia
+            elif entrada['estrategia'] == estrategia:
+                entrada['estrategia'] = None
+            entrada['actualizado'] = time.time()
+            self._guardar()
+
+    def entradas(self):
+        """Copia de la tabla: [{app, hash, estrategia, exitos, fallos, actualizado}]"""
+        with self._lock:
+            return sorted((dict(entrada) for entrada in self.tabla.values()),
+                          key=lambda entrada: entrada['app'])
+
+    def reiniciar(self, app_name=None):
+        """Olvida lo aprendido (de una app o de todas). Devuelve cuántas entradas se borraron"""
+        with self._lock:
+            claves = [clave for clave, entrada in self.tabla.items()
+                      if app_name is None or entrada['app'] == app_name]
+            for clave in claves:
+                del self.tabla[clave]
+            self._guardar()
+        return len(claves)
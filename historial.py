@@ -0,0 +1,179 @@
+import os
+import time
+import socket
+import sqlite3
+import logging
+import tempfile
+import threading
+
+logger = logging.getLogger(__name__)
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS ejecuciones (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    equipo TEXT,
+    inicio REAL NOT NULL,
+    fin REAL,
+    total INTEGER,
+    exitosos INTEGER,
+    fallidos INTEGER
+);
+CREATE TABLE IF NOT EXISTS intentos (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ejecucion_id INTEGER REFERENCES ejecuciones(id),
+    app TEXT NOT NULL,
+    reintento INTEGER DEFAULT 0,
+    hash TEXT,
+    tecnologia TEXT,
+    estrategia TEXT,
+    codigo_salida INTEGER,
+    clase TEXT,
+    estado TEXT,
+    inicio REAL NOT NULL,
+    fin REAL,
+    duracion_total REAL,
+    duracion_resolver REAL,     -- localizar el instalador en la red
+    duracion_copia REAL,        -- copia a la caché local (0 si fue un acierto)
+    bytes_copia INTEGER,
+    duracion_verificacion REAL, -- hash y detección de tecnología del instalador local
+    duracion_ejecucion REAL,    -- el instalador en sí, sumando las estrategias probadas
+    bytes_instalador INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_intentos_app_inicio ON intentos(app, inicio);
+CREATE INDEX IF NOT EXISTS idx_intentos_inicio ON intentos(inicio);
+CREATE INDEX IF NOT EXISTS idx_intentos_ejecucion ON intentos(ejecucion_id);
+"""
+
+COLUMNAS_INTENTO = ('reintento', 'hash', 'tecnologia', 'estrategia', 'codigo_salida', 'clase', 'estado',
+                    'inicio', 'fin', 'duracion_total', 'duracion_resolver', 'duracion_copia', 'bytes_copia',
+                    'duracion_verificacion', 'duracion_ejecucion', 'bytes_instalador')
+
+
+def ruta_historial_por_defecto():
+    """Base de datos del historial (persistente entre ejecuciones)"""
+    base = os.environ.get('LOCALAPPDATA') or os.environ.get('TEMP') or tempfile.gettempdir()
+    return os.path.join(base, 'InstaladorMultiApp', 'historial.db')
+
+
+class HistorialInstalaciones:
+    """Historial de instalaciones en SQLite: una fila por ejecución de la cola y
+    una por cada intento de instalar una app, con la duración de cada fase.
+
+    Se puede usar desde varios hilos a la vez. Los errores de la base de datos
+    se registran pero nunca interrumpen una instalación.
+    """
+
+    def __init__(self, ruta=None):
+        self.ruta = ruta or ruta_historial_por_defecto()
+        self._lock = threading.Lock()
+        self._conexion = None
+        try:
+            if self.ruta != ':memory:':
+                os.makedirs(os.path.dirname(self.ruta), exist_ok=True)
+            self._conexion = sqlite3.connect(self.ruta, check_same_thread=False, timeout=10)
+            self._conexion.row_factory = sqlite3.Row
+            if self.ruta != ':memory:':
+                self._conexion.execute('PRAGMA journal_mode=WAL')
+            self._conexion.executescript(ESQUEMA)
+            self._conexion.commit()
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Historial deshabilitado ({self.ruta}): {e}")
+            self._conexion = None
+
+    @classmethod
+    def desde_configuracion(cls, config):
+        """Crea el historial a partir de la sección `historial` de config.json"""
+        return cls((config or {}).get('ruta'))
+
+    @property
+    def disponible(self):
+        return self._conexion is not None
+
+    def _ejecutar(self, sql, parametros=()):
+        if self._conexion is None:
+            return None
+        try:
+            with self._lock:
+                cursor = self._conexion.execute(sql, parametros)
+                self._conexion.commit()
+                return cursor
+        except sqlite3.Error as e:
+            logger.warning(f"Error en el historial: {e}")
+            return None
+
+    def _consultar(self, sql, parametros=()):
+        if self._conexion is None:
+            return []
+        try:
+            with self._lock:
+                return [dict(fila) for fila in self._conexion.execute(sql, parametros).fetchall()]
+        except sqlite3.Error as e:
+            logger.warning(f"Error consultando el historial: {e}")
+            return []
+
+    # ------------------------------------------------------------------
+    # Escritura
+    # ------------------------------------------------------------------
+    def iniciar_ejecucion(self, total):
+        """Registra el comienzo de una cola. Devuelve su id (o None sin historial)"""
+        cursor = self._ejecutar('INSERT INTO ejecuciones (equipo, inicio, total) VALUES (?, ?, ?)',
+                                (socket.gethostname(), time.time(), total))
+        return cursor.lastrowid if cursor else None
+
+    def finalizar_ejecucion(self, ejecucion_id, exitosos, fallidos):
+        if ejecucion_id is None:
+            return
+        self._ejecutar('UPDATE ejecuciones SET fin = ?, exitosos = ?, fallidos = ? WHERE id = ?',
+                       (time.time(), exitosos, fallidos, ejecucion_id))
+
+    def registrar_intento(self, ejecucion_id, app_name, **datos):
+        """Guarda un intento; `datos` usa los nombres de columna de la tabla `intentos`"""
+        desconocidas = set(datos) - set(COLUMNAS_INTENTO)
+        if desconocidas:
+            raise ValueError(f"Columnas desconocidas en el historial: {', '.join(sorted(desconocidas))}")
+        datos.setdefault('inicio', time.time())
+        columnas = ['ejecucion_id', 'app'] + list(datos)
+        self._ejecutar(f"INSERT INTO intentos ({', '.join(columnas)}) VALUES ({', '.join('?' * len(columnas))})",
+                       [ejecucion_id, app_name] + list(datos.values()))
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+    def intentos(self, app_name=None, desde=None, hasta=None, limite=100):
+        """Intentos más recientes primero, filtrados por app y/o rango de fechas (epoch)"""
+        condiciones, parametros = [], []
+        if app_name is not None:
+            condiciones.append('app = ?')
+            parametros.append(app_name)
+        if desde is not None:
+            condiciones.append('inicio >= ?')
+            parametros.append(desde)
+        if hasta is not None:
+            condiciones.append('inicio < ?')
+            parametros.append(hasta)
+        donde = f"WHERE {' AND '.join(condiciones)}" if condiciones else ''
+        return self._consultar(f"SELECT * FROM intentos {donde} ORDER BY inicio DESC LIMIT ?",
+                               parametros + [limite])
+
+    def ejecuciones(self, limite=20):
+        return self._consultar('SELECT * FROM ejecuciones ORDER BY inicio DESC LIMIT ?', (limite,))
+
+    def mas_lentas(self, desde=None, hasta=None, limite=10):
+        """Apps que más tiempo sumaron en el rango: [{app, intentos, duracion, copia, ejecucion, bytes}]"""
+        desde = 0 if desde is None else desde
+        hasta = time.time() + 1 if hasta is None else hasta
+        return self._consultar(
+            """SELECT app, COUNT(*) AS intentos,
+                      SUM(duracion_total) AS duracion,
+                      SUM(duracion_copia) AS copia,
+                      SUM(duracion_ejecucion) AS ejecucion,
+                      SUM(bytes_copia) AS bytes
+               FROM intentos WHERE inicio >= ? AND inicio < ?
+               GROUP BY app ORDER BY duracion DESC LIMIT ?""",
+            (desde, hasta, limite))
+
+    def cerrar(self):
+        with self._lock:
+            if self._conexion is not None:
+                self._conexion.close()
+                self._conexion = None
@@ -0,0 +1,97 @@
+import unicodedata
+from itertools import compress
+
+TAMANO_NGRAMA = 3
+_BITS = bytes.maketrans(b'01', b'\x00\x01')
+
+
+def normalizar(texto):
+    """Minúsculas y sin acentos ni diéresis ('Configuración' -> 'configuracion')"""
+    descompuesto = unicodedata.normalize('NFKD', texto or '')
+    return ''.join(c for c in descompuesto if not unicodedata.combining(c)).casefold()
+
+
+def _ngramas(texto, n):
+    return {texto[i:i + n] for i in range(len(texto) - n + 1)}
+
+
+def _mascara(indices, total):
+    """Convierte una colección de índices en un entero con esos bits encendidos"""
+    bits = bytearray(total // 8 + 1)
+    for i in indices:
+        bits[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(bits, 'little')
+
+
+def _selector(mascara):
+    """Bytes 0/1 por posición (bit 0 primero), para usar con itertools.compress"""
+    return format(mascara, 'b')[::-1].encode('ascii').translate(_BITS)
+
+
+class IndiceBusqueda:
+    """Índice de búsqueda por subcadena sobre {nombre: ruta}.
+
+    Se construye una vez por catálogo: cada entrada se normaliza (sin acentos,
+    en minúsculas) y se registra en tablas de n-gramas de 1 a 3 caracteres,
+    guardadas como máscaras de bits (bit i = entrada i). Una consulta se divide
+    en palabras y devuelve las entradas que contienen todas: las palabras
+    cortas se resuelven directamente con su tabla y las largas con el AND de
+    sus trigramas, verificando solo los candidatos. Si la consulta extiende a
+    la anterior (el usuario sigue escribiendo) se parte del resultado previo.
+    """
+
+    def __init__(self, aplicaciones):
+        self.aplicaciones = aplicaciones
+        self.elementos = list((aplicaciones or {}).items())
+        self.textos = [f"{normalizar(nombre)}\n{normalizar(ruta)}" for nombre, ruta in self.elementos]
+        self.todos = (1 << len(self.elementos)) - 1
+        posiciones = [{} for _ in range(TAMANO_NGRAMA + 1)]
+        for indice, texto in enumerate(self.textos):
+            for n in range(1, TAMANO_NGRAMA + 1):
+                tabla = posiciones[n]
+                for ngrama in _ngramas(texto, n):
+                    tabla.setdefault(ngrama, []).append(indice)
+        total = len(self.elementos)
+        self.ngramas = [{ngrama: _mascara(indices, total) for ngrama, indices in tabla.items()}
+                        for tabla in posiciones]
+        self._ultima_consulta = ''
+        self._ultima_mascara = None
+
+    def _mascara_palabra(self, palabra, dentro):
+        """Máscara de las entradas de `dentro` que contienen `palabra` (ya normalizada)"""
+        if len(palabra) <= TAMANO_NGRAMA:
+            return dentro & self.ngramas[len(palabra)].get(palabra, 0)
+        candidatos = dentro
+        for ngrama in _ngramas(palabra, TAMANO_NGRAMA):
+            candidatos &= self.ngramas[TAMANO_NGRAMA].get(ngrama, 0)
+            if not candidatos:
+                return 0
+        # Tener todos los trigramas no garantiza la subcadena completa; los
+        # falsos positivos son raros, así que solo se buscan si aparece alguno
+        seleccion = _selector(candidatos)
+        if all(palabra in texto for texto in compress(self.textos, seleccion)):
+            return candidatos
+        falsos = [i for i in compress(range(len(self.textos)), seleccion) if palabra not in self.textos[i]]
+        return candidatos & ~_mascara(falsos, len(self.textos))
+
+    def _buscar_mascara(self, consulta):
+        consulta = normalizar(consulta).strip()
+        mascara = self.todos
+        if self._ultima_mascara is not None and self._ultima_consulta and consulta.startswith(self._ultima_consulta):
+            # La consulta creció: basta con refinar el resultado anterior
+            mascara = self._ultima_mascara
+        for palabra in sorted(set(consulta.split()), key=len, reverse=True):
+            mascara = self._mascara_palabra(palabra, mascara)
+            if not mascara:
+                break
+        self._ultima_consulta = consulta
+        self._ultima_mascara = mascara
+        return mascara
+
+    def buscar(self, consulta):
+        """Devuelve los índices (en orden del catálogo) que coinciden con la consulta"""
+        return list(compress(range(len(self.elementos)), _selector(self._buscar_mascara(consulta))))
+
+    def filtrar(self, consulta):
+        """Devuelve la lista de tuplas (nombre, ruta) que coinciden con la consulta"""
+        return list(compress(self.elementos, _selector(self._buscar_mascara(consulta))))
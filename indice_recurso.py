@@ -0,0 +1,227 @@
+import os
+import re
+import json
+import time
+import hashlib
+import logging
+import tempfile
+import threading
+from deteccion_instalador import version_archivo
+
+logger = logging.getLogger(__name__)
+
+EXTENSIONES = ('.exe', '.msi', '.msp')
+VERSION_INDICE = 1   # Subirla obliga a reescanear todo
+
+
+def ruta_indice_por_defecto():
+    """Archivo donde se guarda el índice de los recursos compartidos"""
+    base = os.environ.get('LOCALAPPDATA') or os.environ.get('TEMP') or tempfile.gettempdir()
+    return os.path.join(base, 'InstaladorMultiApp', 'indice_recurso.json')
+
+
+def _sha256(ruta):
+    sha = hashlib.sha256()
+    with open(ruta, 'rb') as f:
+        for bloque in iter(lambda: f.read(1024 * 1024), b''):
+            sha.update(bloque)
+    return sha.hexdigest()
+
+
+def _nombre_archivo(ruta):
+    # Acepta rutas UNC aunque se ejecute fuera de Windows
+    return re.split(r'[\\/]', ruta)[-1]
+
+
+def nombre_aplicacion(nombre_archivo):
+    """Nombre legible para `aplicaciones` a partir del archivo: 'acrobat_reader-x64.exe' -> 'Acrobat Reader x64'"""
+    base = os.path.splitext(nombre_archivo)[0]
+    palabras = [p for p in re.split(r'[\s_\-.]+', base) if p]
+    return ' '.join(p if p.isupper() or any(c.isdigit() for c in p) else p.capitalize()
+                    for p in palabras) or nombre_archivo
+
+
+class IndiceRecurso:
+    """Índice de los instaladores que hay en los recursos compartidos.
+
+    Recorre cada raíz una vez y guarda, por archivo, tamaño, mtime, versión y
+    hash. Los siguientes escaneos solo listan los directorios cuyo mtime
+    cambió (a los demás les basta un `stat`), y `resolver` busca cualquier
+    nombre de archivo en un diccionario, sin tocar la red.
+
+    Un archivo sobrescrito en su sitio no cambia el mtime de su directorio:
+    `escanear(completo=True)` vuelve a listar todo.
+    """
+
+    def __init__(self, raices, ruta_indice=None, extensiones=EXTENSIONES, calcular_hash=True):
+        self.raices = [r for r in raices if r]
+        self.ruta_indice = ruta_indice or ruta_indice_por_defecto()
+        self.extensiones = tuple(e.lower() for e in extensiones)
+        self.calcular_hash = calcular_hash
+        self._lock = threading.Lock()
+        self.datos = self._cargar()
+        self._por_nombre = {}
+        self._reconstruir_nombres()
+        self.estadisticas = {'directorios_listados': 0, 'directorios_sin_cambios': 0,
+                             'archivos_analizados': 0, 'duracion': 0.0}
+
+    @classmethod
+    def desde_configuracion(cls, config):
+        """Crea el índice a partir de la sección `indice_recurso` de config.json"""
+        config = config or {}
+        return cls(config.get('raices') or [],
+                   ruta_indice=config.get('ruta_indice'),
+                   extensiones=config.get('extensiones') or EXTENSIONES,
+                   calcular_hash=config.get('calcular_hash', True))
+
+    # ------------------------------------------------------------------
+    # Persistencia
+    # ------------------------------------------------------------------
+    def _cargar(self):
+        try:
+            with open(self.ruta_indice, 'r', encoding='utf-8') as f:
+                datos = json.load(f)
+            if datos.get('version') == VERSION_INDICE:
+                return datos
+        except (OSError, ValueError):
+            pass
+        return {'version': VERSION_INDICE, 'raices': {}}
+
+    def guardar(self):
+        temporal = self.ruta_indice + '.tmp'
+        try:
+            os.makedirs(os.path.dirname(self.ruta_indice), exist_ok=True)
+            with self._lock:
+                with open(temporal, 'w', encoding='utf-8') as f:
+                    json.dump(self.datos, f, ensure_ascii=False)
+            os.replace(temporal, self.ruta_indice)
+        except OSError as e:
+            logger.warning(f"No se pudo guardar {self.ruta_indice}: {e}")
+
+    def _reconstruir_nombres(self):
+        """Tabla nombre de archivo -> ruta (ante duplicados gana el más reciente)"""
+        por_nombre = {}
+        for raiz, directorios in self.datos['raices'].items():
+            for relativo, directorio in directorios.items():
+                for nombre, archivo in directorio['archivos'].items():
+                    clave = nombre.lower()
+                    actual = por_nombre.get(clave)
+                    if actual is None or archivo['mtime'] > actual[1]['mtime']:
+                        ruta = os.path.join(raiz, relativo, nombre) if relativo else os.path.join(raiz, nombre)
+                        por_nombre[clave] = (ruta, archivo)
+        with self._lock:
+            self._por_nombre = por_nombre
+
+    # ------------------------------------------------------------------
+    # Escaneo
+    # ------------------------------------------------------------------
+    def _analizar(self, ruta, stat, anterior):
+        """Metadatos de un archivo; reutiliza los anteriores si no cambió"""
+        if anterior and anterior['tamano'] == stat.st_size and anterior['mtime'] == stat.st_mtime:
+            return anterior
+        self.estadisticas['archivos_analizados'] += 1
+        entrada = {'tamano': stat.st_size, 'mtime': stat.st_mtime, 'version': None, 'hash': None}
+        try:
+            entrada['version'] = version_archivo(ruta)
+            if self.calcular_hash:
+                entrada['hash'] = _sha256(ruta)
+        except OSError as e:
+            logger.warning(f"No se pudo analizar {ruta}: {e}")
+        return entrada
+
+    def _escanear_directorio(self, raiz, relativo, previos, nuevos, completo):
+        ruta = os.path.join(raiz, relativo) if relativo else raiz
+        try:
+            mtime = os.stat(ruta).st_mtime
+        except OSError as e:
+            logger.warning(f"Directorio no accesible en el índice: {ruta} ({e})")
+            return
+        anterior = previos.get(relativo)
+        if anterior and anterior['mtime'] == mtime and not completo:
+            # Sin altas, bajas ni renombrados: se conserva y se baja a los subdirectorios
+            self.estadisticas['directorios_sin_cambios'] += 1
+            nuevos[relativo] = anterior
+            subdirectorios = anterior['subdirectorios']
+        else:
+            self.estadisticas['directorios_listados'] += 1
+            archivos, subdirectorios = {}, []
+            archivos_previos = anterior['archivos'] if anterior else {}
+            try:
+                with os.scandir(ruta) as entradas:
+                    for entrada in entradas:
+                        try:
+                            if entrada.is_dir():
+                                subdirectorios.append(entrada.name)
+                            elif entrada.name.lower().endswith(self.extensiones):
+                                archivos[entrada.name] = self._analizar(entrada.path, entrada.stat(),
+                                                                        archivos_previos.get(entrada.name))
+                        except OSError as e:
+                            logger.warning(f"Entrada omitida en el índice: {entrada.path} ({e})")
+            except OSError as e:
+                logger.warning(f"No se pudo listar {ruta}: {e}")
+                return
+            nuevos[relativo] = {'mtime': mtime, 'archivos': archivos, 'subdirectorios': sorted(subdirectorios)}
+        for subdirectorio in subdirectorios:
+            self._escanear_directorio(raiz, os.path.join(relativo, subdirectorio) if relativo else subdirectorio,
+                                      previos, nuevos, completo)
+
+    def escanear(self, completo=False):
+        """Actualiza el índice de todas las raíces y lo guarda. Devuelve las estadísticas"""
+        inicio = time.monotonic()
+        self.estadisticas = {'directorios_listados': 0, 'directorios_sin_cambios': 0,
+                             'archivos_analizados': 0, 'duracion': 0.0}
+        raices = {}
+        for raiz in self.raices:
+            nuevos = {}
+            self._escanear_directorio(raiz, '', self.datos['raices'].get(raiz, {}), nuevos, completo)
+            if nuevos:
+                raices[raiz] = nuevos
+            elif raiz in self.datos['raices']:
+                # Raíz inaccesible ahora: se conserva lo último conocido
+                raices[raiz] = self.datos['raices'][raiz]
+        with self._lock:
+            self.datos = {'version': VERSION_INDICE, 'raices': raices, 'actualizado': time.time()}
+        self._reconstruir_nombres()
+        self.guardar()
+        self.estadisticas['duracion'] = time.monotonic() - inicio
+        return dict(self.estadisticas, archivos=len(self._por_nombre))
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+    def resolver(self, nombre_archivo):
+        """Ruta completa del archivo con ese nombre (sin distinguir mayúsculas) o None"""
+        with self._lock:
+            encontrado = self._por_nombre.get(_nombre_archivo(nombre_archivo).lower())
+        return encontrado[0] if encontrado else None
+
+    def informacion(self, nombre_archivo):
+        """{'ruta', 'tamano', 'mtime', 'version', 'hash'} del archivo o None"""
+        with self._lock:
+            encontrado = self._por_nombre.get(_nombre_archivo(nombre_archivo).lower())
+        return dict(encontrado[1], ruta=encontrado[0]) if encontrado else None
+
+    def archivos(self):
+        """[{'nombre', 'ruta', 'tamano', 'mtime', 'version', 'hash'}] ordenados por nombre"""
+        with self._lock:
+            elementos = list(self._por_nombre.values())
+        return sorted((dict(archivo, nombre=os.path.basename(ruta), ruta=ruta) for ruta, archivo in elementos),
+                      key=lambda archivo: archivo['nombre'].lower())
+
+    def generar_aplicaciones(self, existentes=None):
+        """Entradas de `aplicaciones` para config.json.
+
+        Conserva las existentes (nombres editados a mano) y añade una por cada
+        instalador del índice que ninguna entrada referencia todavía.
+        """
+        aplicaciones = dict(existentes or {})
+        referenciados = {_nombre_archivo(ruta).lower() for ruta in aplicaciones.values()}
+        for archivo in self.archivos():
+            if archivo['nombre'].lower() in referenciados:
+                continue
+            nombre = nombre_aplicacion(archivo['nombre'])
+            if nombre in aplicaciones:
+                nombre = f"{nombre} ({archivo['nombre']})"
+            aplicaciones[nombre] = archivo['ruta']
+            referenciados.add(archivo['nombre'].lower())
+        return aplicaciones
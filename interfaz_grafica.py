@@ -0,0 +1,733 @@
+import os
+import json
+import subprocess
+import threading
+import tkinter as tk
+import ctypes
+import sys
+import getpass
+import time
+import socket
+import shutil 
+import logging
+from tkinter import ttk, messagebox, filedialog
+from tkinter import font as tkFont
+from apps_manager import filter_aplicaciones, obtener_parametros_instalacion, obtener_parametros_silenciosos, preparar_instalacion_especifica
+from auth_credentials import AutenticacionCredenciales
+from copia_archivos import formatear_bytes, formatear_duracion
+from motor_instalacion import MotorInstalacion
+from lista_virtual import ListaVirtualAplicaciones
+from indice_busqueda import IndiceBusqueda
+from estimacion import formatear_tiempos
+from styles import setup_styles
+from trazas import trazador
+from registro import configurar_registro
+from bomba_interfaz import BombaInterfaz
+from pathlib import Path 
+
+logger = logging.getLogger(__name__)
+
+# Líneas que conserva el panel de registro de la ventana
+LINEAS_PANEL_REGISTRO = 300
+
+class InstaladorModerno:
+    def __init__(self, root, inicio=None):
+        self.root = root
+        # Desglose del arranque (segundos desde `inicio`) hasta que se ve la ventana
+        self.inicio_arranque = inicio if inicio is not None else time.perf_counter()
+        self.tiempos_arranque = {}
+        self.root.title("Instalador MultiApp")
+        self.root.geometry("1000x850")
+        self.root.update_idletasks()
+        sw = self.root.winfo_screenwidth()
+        sh = self.root.winfo_screenheight()
+        w, h = 1000, 850
+        x = (sw - w) // 2
+        y = (sh - h) // 2
+        self.root.geometry(f"{w}x{h}+{x}+{y}")
+        self.root.configure(bg='#f5f6f8')
+
+        # Cargar config (la sección `autenticacion` ajusta los sondeos de inicio)
+        self.cargar_configuracion()
+        # Logs en segundo plano (JSON rotativo + anillo en memoria para el panel de registro)
+        self.registro = configurar_registro(self.configuracion.get('registro'))
+        self._ultima_entrada_registro = 0
+        trazador.configurar(self.configuracion.get('trazas'))
+        self.marcar_arranque('configuracion')
+
+        # ✔ PRIMERO: crear autenticación
+        self.auth = AutenticacionCredenciales(root, self.configuracion.get('autenticacion'))
+
+        # ✔ Mostrar dialogo de autenticación antes de continuar
+        if not self.auth.mostrar_dialogo_autenticacion():
+            root.quit()
+            return
+        self.marcar_arranque('autenticacion')
+
+        # Configurar estilos
+        self.colors = setup_styles(self.root)
+
+        # Un único bucle refresca la ventana: los hilos de trabajo solo publican
+        # el último valor y la ventana lo aplica como mucho `frecuencia_hz` veces/s
+        self.bomba = BombaInterfaz(self.root, self.aplicar_cambios_interfaz,
+                                   frecuencia=self.configuracion.get('interfaz', {}).get('frecuencia_hz', 20))
+
+        # Motor de instalación (cola, caché, prefetch); esta clase recibe sus eventos
+        self.motor = MotorInstalacion(self.aplicaciones, self.configuracion, self.auth, eventos=self)
+
+        self.aplicaciones_seleccionadas = set()
+        self.cola_instalacion = []
+        self.instalando = False
+        self.lista_apps = None
+        self.indice_busqueda = None
+        self._indice_en_construccion = None
+        self._filtro_pendiente = None
+        self.search_var = tk.StringVar()
+        self.contador_label = None
+        self.estado_label = None
+        self.texto_progreso_cola = "0/0 aplicaciones"
+        self.texto_progreso_copia = ""
+        self._mostrando_salida_en_vivo = False
+
+        self.crear_interfaz()
+
+        if self.contador_label:
+            self.actualizar_contador()
+        self.marcar_arranque('interfaz')
+        self.root.after_idle(self.mostrar_tiempos_arranque)
+
+        # Refrescos periódicos (fases por app, panel de registro, salida en vivo y ETA)
+        self.bomba.cada(0.1, self.refrescar_estados_apps)
+        self.bomba.cada(0.25, self.refrescar_registro)
+        self.bomba.cada(0.5, self.refrescar_salida_en_vivo)
+        self.bomba.iniciar()
+
+    def marcar_arranque(self, fase):
+        """Anota cuánto llevaba el arranque al terminar `fase`"""
+        self.tiempos_arranque[fase] = time.perf_counter() - self.inicio_arranque
+        trazador.instante(f"arranque_{fase}", 'arranque', segundos=round(self.tiempos_arranque[fase], 3))
+
+    def mostrar_tiempos_arranque(self):
+        """Muestra en el log el tiempo hasta la ventana y en qué se fue"""
+        self.marcar_arranque('ventana')
+        fases, anterior = [], 0.0
+        for fase, momento in self.tiempos_arranque.items():
+            if fase != 'ventana':
+                fases.append(f"{fase} {momento - anterior:.2f}s")
+            anterior = momento
+        self.mostrar_mensaje(f"⏱️ Ventana lista en {self.tiempos_arranque['ventana']:.2f}s "
+                             f"({', '.join(fases)}; {self.auth.sondeos.resumen_tiempos()})")
+
+    
+    # Nota: la configuración de estilos fue externalizada a `styles.py`.
+    
+    def cargar_configuracion(self):
+        """Carga la configuración desde JSON"""
+        self.configuracion = {}
+        try:
+            with open('config.json', 'r', encoding='utf-8') as f:
+                data = json.load(f)
+                # Cargar aplicaciones y secciones de ajustes (cache, ...), ignorar perfiles
+                self.configuracion = data
+                self.aplicaciones = data.get('aplicaciones', {})
+                if not self.aplicaciones:
+                    messagebox.showwarning("Configuración", "No hay aplicaciones configuradas en config.json")
+        except FileNotFoundError:
+            self.aplicaciones = {}
+            messagebox.showwarning("Configuración", "No se encontró config.json")
+        except json.JSONDecodeError:
+            messagebox.showerror("Error", "Error en el formato de config.json")
+            self.aplicaciones = {}
+    
+    def crear_config_por_defecto(self):
+        """Crea un archivo de configuración por defecto"""
+        self.aplicaciones = {}
+        self.guardar_configuracion()
+        messagebox.showinfo("Configuración", "Archivo config.json creado")
+
+    def guardar_configuracion(self):
+        """Guarda aplicaciones en config.json"""
+        try:
+            # Conservar las secciones de ajustes que no gestiona la UI
+            data = dict(self.configuracion)
+            data['aplicaciones'] = self.aplicaciones
+            data['perfiles'] = {}  # Perfiles vacío para mantener estructura
+            with open('config.json', 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=4, ensure_ascii=False)
+            self.mostrar_mensaje("Configuración guardada en config.json")
+        except Exception as e:
+            self.mostrar_mensaje(f"Error guardando config: {e}")
+    
+    def crear_interfaz(self):
+        """Crea la interfaz moderna"""
+        # Frame principal
+        main_frame = ttk.Frame(self.root, style='Modern.TFrame', padding="20")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        # Header (colocado antes del contenedor para que quede arriba)
+        self.crear_header(main_frame)
+
+        # Contenedor centrado para el contenido (mejor presentación en pantallas grandes)
+        container = ttk.Frame(main_frame, style='Modern.TFrame')
+        container.pack(expand=True)
+        container.configure(width=940)
+        
+        # Contenido principal (centrado)
+        content_frame = ttk.Frame(container, style='Modern.TFrame')
+        content_frame.pack(fill=tk.BOTH, expand=True, pady=2)
+
+        # Panel izquierdo - Lista de aplicaciones
+        self.crear_panel_aplicaciones(content_frame)
+
+        # Panel derecho - Controles
+        self.crear_panel_controles(content_frame)
+        
+        # Footer
+        self.crear_footer(main_frame)
+    
+    def crear_header(self, parent):
+        """Crea el encabezado simplificado sin perfiles"""
+        header_frame = ttk.Frame(parent, style='Modern.TFrame')
+        header_frame.pack(fill=tk.X)
+        
+        # Primera fila: Título e ícono CENTRADO
+        title_frame = ttk.Frame(header_frame, style='Modern.TFrame')
+        title_frame.pack(fill=tk.X, pady=(0, 8), expand=True)
+        
+        # Espacio a la izquierda para centrar
+        tk.Label(title_frame, text="", bg=self.colors['bg']).pack(side=tk.LEFT, expand=True)
+        
+        # Ícono
+        icon_label = tk.Label(title_frame, text="⚡", font=('Arial', 28), 
+                             bg=self.colors['bg'], fg=self.colors['primary'])
+        icon_label.pack(side=tk.LEFT, padx=(0, 10))
+        
+        # Texto del título
+        title_label = tk.Label(title_frame, 
+                              text="Instalador MultiApp",
+                              font=('Segoe UI', 22, 'bold'),
+                              bg=self.colors['bg'],
+                              fg=self.colors['dark'])
+        title_label.pack(side=tk.LEFT)
+        
+        # Espacio a la derecha (sin contador aquí)
+        spacer = tk.Label(title_frame, text="", bg=self.colors['bg'])
+        spacer.pack(side=tk.LEFT, expand=True)
+
+        # Segunda fila: Información simple centrada
+        info_frame = tk.Frame(header_frame, bg=self.colors['bg'])
+        info_frame.pack(fill=tk.X, pady=(0, 8), expand=True)
+        
+        # Espacio izquierdo para centrar
+        tk.Label(info_frame, text="", bg=self.colors['bg']).pack(side=tk.LEFT, expand=True)
+        
+        # Información sobre las aplicaciones
+        info_label = tk.Label(info_frame, 
+                             text=f"📦 {len(self.aplicaciones)} aplicaciones disponibles",
+                             font=('Segoe UI', 10),
+                             bg=self.colors['bg'],
+                             fg=self.colors['text_secondary'])
+        info_label.pack(side=tk.LEFT)
+        
+        # Espacio derecho para centrar
+        tk.Label(info_frame, text="", bg=self.colors['bg']).pack(side=tk.LEFT, expand=True)
+    
+    def crear_panel_aplicaciones(self, parent):
+        """Crea el panel de aplicaciones"""
+        # Frame contenedor
+        left_frame = ttk.Frame(parent, style='Modern.TFrame')
+        left_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 12))
+        
+        # Tarjeta de aplicaciones
+        card = tk.Frame(left_frame, bg=self.colors['card_bg'], relief='flat',
+                       highlightbackground=self.colors['border'],
+                       highlightthickness=1)
+        card.pack(fill=tk.BOTH, expand=True)
+        
+        # Header de la tarjeta
+        card_header = tk.Frame(card, bg=self.colors['card_bg'])
+        card_header.pack(fill=tk.X, padx=20, pady=15)
+        
+        tk.Label(card_header, text="📦 Aplicaciones Disponibles",
+                font=('Segoe UI', 12, 'bold'),
+                bg=self.colors['card_bg'],
+                fg=self.colors['text_primary']).pack(side=tk.LEFT)
+        
+        # Buscador (entrada) y controles rápidos
+        right_controls = tk.Frame(card_header, bg=self.colors['card_bg'])
+        right_controls.pack(side=tk.RIGHT)
+
+        search_entry = tk.Entry(right_controls, textvariable=self.search_var,
+                    font=('Segoe UI', 9), width=22,
+                    relief='solid', bd=1, justify='left')
+        search_entry.pack(side=tk.LEFT, padx=(0, 8))
+        search_entry.insert(0, '')
+        search_entry.bind('<KeyRelease>', lambda e: self.programar_filtrado())
+
+        # Controles rápidos
+        controls_frame = tk.Frame(right_controls, bg=self.colors['card_bg'])
+        controls_frame.pack(side=tk.LEFT)
+        
+        ttk.Button(controls_frame, text="✓ Todo", command=self.seleccionar_todo, style='Secondary.TButton').pack(side=tk.LEFT, padx=(5, 0))
+        ttk.Button(controls_frame, text="✗ Ninguno", command=self.deseleccionar_todo, style='Secondary.TButton').pack(side=tk.LEFT, padx=5)
+        
+        # Contador de selecciones
+        counter_frame = tk.Frame(card, bg=self.colors['card_bg'])
+        counter_frame.pack(fill=tk.X, padx=20, pady=(0, 10))
+        self.contador_label = tk.Label(counter_frame, text="0 aplicación(es) seleccionada(s)",
+                                       font=('Segoe UI', 9), bg=self.colors['card_bg'],
+                                       fg=self.colors['text_secondary'])
+        self.contador_label.pack(side=tk.LEFT)
+        
+        # Lista de aplicaciones con scroll
+        self.crear_lista_con_scroll(card)
+    
+    def crear_lista_con_scroll(self, parent):
+        """Crea la lista de aplicaciones con scroll (virtualizada: solo filas visibles)"""
+        # Altura fija para mostrar más apps sin cambiar el tamaño de la ventana
+        self.lista_apps = ListaVirtualAplicaciones(
+            parent, self.colors,
+            esta_seleccionada=lambda app_name: app_name in self.aplicaciones_seleccionadas,
+            al_alternar=self.on_app_seleccionada,
+            alto=520
+        )
+        
+        # Cargar aplicaciones
+        self.cargar_aplicaciones_modernas()
+    
+    def cargar_aplicaciones_modernas(self):
+        """Carga las aplicaciones en formato moderno"""
+        filtro = ''
+        try:
+            filtro = (self.search_var.get() or '').strip().lower()
+        except Exception:
+            filtro = ''
+
+        # El índice se reconstruye solo cuando cambia el catálogo; mientras tanto se filtra en lineal
+        indice = self.indice_busqueda
+        if indice is None or indice.aplicaciones is not self.aplicaciones:
+            indice = None
+            self.construir_indice_busqueda()
+
+        # Las filas se reciclan: solo se reasignan las visibles
+        self.lista_apps.establecer_elementos(
+            filter_aplicaciones(self.aplicaciones, filtro, indice=indice))
+
+        # Actualizar contador si existe (por si el filtrado afectó selección visible)
+        if self.contador_label:
+            self.actualizar_contador()
+
+    def construir_indice_busqueda(self):
+        """Construye el índice de búsqueda en segundo plano (con 10.000 apps tarda ~1 s).
+
+        El hilo solo publica el índice; la bomba lo instala en el hilo de Tk.
+        """
+        aplicaciones = self.aplicaciones
+        if self._indice_en_construccion is aplicaciones:
+            return
+
+        def construir():
+            try:
+                self.bomba.estado.publicar('indice_busqueda', IndiceBusqueda(aplicaciones))
+            except Exception:
+                logger.exception("No se pudo construir el índice de búsqueda")
+
+        self._indice_en_construccion = aplicaciones
+        threading.Thread(target=construir, name='indice-busqueda', daemon=True).start()
+
+    def programar_filtrado(self, espera_ms=150):
+        """Agrupa las pulsaciones del buscador: filtra cuando el usuario deja de escribir"""
+        if self._filtro_pendiente is not None:
+            self.root.after_cancel(self._filtro_pendiente)
+        self._filtro_pendiente = self.root.after(espera_ms, self.filtrar_aplicaciones)
+
+    def filtrar_aplicaciones(self):
+        """Refresca la lista según el contenido del buscador"""
+        self._filtro_pendiente = None
+        self.cargar_aplicaciones_modernas()
+    
+    def crear_panel_controles(self, parent):
+        """Crea el panel de controles derecho"""
+        right_frame = tk.Frame(parent, bg=self.colors['bg'], width=300)
+        right_frame.pack(side=tk.RIGHT, fill=tk.Y, padx=(12, 0))
+        right_frame.pack_propagate(False)
+        
+        # Tarjeta de acciones
+        action_card = tk.Frame(right_frame, bg=self.colors['card_bg'],
+                              relief='flat',
+                              highlightbackground=self.colors['border'],
+                              highlightthickness=1)
+        action_card.pack(fill=tk.X, pady=(0, 10))
+        
+        tk.Label(action_card, text="🚀 Acciones Rápidas",
+                font=('Segoe UI', 12, 'bold'),
+                bg=self.colors['card_bg'],
+                fg=self.colors['text_primary'],
+                anchor='w').pack(fill=tk.X, padx=20, pady=15)
+        
+        # Botones de acción
+        btn_instalar = ttk.Button(action_card, text="▶ Iniciar Instalación",
+                command=self.iniciar_instalacion,
+                style='Primary.TButton')
+        btn_instalar.pack(fill=tk.X, padx=20, pady=8)
+
+        btn_cola = ttk.Button(action_card, text="📋 Ver Cola de Instalación",
+                command=self.mostrar_cola_moderna,
+                style='Secondary.TButton')
+        btn_cola.pack(fill=tk.X, padx=20, pady=6)
+
+        btn_actualizar = ttk.Button(action_card, text="🔄 Actualizar Lista",
+                  command=self.actualizar_lista,
+                  style='Secondary.TButton')
+        btn_actualizar.pack(fill=tk.X, padx=20, pady=6)
+
+        btn_estrategias = ttk.Button(action_card, text="🧠 Estrategias Aprendidas",
+                  command=self.mostrar_estrategias,
+                  style='Secondary.TButton')
+        btn_estrategias.pack(fill=tk.X, padx=20, pady=6)
+        
+        # Información
+        info_card = tk.Frame(right_frame, bg=self.colors['card_bg'],
+                            relief='flat',
+                            highlightbackground=self.colors['border'],
+                            highlightthickness=1)
+        info_card.pack(fill=tk.BOTH, expand=True)
+        
+        tk.Label(info_card, text="ℹ️ Información",
+                font=('Segoe UI', 12, 'bold'),
+                bg=self.colors['card_bg'],
+                fg=self.colors['text_primary'],
+                anchor='w').pack(fill=tk.X, padx=20, pady=15)
+        
+        self.info_text = tk.Text(info_card, height=10, wrap=tk.WORD,
+                           bg=self.colors['card_bg'],
+                           fg=self.colors['text_secondary'],
+                           relief='flat',
+                           font=('Segoe UI', 9),
+                           padx=15,
+                           pady=10)
+        self.info_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+        
+        self.texto_info_inicial = "Selecciona las aplicaciones que deseas instalar y haz clic en 'Iniciar Instalación'.\n\nLas aplicaciones se instalarán en el orden seleccionado."
+        self.mostrar_texto_info(self.texto_info_inicial)
+
+    def mostrar_texto_info(self, texto):
+        """Reemplaza el contenido del panel de información"""
+        self.info_text.config(state='normal')
+        self.info_text.delete('1.0', tk.END)
+        self.info_text.insert('1.0', texto)
+        self.info_text.config(state='disabled')
+        self.info_text.see(tk.END)
+
+    def refrescar_salida_en_vivo(self):
+        """Muestra en el panel de información las últimas líneas de los instaladores en curso"""
+        if not self.instalando:
+            if self._mostrando_salida_en_vivo:
+                self._mostrando_salida_en_vivo = False
+                self.mostrar_texto_info(self.texto_info_inicial)
+            return
+        self._mostrando_salida_en_vivo = True
+        salidas = self.motor.salidas.cola_activa(cantidad=12)
+        if salidas:
+            bloques = [f"▶ {app_name}\n" + "\n".join(lineas or ["(sin salida todavía)"])
+                       for app_name, lineas in salidas.items()]
+            texto = "\n\n".join(bloques)
+            if texto != self.info_text.get('1.0', 'end-1c'):
+                self.mostrar_texto_info(texto)
+        # El avance ponderado y la ETA cambian con el tiempo aunque no haya eventos
+        self._refrescar_texto_progreso()
+
+    def refrescar_estados_apps(self):
+        """Fase de cada app de la cola en las filas visibles de la lista"""
+        progreso = self.motor.progreso
+        if progreso is not None and self.lista_apps is not None and (self.instalando or self._mostrando_salida_en_vivo):
+            self.lista_apps.actualizar_estados(progreso.estados_apps())
+
+    def aplicar_cambios_interfaz(self, cambios):
+        """Aplica en Tk los últimos valores publicados por el motor (lo llama la bomba)"""
+        indice = cambios.get('indice_busqueda')
+        if indice is not None and indice.aplicaciones is self.aplicaciones:
+            # Da los mismos resultados que el filtro lineal: no hace falta repintar la lista
+            self.indice_busqueda = indice
+        if 'estado' in cambios:
+            self.estado_label.config(text=cambios['estado'])
+        if 'progreso_cola' in cambios or 'progreso_copia' in cambios:
+            self.texto_progreso_cola = cambios.get('progreso_cola', self.texto_progreso_cola)
+            self.texto_progreso_copia = cambios.get('progreso_copia', self.texto_progreso_copia)
+            self._refrescar_texto_progreso()
+    
+    def crear_footer(self, parent):
+        footer_frame = tk.Frame(parent, bg=self.colors['bg'])
+        footer_frame.pack(fill=tk.X, pady=(20, 0))
+
+        self.progress_bar = ttk.Progressbar(
+            footer_frame,
+            style='Modern.Horizontal.TProgressbar',
+            mode='determinate'
+        )
+        self.progress_bar.pack(fill=tk.X, pady=(0, 8))
+        self.progress_text = tk.Label(
+            footer_frame,
+            text="0/0 aplicaciones",
+            font=('Segoe UI', 9),
+            bg=self.colors['bg'],
+            fg=self.colors['text_secondary']
+        )
+        self.progress_text.pack()
+        self.estado_label = tk.Label(
+            footer_frame,
+            text="Esperando…",
+            font=('Segoe UI', 9),
+            bg=self.colors['bg'],
+            fg=self.colors['text_secondary']
+        )
+        self.estado_label.pack()
+
+        # Panel de registro: últimos mensajes del log (lo rellena refrescar_registro)
+        self.registro_text = tk.Text(
+            footer_frame, height=6, wrap=tk.WORD,
+            bg=self.colors['card_bg'],
+            fg=self.colors['text_secondary'],
+            relief='flat',
+            font=('Consolas', 8),
+            padx=10,
+            pady=6,
+            state='disabled'
+        )
+        self.registro_text.pack(fill=tk.X, pady=(8, 0))
+
+    def refrescar_registro(self):
+        """Añade al panel de registro lo que el log recibió desde la última vez"""
+        entradas = self.registro.anillo.desde(self._ultima_entrada_registro)
+        if entradas:
+            self._ultima_entrada_registro = entradas[-1]['secuencia']
+            texto = "\n".join(f"{time.strftime('%H:%M:%S', time.localtime(e['ts']))} {e['mensaje']}"
+                              for e in entradas[-LINEAS_PANEL_REGISTRO:])
+            self.registro_text.config(state='normal')
+            if self.registro_text.compare('end-1c', '!=', '1.0'):
+                texto = "\n" + texto
+            self.registro_text.insert(tk.END, texto)
+            # Acotado: se borran las líneas más antiguas
+            sobrantes = int(self.registro_text.index('end-1c').split('.')[0]) - LINEAS_PANEL_REGISTRO
+            if sobrantes > 0:
+                self.registro_text.delete('1.0', f"{sobrantes + 1}.0")
+            self.registro_text.config(state='disabled')
+            self.registro_text.see(tk.END)
+    
+    def on_app_seleccionada(self, app_name, seleccionada):
+        """Maneja la selección/deselección de aplicaciones"""
+        if seleccionada:
+            self.aplicaciones_seleccionadas.add(app_name)
+        else:
+            self.aplicaciones_seleccionadas.discard(app_name)
+        self.lista_apps.refrescar_estados()
+        
+        self.actualizar_contador()
+
+        # Si el usuario seleccionó esta app desde el listado filtrado,
+        # limpiar el buscador de aplicaciones para facilitar nuevas búsquedas
+        if seleccionada and (self.search_var.get() or '').strip():
+            self.search_var.set('')
+            self.cargar_aplicaciones_modernas()
+    
+    def actualizar_contador(self):
+        """Actualiza el contador de seleccionados"""
+        if not self.contador_label:
+            return
+        count = len(self.aplicaciones_seleccionadas)
+        self.contador_label.config(text=f"{count} aplicación(es) seleccionada(s)")
+    
+    def seleccionar_todo(self):
+        """Selecciona todas las aplicaciones"""
+        self.aplicaciones_seleccionadas = set(self.aplicaciones.keys())
+        # Solo se repintan las filas visibles
+        self.lista_apps.refrescar_estados()
+        self.actualizar_contador()
+    
+    def deseleccionar_todo(self):
+        """Deselecciona todas las aplicaciones"""
+        self.aplicaciones_seleccionadas.clear()
+        self.lista_apps.refrescar_estados()
+        self.actualizar_contador()
+    
+    def actualizar_lista(self):
+        """Actualiza la lista de aplicaciones"""
+        self.cargar_configuracion()
+        self.motor.aplicaciones = self.aplicaciones
+        self.motor.configuracion = self.configuracion
+        self.aplicaciones_seleccionadas.clear()
+        self.cargar_aplicaciones_modernas()
+        self.actualizar_contador()
+        messagebox.showinfo("Éxito", "Lista de aplicaciones actualizada")
+    
+    def iniciar_instalacion(self):
+        """Inicia el proceso de instalación"""
+        if not self.aplicaciones_seleccionadas:
+            messagebox.showwarning("Advertencia", "Selecciona al menos una aplicación")
+            return
+        
+        if self.instalando:
+            messagebox.showwarning("Advertencia", "Ya hay una instalación en progreso")
+            return
+        
+        confirmacion = messagebox.askyesno(
+            "Confirmar Instalación Silenciosa", 
+            f"¿Instalar {len(self.aplicaciones_seleccionadas)} aplicación(es) en modo silencioso?\n\n"
+            f"Las aplicaciones se instalarán automáticamente sin interacción del usuario."
+        )
+        
+        if confirmacion:
+            # Orden del catálogo; el planificador aplica dependencias y prioridades
+            self.cola_instalacion = [app for app in self.aplicaciones if app in self.aplicaciones_seleccionadas]
+            self.instalando = True
+            # La barra avanza en % ponderado por la duración prevista de cada app
+            self.progress_bar['maximum'] = 100
+            self.progress_bar['value'] = 0
+            
+            # Iniciar instalación silenciosa en hilo separado
+            thread = threading.Thread(target=self.ejecutar_cola_instalacion_silenciosa)
+            thread.daemon = True
+            thread.start()
+            # La vista "tail" de la salida y las fases por app las refresca la bomba mientras dure la cola
+    
+    def ejecutar_cola_instalacion(self):
+        """Este método se mantiene por compatibilidad, llama al método silencioso"""
+        self.ejecutar_cola_instalacion_silenciosa()
+
+    def tiene_permisos_escritura(self):
+        """Verifica si tenemos permisos de escritura"""
+        try:
+            temp_file = os.path.join(os.environ['TEMP'], 'test_permisos.tmp')
+            with open(temp_file, 'w') as f:
+                f.write('test')
+            os.remove(temp_file)
+            return True
+        except:
+            return False
+
+    def mostrar_error_detallado(self, titulo, mensaje):
+        """Muestra errores detallados"""
+        logger.error(f"{titulo} - {mensaje}")
+        self.root.after(0, lambda: messagebox.showerror(titulo, mensaje))
+    
+    # Eventos del motor (hilo de trabajo): solo publican; la bomba los pinta
+    def actualizar_estado(self, mensaje):
+        self.bomba.estado.publicar('estado', mensaje)
+    
+    def actualizar_progreso(self, valor):
+        total = len(self.cola_instalacion)
+        self.bomba.estado.publicar('progreso_cola', f"{valor}/{total} aplicaciones")
+
+    def actualizar_progreso_copia(self, nombre_archivo, copiados, total, velocidad, eta):
+        """Muestra en el footer el avance, la velocidad y la ETA de la copia en curso"""
+        if copiados >= total:
+            texto = ""
+        else:
+            porcentaje = (copiados * 100 // total) if total else 100
+            texto = (
+                f"📥 {nombre_archivo} {porcentaje}% · {formatear_bytes(velocidad)}/s · "
+                f"ETA {formatear_duracion(eta)}"
+            )
+        self.bomba.estado.publicar('progreso_copia', texto)
+
+    def _refrescar_texto_progreso(self):
+        texto = self.texto_progreso_cola
+        progreso = self.motor.progreso
+        if progreso is not None:
+            avance = progreso.instantanea()
+            self.progress_bar.config(value=avance['fraccion'] * 100)
+            if avance['fraccion'] < 1:
+                texto = f"{texto} · {avance['fraccion']:.0%} · ETA {formatear_duracion(avance['eta'])}"
+        if self.texto_progreso_copia:
+            texto = f"{texto}   {self.texto_progreso_copia}"
+        self.progress_text.config(text=texto)
+    
+    def mostrar_mensaje(self, mensaje):
+        # Solo se encola: el hilo del registro lo escribe y el panel lo recoge
+        logger.info(mensaje)
+    
+    def mostrar_error(self, mensaje):
+        self.root.after(0, lambda: messagebox.showerror("Error", mensaje))
+    
+    def mostrar_cola_moderna(self):
+        """Muestra la cola de instalación moderna"""
+        if not self.aplicaciones_seleccionadas:
+            messagebox.showinfo("Cola Vacía", "No hay aplicaciones seleccionadas para instalar")
+            return
+        
+        cola = [app for app in self.aplicaciones if app in self.aplicaciones_seleccionadas]
+        try:
+            cola = self.motor.crear_planificador(cola).orden_previsto()
+        except ValueError as e:
+            messagebox.showerror("Error en dependencias", str(e))
+            return
+
+        mensaje = "🎯 Aplicaciones en cola de instalación:\n\n"
+        for i, app_name in enumerate(cola, 1):
+            mensaje += f"{i}. {app_name}\n"
+            mensaje += f"   📍 {self.aplicaciones[app_name]}\n\n"
+        
+        messagebox.showinfo("Cola de Instalación", mensaje)
+    
+    def mostrar_estrategias(self):
+        """Muestra la estrategia aprendida por app y permite olvidarlas"""
+        entradas = self.motor.estrategias.entradas()
+        if not entradas:
+            messagebox.showinfo("Estrategias Aprendidas", "Todavía no hay estrategias aprendidas")
+            return
+
+        mensaje = "🧠 Estrategia que funcionó por aplicación:\n\n"
+        for entrada in entradas:
+            mensaje += f"• {entrada['app']}: {entrada['estrategia'] or 'sin definir'}\n"
+            mensaje += f"   🔑 {(entrada['hash'] or '')[:12]}  ✅ {sum(entrada['exitos'].values())}  ❌ {sum(entrada['fallos'].values())}\n"
+        mensaje += "\n¿Deseas olvidarlas y volver al orden por defecto?"
+
+        if messagebox.askyesno("Estrategias Aprendidas", mensaje):
+            borradas = self.motor.estrategias.reiniciar()
+            messagebox.showinfo("Estrategias Aprendidas", f"Se olvidaron {borradas} estrategia(s)")
+
+    def es_administrador():
+        """Verifica si el programa se ejecuta como administrador"""
+        try:
+            return ctypes.windll.shell32.IsUserAnAdmin()
+        except:
+            return False
+
+    def ejecutar_como_administrador():
+        """Reinicia el programa con permisos de administrador"""
+        ctypes.windll.shell32.ShellExecuteW(
+            None, "runas", sys.executable, " ".join(sys.argv), None, 1
+        )
+        sys.exit()
+    
+    def ejecutar_cola_instalacion_silenciosa(self):
+        """Ejecuta la cola en el motor de instalación (hilo de trabajo)"""
+        try:
+            self.motor.ejecutar_cola_instalacion_silenciosa(self.cola_instalacion)
+        except Exception as e:
+            self.mostrar_error_detallado("Error en la instalación", str(e))
+        finally:
+            self.instalando = False
+
+    def mostrar_resumen_instalacion(self, exitosos, fallidos, total, tiempos=None):
+        """Muestra el resumen final de la instalación"""
+        resumen = f"Proceso completado:\n✅ {exitosos} exitosas\n❌ {fallidos} fallidas\n📊 Total: {total}"
+        if tiempos:
+            resumen += f"\n\n⏱️ Tiempo real vs previsto:\n{formatear_tiempos(tiempos)}"
+        self.mostrar_mensaje(resumen)
+        # Limpiar estado de la instalación
+        self.instalando = False
+        self.actualizar_estado("Listo para instalar")
+        self.root.after(0, lambda: messagebox.showinfo("Resumen de Instalación", resumen))
+    
+    def pedir_credenciales_red(self, servidor, unidad, recurso):
+        """Este método ya no se usa - las credenciales se obtienen en la autenticación inicial"""
+        pass
+
+def main():
+    inicio = time.perf_counter()
+    root = tk.Tk()
+    app = InstaladorModerno(root, inicio=inicio)
+    root.mainloop()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,302 @@
+import os
+import sys
+import re
+import json
+import time
+import fnmatch
+import logging
+import argparse
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+# Sin tkinter ni auth_credentials: este módulo debe arrancar rápido y funcionar
+# en tareas programadas sin escritorio.
+
+# Códigos de salida del proceso
+SALIDA_OK = 0
+SALIDA_FALLOS = 1          # Alguna app falló o fue omitida
+SALIDA_USO = 2             # Argumentos, patrones o configuración inválidos
+SALIDA_REINICIO = 3        # Todo instalado, pero hay que reiniciar el equipo
+
+logger = logging.getLogger(__name__)
+
+
+class CredencialesEntorno:
+    """Credenciales para el modo sin interfaz (variables de entorno).
+
+    Las de dominio solo sirven para mapear el recurso si falla el acceso
+    directo; sin INSTALADOR_DOMINIO_USUARIO quedan en None.
+    """
+
+    def __init__(self):
+        self.credenciales_admin = {
+            'usuario': os.environ.get('INSTALADOR_ADMIN_USUARIO', ''),
+            'password': os.environ.get('INSTALADOR_ADMIN_PASSWORD', ''),
+        }
+        usuario_dominio = os.environ.get('INSTALADOR_DOMINIO_USUARIO', '')
+        self.credenciales_dominio = {
+            'usuario': usuario_dominio,
+            'password': os.environ.get('INSTALADOR_DOMINIO_PASSWORD', ''),
+        } if usuario_dominio else None
+
+
+def cargar_configuracion(ruta):
+    with open(ruta, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _valores_raiz(texto):
+    """Devuelve {clave: (inicio, fin)} de cada valor del objeto raíz de un JSON"""
+    decodificador, espacios = json.JSONDecoder(), re.compile(r'\s*')
+    posiciones = {}
+    i = espacios.match(texto, texto.index('{') + 1).end()
+    while texto[i] != '}':
+        clave, i = decodificador.raw_decode(texto, i)
+        i = espacios.match(texto, i).end() + 1  # ':'
+        inicio = espacios.match(texto, i).end()
+        _, fin = decodificador.raw_decode(texto, inicio)
+        posiciones[clave] = (inicio, fin)
+        i = espacios.match(texto, fin).end()
+        if texto[i] == ',':
+            i = espacios.match(texto, i + 1).end()
+    return posiciones
+
+
+def guardar_aplicaciones(ruta, aplicaciones):
+    """Reescribe solo el valor de `aplicaciones` en config.json.
+
+    El resto del archivo (orden de las claves, formato y saltos de línea) se
+    conserva tal cual lo dejó quien lo editó.
+    """
+    with open(ruta, 'r', encoding='utf-8', newline='') as f:
+        texto = f.read()
+    salto = '\r\n' if '\r\n' in texto else '\n'
+    valor = json.dumps(aplicaciones, indent=4, ensure_ascii=False).replace('\n', salto + '    ')
+    posiciones = _valores_raiz(texto)
+    if 'aplicaciones' in posiciones:
+        inicio, fin = posiciones['aplicaciones']
+        texto = texto[:inicio] + valor + texto[fin:]
+    else:
+        apertura = texto.index('{') + 1
+        separador = ',' if posiciones else ''
+        texto = f'{texto[:apertura]}{salto}    "aplicaciones": {valor}{separador}{texto[apertura:]}'
+    with open(ruta, 'w', encoding='utf-8', newline='') as f:
+        f.write(texto)
+
+
+def resolver_patrones(aplicaciones, patrones):
+    """Devuelve (apps en orden del catálogo, patrones sin coincidencias).
+
+    Cada patrón es un nombre exacto o un glob (`Adobe*`), sin distinguir mayúsculas.
+    """
+    seleccion, sin_coincidencias = set(), []
+    for patron in patrones:
+        coincidencias = [app for app in aplicaciones if fnmatch.fnmatchcase(app.lower(), patron.lower())]
+        if not coincidencias:
+            sin_coincidencias.append(patron)
+        seleccion.update(coincidencias)
+    return [app for app in aplicaciones if app in seleccion], sin_coincidencias
+
+
+def escribir_reporte(reporte, args):
+    texto = json.dumps(reporte, indent=2, ensure_ascii=False, default=str)
+    if args.reporte:
+        with open(args.reporte, 'w', encoding='utf-8') as f:
+            f.write(texto)
+    if args.json:
+        print(texto)
+
+
+def _configurar_registro(configuracion):
+    # Solo en los comandos que trabajan: `list` y `report` arrancan sin hilos ni archivos de log
+    from registro import configurar_registro
+    configurar_registro(configuracion.get('registro'), consola=True)
+
+
+def _crear_motor(configuracion):
+    # Importación diferida: `list` y `report` no necesitan el motor completo
+    from motor_instalacion import MotorInstalacion
+    _configurar_registro(configuracion)
+    # Los mensajes del motor van al log; `main` lo muestra por stderr (stdout queda para el JSON)
+    return MotorInstalacion(configuracion.get('aplicaciones', {}), configuracion, CredencialesEntorno())
+
+
+def _seleccionar(configuracion, patrones):
+    aplicaciones = configuracion.get('aplicaciones', {})
+    cola, sin_coincidencias = resolver_patrones(aplicaciones, patrones)
+    for patron in sin_coincidencias:
+        print(f"⚠️ Ninguna aplicación coincide con '{patron}'", file=sys.stderr)
+    return cola
+
+
+def comando_listar(args, configuracion):
+    aplicaciones = configuracion.get('aplicaciones', {})
+    cola = _seleccionar(configuracion, args.patrones) if args.patrones else list(aplicaciones)
+    if args.json or args.reporte:
+        escribir_reporte([{'app': app, 'ruta': aplicaciones[app]} for app in cola], args)
+    else:
+        for app in cola:
+            print(f"{app}\t{aplicaciones[app]}")
+    return SALIDA_OK if cola else SALIDA_USO
+
+
+def comando_instalar(args, configuracion):
+    cola = _seleccionar(configuracion, args.patrones)
+    if not cola:
+        return SALIDA_USO
+    if args.maximo_concurrente:
+        configuracion.setdefault('planificacion', {})['maximo_concurrente'] = args.maximo_concurrente
+
+    motor = _crear_motor(configuracion)
+    inicio = time.time()
+    try:
+        estados = motor.ejecutar_cola_instalacion_silenciosa(cola)
+    except ValueError as e:
+        # Dependencias circulares o recursos desconocidos en config.json
+        print(f"❌ {e}", file=sys.stderr)
+        return SALIDA_USO
+
+    tiempos = {t['app']: t for t in motor.progreso.tiempos()} if motor.progreso else {}
+    reporte = {
+        'comando': 'install',
+        'inicio': datetime.fromtimestamp(inicio).isoformat(timespec='seconds'),
+        'duracion': round(time.time() - inicio, 3),
+        'exitosos': sum(1 for estado in estados.values() if estado == 'exitoso'),
+        'fallidos': sum(1 for estado in estados.values() if estado != 'exitoso'),
+        'reinicio_requerido': list(motor.reinicio_requerido),
+        'traza': motor.ultima_traza,
+        'apps': [{'app': app, 'estado': estados.get(app),
+                  'duracion': tiempos.get(app, {}).get('real'),
+                  'prevista': tiempos.get(app, {}).get('previsto')} for app in cola],
+    }
+    escribir_reporte(reporte, args)
+    if reporte['fallidos']:
+        return SALIDA_FALLOS
+    return SALIDA_REINICIO if motor.reinicio_requerido else SALIDA_OK
+
+
+def comando_prefetch(args, configuracion):
+    cola = _seleccionar(configuracion, args.patrones)
+    if not cola:
+        return SALIDA_USO
+    motor = _crear_motor(configuracion)
+    copiadores = configuracion.get('prefetch', {}).get('copiadores', 2)
+
+    def preparar(app):
+        inicio = time.monotonic()
+        try:
+            ruta_red = motor.aplicaciones[app]
+            ruta_local = motor.preparar_instalador_local(ruta_red)
+            # Si no encuentra o no puede copiar el archivo, el motor lo registra y devuelve la ruta de red
+            if (ruta_local == ruta_red and motor.es_ruta_red(ruta_red)) or not os.path.exists(ruta_local):
+                raise FileNotFoundError(f"no se pudo traer {ruta_red} al disco local")
+            motor.cache.liberar(ruta_local)
+            en_cache = motor.cache.hash_de(ruta_local) is not None
+            estado = 'en_cache' if en_cache else 'local'
+        except Exception as e:
+            ruta_local, estado = None, f"error: {e}"
+        return {'app': app, 'estado': estado, 'ruta_local': ruta_local,
+                'duracion': round(time.monotonic() - inicio, 3)}
+
+    with ThreadPoolExecutor(max_workers=max(1, copiadores)) as pool:
+        resultados = list(pool.map(preparar, cola))
+    escribir_reporte({'comando': 'prefetch', 'apps': resultados,
+                      'cache': motor.cache.resumen_estadisticas()}, args)
+    return SALIDA_FALLOS if any(r['estado'].startswith('error') for r in resultados) else SALIDA_OK
+
+
+def comando_reporte(args, configuracion):
+    from historial import HistorialInstalaciones
+    historial = HistorialInstalaciones.desde_configuracion(configuracion.get('historial'))
+    desde = datetime.strptime(args.desde, '%Y-%m-%d').timestamp() if args.desde else None
+    hasta = datetime.strptime(args.hasta, '%Y-%m-%d').timestamp() if args.hasta else None
+    if args.lentas:
+        datos = historial.mas_lentas(desde, hasta, limite=args.limite)
+    else:
+        datos = historial.intentos(args.app, desde, hasta, limite=args.limite)
+    historial.cerrar()
+    if args.json or args.reporte:
+        escribir_reporte(datos, args)
+    else:
+        for fila in datos:
+            print('\t'.join(f"{clave}={valor}" for clave, valor in fila.items() if valor is not None))
+    return SALIDA_OK
+
+
+def comando_indexar(args, configuracion):
+    from indice_recurso import IndiceRecurso
+    _configurar_registro(configuracion)
+    indice = IndiceRecurso.desde_configuracion(configuracion.get('indice_recurso'))
+    if not indice.raices:
+        print("❌ No hay raíces en la sección `indice_recurso` de config.json", file=sys.stderr)
+        return SALIDA_USO
+    estadisticas = indice.escanear(completo=args.completo)
+    logger.info(f"🗂️ {estadisticas['archivos']} instaladores, {estadisticas['directorios_listados']} carpetas "
+                f"releídas, {estadisticas['directorios_sin_cambios']} sin cambios ({estadisticas['duracion']:.2f}s)")
+
+    aplicaciones = configuracion.get('aplicaciones', {})
+    combinadas = indice.generar_aplicaciones(aplicaciones)
+    if args.guardar:
+        configuracion['aplicaciones'] = combinadas
+        guardar_aplicaciones(args.config, combinadas)
+        logger.info(f"{len(combinadas) - len(aplicaciones)} aplicaciones nuevas guardadas en {args.config}")
+    reporte = {'comando': 'index', 'estadisticas': estadisticas,
+               'nuevas': {app: ruta for app, ruta in combinadas.items() if app not in aplicaciones}}
+    if args.archivos:
+        reporte['archivos'] = indice.archivos()
+    escribir_reporte(reporte, args)
+    return SALIDA_OK
+
+
+def crear_parser():
+    parser = argparse.ArgumentParser(
+        prog='python -m instalador_app',
+        description='Instalador MultiApp sin interfaz gráfica. Sin subcomando se abre la interfaz.')
+    parser.add_argument('--config', default='config.json', help='ruta de config.json')
+    parser.add_argument('--trazas', action='store_true',
+                        help='guarda una traza de Chrome por cola (chrome://tracing, ui.perfetto.dev)')
+    comun = argparse.ArgumentParser(add_help=False)
+    comun.add_argument('--json', action='store_true', help='escribe el reporte JSON por stdout')
+    comun.add_argument('--reporte', metavar='ARCHIVO', help='guarda el reporte JSON en un archivo')
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+
+    listar = subparsers.add_parser('list', parents=[comun], help='lista las aplicaciones del catálogo')
+    listar.add_argument('patrones', nargs='*', help='nombres o globs (p.ej. "Adobe*")')
+    listar.set_defaults(funcion=comando_listar)
+
+    instalar = subparsers.add_parser('install', parents=[comun], help='instala en modo silencioso')
+    instalar.add_argument('patrones', nargs='+', help='nombres o globs (p.ej. "Adobe*")')
+    instalar.add_argument('--maximo-concurrente', type=int, help='instalaciones simultáneas')
+    instalar.set_defaults(funcion=comando_instalar)
+
+    prefetch = subparsers.add_parser('prefetch', parents=[comun], help='solo copia los instaladores a la caché')
+    prefetch.add_argument('patrones', nargs='+', help='nombres o globs')
+    prefetch.set_defaults(funcion=comando_prefetch)
+
+    reporte = subparsers.add_parser('report', parents=[comun], help='consulta el historial de instalaciones')
+    reporte.add_argument('--app', help='solo esta aplicación')
+    reporte.add_argument('--desde', help='fecha inicial (AAAA-MM-DD)')
+    reporte.add_argument('--hasta', help='fecha final, excluida (AAAA-MM-DD)')
+    reporte.add_argument('--limite', type=int, default=50)
+    reporte.add_argument('--lentas', action='store_true', help='apps que más tiempo sumaron en el rango')
+    reporte.set_defaults(funcion=comando_reporte)
+
+    indexar = subparsers.add_parser('index', parents=[comun],
+                                    help='indexa los recursos compartidos y propone entradas de `aplicaciones`')
+    indexar.add_argument('--completo', action='store_true', help='relee todas las carpetas, no solo las que cambiaron')
+    indexar.add_argument('--guardar', action='store_true', help='añade las aplicaciones nuevas a config.json')
+    indexar.add_argument('--archivos', action='store_true', help='incluye en el reporte todos los archivos indexados')
+    indexar.set_defaults(funcion=comando_indexar)
+    return parser
+
+
+def main(argv=None):
+    args = crear_parser().parse_args(argv)
+    try:
+        configuracion = cargar_configuracion(args.config)
+    except (OSError, ValueError) as e:
+        print(f"❌ No se pudo leer {args.config}: {e}", file=sys.stderr)
+        return SALIDA_USO
+    if args.trazas:
+        configuracion.setdefault('trazas', {})['activo'] = True
+    return args.funcion(args, configuracion)
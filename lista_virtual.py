@@ -0,0 +1,226 @@
+import tkinter as tk
+from tkinter import ttk
+
+
+# Texto de la columna de estado según la fase de la app en la cola en curso
+TEXTOS_ESTADO = {
+    'pendiente': "⏸ En cola",
+    'preparando': "📥 Preparando",
+    'instalando': "⚙️ Instalando",
+    'exitoso': "✅ Instalada",
+    'fallido': "❌ Falló",
+    'omitido': "⏭️ Omitida",
+}
+
+
+def texto_estado(estado):
+    """Texto para `(fase, avance de la copia)` de ProgresoPonderado.estados_apps (None: sin estado)"""
+    if not estado:
+        return ""
+    fase, copia = estado
+    if fase in ('pendiente', 'preparando') and copia is not None and copia < 1:
+        return f"📥 Copiando {copia:.0%}"
+    return TEXTOS_ESTADO.get(fase, fase)
+
+
+class FilaAplicacion:
+    """Widgets de una fila reutilizable: checkbox (canvas), nombre, ruta y estado"""
+
+    def __init__(self, lista, colors):
+        self.lista = lista
+        self.colors = colors
+        self.app_name = None
+        self.seleccionado = None
+        self.estado = None
+
+        self.frame = tk.Frame(lista.canvas, bg=colors['card_bg'], relief='flat',
+                              highlightbackground=colors['border'], highlightthickness=1)
+
+        chk_frame = tk.Frame(self.frame, bg=colors['card_bg'], width=28, height=28)
+        chk_frame.pack(side=tk.LEFT, padx=15, pady=8)
+        chk_frame.pack_propagate(False)
+        self.chk_canvas = tk.Canvas(chk_frame, bg=colors['card_bg'],
+                                    highlightthickness=0, width=24, height=24)
+        self.chk_canvas.pack()
+        # Se crean una sola vez; el estado se cambia con itemconfig
+        self.chk_canvas.create_rectangle(2, 2, 18, 18, outline=colors['border'],
+                                         width=1, fill='white', tags='caja')
+        self.chk_canvas.create_text(10, 10, text="✓", fill='white',
+                                    font=('Arial', 10, 'bold'), state='hidden', tags='marca')
+
+        self.estado_label = tk.Label(self.frame, font=('Segoe UI', 9), width=16,
+                                     bg=colors['card_bg'], fg=colors['text_secondary'], anchor='e')
+        self.estado_label.pack(side=tk.RIGHT, padx=(0, 15))
+
+        info_frame = tk.Frame(self.frame, bg=colors['card_bg'])
+        info_frame.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 15), pady=8)
+        self.name_label = tk.Label(info_frame, font=('Segoe UI', 12, 'bold'),
+                                   bg=colors['card_bg'], fg=colors['text_primary'], anchor='w')
+        self.name_label.pack(fill=tk.X)
+        self.path_label = tk.Label(info_frame, font=('Segoe UI', 9),
+                                   bg=colors['card_bg'], fg=colors['text_secondary'], anchor='w')
+        self.path_label.pack(fill=tk.X)
+
+        self.chk_canvas.bind("<Button-1>", lambda e: self.lista.alternar(self.app_name))
+        for widget in (self.frame, self.chk_canvas, info_frame, self.name_label, self.path_label,
+                       self.estado_label):
+            widget.bind("<MouseWheel>", lista.on_mouse_wheel)
+            widget.bind("<Button-4>", lista.on_mouse_wheel)
+            widget.bind("<Button-5>", lista.on_mouse_wheel)
+
+        self.item = lista.canvas.create_window(0, -lista.alto_fila, window=self.frame,
+                                               anchor='nw', state='hidden')
+
+    def vincular(self, app_name, ruta, seleccionado, estado=None):
+        """Asocia la fila a otra aplicación; solo toca los widgets si algo cambió"""
+        if app_name != self.app_name:
+            self.app_name = app_name
+            self.name_label.config(text=app_name)
+            ruta = ruta or ''
+            self.path_label.config(text=ruta if len(ruta) < 80 else ruta[:77] + "...")
+        self.marcar(seleccionado)
+        self.mostrar_estado(estado)
+
+    def mostrar_estado(self, estado):
+        texto = texto_estado(estado)
+        if texto == self.estado:
+            return
+        self.estado = texto
+        self.estado_label.config(text=texto)
+
+    def marcar(self, seleccionado):
+        if seleccionado == self.seleccionado:
+            return
+        self.seleccionado = seleccionado
+        actualizar_checkbox_visual(self.chk_canvas, seleccionado, self.colors)
+
+
+def actualizar_checkbox_visual(canvas, estado, colors):
+    """Actualiza la apariencia del checkbox cambiando la configuración de sus items"""
+    if estado:
+        canvas.itemconfig('caja', outline=colors['primary'], width=2, fill=colors['primary'])
+        canvas.itemconfig('marca', state='normal')
+    else:
+        canvas.itemconfig('caja', outline=colors['border'], width=1, fill='white')
+        canvas.itemconfig('marca', state='hidden')
+
+
+class ListaVirtualAplicaciones:
+    """Lista con scroll que solo crea widgets para las filas visibles.
+
+    Las filas se reciclan al hacer scroll o al cambiar el filtro, así que el
+    coste de refrescar es proporcional a las filas visibles y no al catálogo.
+    """
+
+    ALTO_FILA = 66
+    MARGEN_FILA = 3
+
+    def __init__(self, parent, colors, esta_seleccionada, al_alternar, alto=520):
+        self.colors = colors
+        self.esta_seleccionada = esta_seleccionada
+        self.al_alternar = al_alternar
+        self.alto_fila = self.ALTO_FILA
+        self.elementos = []
+        self.filas = []
+        self.estados = {}   # {app: (fase, avance de la copia)} de la cola en curso
+
+        canvas_frame = tk.Frame(parent, bg=colors['card_bg'])
+        canvas_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=(8, 8))
+
+        self.canvas = tk.Canvas(canvas_frame, bg=colors['card_bg'], highlightthickness=0, height=alto,
+                                yscrollincrement=self.alto_fila // 3)
+        self.scrollbar = ttk.Scrollbar(canvas_frame, orient="vertical", command=self._on_scrollbar)
+        self.canvas.configure(yscrollcommand=self._on_yscroll)
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.vacio = self.canvas.create_text(20, 30, anchor='nw', state='hidden',
+                                             text="No se encontraron aplicaciones",
+                                             font=('Segoe UI', 10), fill=colors['text_secondary'])
+
+        self.canvas.bind("<Configure>", self._on_configure)
+        self.canvas.bind("<MouseWheel>", self.on_mouse_wheel)
+        self.canvas.bind("<Button-4>", self.on_mouse_wheel)
+        self.canvas.bind("<Button-5>", self.on_mouse_wheel)
+
+    # ------------------------------------------------------------------
+    # Datos
+    # ------------------------------------------------------------------
+    def establecer_elementos(self, elementos):
+        """Reemplaza la lista de (app_name, ruta) mostrada y vuelve al principio"""
+        self.elementos = list(elementos)
+        for fila in self.filas:
+            fila.app_name = None  # Forzar que se vuelvan a rotular (la ruta pudo cambiar)
+        self._actualizar_scrollregion()
+        self.canvas.yview_moveto(0)
+        self.canvas.itemconfig(self.vacio, state='hidden' if self.elementos else 'normal')
+        self._redibujar()
+
+    def refrescar_estados(self):
+        """Vuelve a leer la selección de las filas visibles (p.ej. tras seleccionar todo)"""
+        for fila in self.filas:
+            if fila.app_name is not None:
+                fila.marcar(self.esta_seleccionada(fila.app_name))
+
+    def actualizar_estados(self, estados):
+        """Sustituye los estados por app; solo se repintan las filas visibles que cambiaron"""
+        self.estados = estados
+        for fila in self.filas:
+            if fila.app_name is not None:
+                fila.mostrar_estado(estados.get(fila.app_name))
+
+    def alternar(self, app_name):
+        if app_name is None:
+            return
+        self.al_alternar(app_name, not self.esta_seleccionada(app_name))
+
+    # ------------------------------------------------------------------
+    # Scroll y reciclado de filas
+    # ------------------------------------------------------------------
+    def _actualizar_scrollregion(self):
+        ancho = max(self.canvas.winfo_width(), 1)
+        self.canvas.configure(scrollregion=(0, 0, ancho, len(self.elementos) * self.alto_fila))
+
+    def _asegurar_filas(self):
+        """Crea las filas necesarias para cubrir el alto visible (más una de margen)"""
+        alto = max(self.canvas.winfo_height(), int(self.canvas.cget('height')))
+        necesarias = alto // self.alto_fila + 2
+        while len(self.filas) < necesarias:
+            self.filas.append(FilaAplicacion(self, self.colors))
+
+    def _redibujar(self):
+        self._asegurar_filas()
+        ancho = max(self.canvas.winfo_width() - 4, 1)
+        primera = int(self.canvas.canvasy(0) // self.alto_fila)
+        for i, fila in enumerate(self.filas):
+            indice = primera + i
+            if indice < len(self.elementos):
+                app_name, ruta = self.elementos[indice]
+                fila.vincular(app_name, ruta, self.esta_seleccionada(app_name), self.estados.get(app_name))
+                self.canvas.coords(fila.item, 2, indice * self.alto_fila + self.MARGEN_FILA)
+                self.canvas.itemconfig(fila.item, state='normal', width=ancho,
+                                       height=self.alto_fila - 2 * self.MARGEN_FILA)
+            else:
+                fila.app_name = None
+                self.canvas.itemconfig(fila.item, state='hidden')
+
+    def _on_configure(self, event):
+        self._actualizar_scrollregion()
+        self._redibujar()
+
+    def _on_scrollbar(self, *args):
+        self.canvas.yview(*args)
+        self._redibujar()
+
+    def _on_yscroll(self, primero, ultimo):
+        self.scrollbar.set(primero, ultimo)
+
+    def on_mouse_wheel(self, event):
+        if getattr(event, 'num', None) == 4:
+            pasos = -1
+        elif getattr(event, 'num', None) == 5:
+            pasos = 1
+        else:
+            pasos = int(-1 * (event.delta / 120))
+        self.canvas.yview_scroll(pasos, "units")
+        self._redibujar()
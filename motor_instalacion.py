@@ -0,0 +1,661 @@
+import os
+import time
+import logging
+import threading
+import subprocess
+import traceback
+from apps_manager import preparar_instalacion_especifica, cargar_reglas_parametros
+from cache_instaladores import CacheInstaladores
+from prefetch_instaladores import PrefetchInstaladores
+from planificador import PlanificadorInstalaciones
+from codigos_salida import ClasificadorCodigos, EXITO, REINICIO, REINTENTAR, FATAL
+from salida_instalador import RegistroSalidas
+from deteccion_instalador import DetectorInstaladores, familia_de_tecnologia
+from estrategias import TablaEstrategias, USUARIO_ACTUAL
+from historial import HistorialInstalaciones
+from broker_elevado import ClienteBroker, lanzador_con_credenciales
+from indice_recurso import IndiceRecurso
+from estimacion import EstimadorDuraciones, ProgresoPonderado, formatear_tiempos
+from copia_archivos import formatear_duracion
+from trazas import trazador, tramo, trazado
+from supervision import ArbolProcesos, InstalacionInactiva, PoliticaTimeouts, opciones_popen
+
+logger = logging.getLogger(__name__)
+
+# Flags de Windows; en otras plataformas (pruebas, benchmarks) no existen
+CREATE_NO_WINDOW = getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+
+
+class EventosInstalacion:
+    """Receptor de eventos del motor. La interfaz gráfica implementa los mismos
+    métodos; esta versión por defecto solo deja los mensajes en el log."""
+
+    def mostrar_mensaje(self, mensaje):
+        logger.info(mensaje)
+
+    def actualizar_estado(self, mensaje):
+        pass
+
+    def actualizar_progreso(self, valor):
+        pass
+
+    def actualizar_progreso_copia(self, nombre_archivo, copiados, total, velocidad, eta):
+        pass
+
+    def mostrar_resumen_instalacion(self, exitosos, fallidos, total, tiempos=None):
+        logger.info(f"Proceso completado: {exitosos} exitosas, {fallidos} fallidas, total {total}",
+                    extra={'exitosos': exitosos, 'fallidos': fallidos, 'total': total})
+        if tiempos:
+            logger.info(f"Tiempo real vs previsto:\n{formatear_tiempos(tiempos)}")
+
+
+class MotorInstalacion:
+    """Ejecuta la cola de instalación silenciosa sin depender de la interfaz gráfica"""
+
+    def __init__(self, aplicaciones, configuracion, auth, eventos=None):
+        self.aplicaciones = aplicaciones
+        self.configuracion = configuracion
+        self.auth = auth  # Objeto con credenciales_admin / credenciales_dominio
+        self.eventos = eventos or EventosInstalacion()
+        self.cola_instalacion = []
+
+        # Caché local de instaladores (clave: ruta + tamaño + mtime + hash)
+        self.cache = CacheInstaladores.desde_configuracion(configuracion.get('cache'))
+        # Tecnología de cada instalador (MSI, Inno, NSIS...), analizada una vez por hash
+        self.detector = DetectorInstaladores(self.cache.directorio)
+        # Estrategia (usuario actual / credenciales) que funcionó para cada app e instalador
+        self.estrategias = TablaEstrategias(self.cache.directorio)
+        # Evita que dos copiadores en paralelo mapeen la unidad T: a la vez
+        self._lock_red = threading.Lock()
+        self._lock_contadores = threading.Lock()
+
+        # Clasificación de códigos de salida (codigos_salida.json + config.json)
+        self.clasificador = ClasificadorCodigos(configuracion.get('codigos_salida'))
+        # Parámetros silenciosos (parametros_silenciosos.json + config.json)
+        cargar_reglas_parametros(configuracion.get('parametros_silenciosos'))
+        self.reinicio_requerido = []
+
+        # Salida de los instaladores: logs rotativos por app + últimas líneas para la UI
+        self.salidas = RegistroSalidas.desde_configuracion(configuracion.get('logs'))
+
+        # Historial persistente con la duración de cada fase por intento
+        self.historial = HistorialInstalaciones.desde_configuracion(configuracion.get('historial'))
+        # Árbol de procesos del instalador: fin real, inactividad y timeout por app según su p95
+        self.supervision = configuracion.get('supervision') or {}
+        self.timeouts = PoliticaTimeouts.desde_configuracion(self.historial, self.supervision)
+        self._medidas_copia = {}  # {ruta_red: duraciones de resolver/copiar}
+        # Avance de la cola en curso ponderado por la duración prevista de cada app
+        self.progreso = None
+        # Índice de los recursos compartidos: localiza instaladores movidos sin sondear la red
+        self.indice_recurso = IndiceRecurso.desde_configuracion(configuracion.get('indice_recurso'))
+        self._lock_indice = threading.Lock()
+        self._indice_reescaneado = False
+        # Proceso elevado que ejecuta los instaladores con credenciales (uno por cola)
+        self.broker = None
+        self._lock_broker = threading.Lock()
+        # Tramos por fase (sección `trazas`); se exporta una traza de Chrome por cola
+        trazador.configurar(configuracion.get('trazas'))
+        self.ultima_traza = None
+
+    # Reenvío de eventos (mantiene los nombres usados en todo el flujo)
+    def mostrar_mensaje(self, mensaje):
+        self.eventos.mostrar_mensaje(mensaje)
+
+    def actualizar_estado(self, mensaje):
+        self.eventos.actualizar_estado(mensaje)
+
+    def actualizar_progreso(self, valor):
+        self.eventos.actualizar_progreso(valor)
+
+    def actualizar_progreso_copia(self, nombre_archivo, copiados, total, velocidad, eta):
+        self.eventos.actualizar_progreso_copia(nombre_archivo, copiados, total, velocidad, eta)
+
+    def crear_planificador(self, cola):
+        """Crea el planificador con los metadatos de config.json"""
+        configuracion = dict(self.configuracion)
+        configuracion['aplicaciones'] = self.aplicaciones
+        return PlanificadorInstalaciones.desde_configuracion(cola, configuracion)
+
+    def es_ruta_red(self, ruta):
+        """Indica si el instalador está en un recurso compartido y hay que traerlo a local"""
+        return ruta.startswith('\\\\')
+
+    def preparar_instalador_local(self, ruta_red):
+        """Copia el instalador de la red al disco local para evitar problemas de red"""
+        medida = {'inicio': time.monotonic(), 'bytes': 0, 'ruta': ruta_red}
+        try:
+            with tramo('preparar_instalador', 'copia', archivo=os.path.basename(ruta_red)):
+                return self._resolver_y_copiar(ruta_red, medida)
+        finally:
+            # Se guarda por ruta: la copia puede hacerse en un hilo de prefetch
+            fin = time.monotonic()
+            resuelto = medida.get('resuelto', fin)
+            with self._lock_contadores:
+                self._medidas_copia[ruta_red] = {
+                    'duracion_resolver': resuelto - medida['inicio'],
+                    'duracion_copia': fin - resuelto,
+                    'bytes_copia': medida['bytes'],
+                }
+
+    def _resolver_y_copiar(self, ruta_red, medida):
+        """Localiza el instalador en la red y lo trae a la caché local"""
+        try:
+            # Verificar si ya está en local
+            if not self.es_ruta_red(ruta_red):
+                return ruta_red
+
+            with tramo('comprobar_ruta', 'red'):
+                existe = os.path.exists(ruta_red)
+            logger.debug(f"Ruta original: {ruta_red} (¿existe en red?: {existe})")
+
+            # Si no existe en la red, buscarlo en el índice del recurso compartido
+            ruta_indice = None if existe else self.resolver_en_indice(os.path.basename(ruta_red))
+            if ruta_indice:
+                logger.debug(f"Encontrado en el índice del recurso: {ruta_indice}")
+                ruta_red = ruta_indice
+            elif not existe:
+                nombre_archivo = os.path.basename(ruta_red)
+                logger.debug(f"Archivo no encontrado, buscando alternativas para: {nombre_archivo}")
+
+                # Último recurso (índice vacío o sin configurar): rutas alternativas comunes
+                rutas_alternativas = [
+                    f"\\\\10.99.8.108\\aplicaciones\\{nombre_archivo}",
+                    f"\\\\10.99.8.108\\d\\{nombre_archivo}",
+                    f"\\\\10.99.8.108\\aplicaciones\\Polichequeos\\{nombre_archivo}",
+                    f"\\\\10.99.8.108\\aplicaciones\\Polichequeos\\instalador\\{nombre_archivo}",
+                    f"\\\\10.99.8.108\\aplicaciones\\Polichequeos\\ultima_version\\{nombre_archivo}",
+                ]
+
+                with tramo('rutas_alternativas', 'red'):
+                    encontrada = next((ruta_alt for ruta_alt in rutas_alternativas if os.path.exists(ruta_alt)), None)
+                if encontrada:
+                    logger.debug(f"Encontrado en ubicación alternativa: {encontrada}")
+                    ruta_red = encontrada
+                else:
+                    # Si ninguna ruta alternativa funciona
+                    logger.warning(f"No se encontró {nombre_archivo} en ninguna ubicación alternativa")
+                    return ruta_red  # Devolver la original para manejar el error después
+
+            nombre_archivo = os.path.basename(ruta_red)
+            medida['resuelto'] = time.monotonic()
+
+            def progreso(copiados, total, velocidad, eta):
+                medida['bytes'] = copiados
+                if self.progreso:
+                    self.progreso.actualizar_copia(medida['ruta'], copiados, total, velocidad)
+                self.actualizar_progreso_copia(nombre_archivo, copiados, total, velocidad, eta)
+
+            # La caché decide si hace falta leer del recurso compartido
+            try:
+                en_cache = self.cache.esta_en_cache(ruta_red)
+                if not en_cache:
+                    self.mostrar_mensaje(f"📥 Copiando {nombre_archivo} a local...")
+                with tramo('copiar', 'copia', archivo=nombre_archivo, en_cache=en_cache) as tramo_copia:
+                    ruta_local = self.cache.obtener(ruta_red, progreso=progreso)
+                    tramo_copia.anotar(bytes=medida['bytes'])
+                if en_cache:
+                    self.mostrar_mensaje(f"📁 Usando copia local en caché: {nombre_archivo}")
+                else:
+                    self.mostrar_mensaje(f"✅ Copiado exitosamente a: {ruta_local}")
+                return ruta_local
+            except PermissionError:
+                self.mostrar_mensaje("🔐 Error de permisos, intentando mapear unidad de red...")
+                with self._lock_red:
+                    ruta_mapeada = self.mapear_unidad_red(ruta_red)
+                    if ruta_mapeada and ruta_mapeada != ruta_red:
+                        with tramo('copiar', 'copia', archivo=nombre_archivo, unidad_mapeada=True):
+                            ruta_local = self.cache.obtener(ruta_red, ruta_lectura=ruta_mapeada, progreso=progreso)
+                        self.mostrar_mensaje(f"✅ Copiado via unidad mapeada: {ruta_local}")
+                        return ruta_local
+                    else:
+                        raise Exception("No se pudo acceder al archivo en la red")
+            except FileNotFoundError:
+                self.mostrar_mensaje(f"❌ Archivo no encontrado: {ruta_red}")
+                raise Exception(f"El archivo {nombre_archivo} no existe en la ruta especificada")
+            except Exception as e:
+                self.mostrar_mensaje(f"❌ Error copiando archivo: {e}")
+                raise
+
+        except Exception as e:
+            self.mostrar_mensaje(f"❌ Error en preparar_instalador_local: {e}")
+            # Intentar usar la ruta original
+            return ruta_red
+
+    def resolver_en_indice(self, nombre_archivo):
+        """Ruta actual del instalador según el índice del recurso, o None.
+
+        Si el índice no lo conoce (o la ruta ya no existe) se reescanea una vez
+        por cola: solo se listan los directorios que cambiaron.
+        """
+        with tramo('resolver_en_indice', 'red', archivo=nombre_archivo):
+            ruta = self.indice_recurso.resolver(nombre_archivo)
+            if ruta and os.path.exists(ruta):
+                return ruta
+        with self._lock_indice:
+            if not self._indice_reescaneado and self.indice_recurso.raices:
+                self._indice_reescaneado = True
+                with tramo('reescanear_indice', 'red') as tramo_indice:
+                    estadisticas = self.indice_recurso.escanear()
+                    tramo_indice.anotar(**estadisticas)
+                self.mostrar_mensaje(f"🗂️ Índice del recurso actualizado: {estadisticas['archivos']} instaladores, "
+                                     f"{estadisticas['directorios_listados']} carpetas releídas "
+                                     f"({estadisticas['duracion']:.1f}s)")
+        ruta = self.indice_recurso.resolver(nombre_archivo)
+        return ruta if ruta and os.path.exists(ruta) else None
+
+    def ejecutar_cola_instalacion_silenciosa(self, cola):
+        """Ejecuta la instalación manejando problemas de red con credenciales.
+
+        Devuelve {app_name: estado} (exitoso | fallido | omitido).
+        """
+        try:
+            with tramo('cola', 'cola', apps=len(cola)):
+                return self._ejecutar_cola(cola)
+        finally:
+            # Una traza por cola (incluye lo registrado antes, como los sondeos de arranque)
+            self.ultima_traza = trazador.exportar() if trazador.activo else None
+            if self.ultima_traza:
+                self.mostrar_mensaje(f"🧵 Traza de la cola guardada en {self.ultima_traza}")
+
+    def _ejecutar_cola(self, cola):
+        self.cola_instalacion = list(cola)
+        self.reinicio_requerido = []
+        self._indice_reescaneado = False
+        total = len(self.cola_instalacion)
+        contadores = {'exitosos': 0, 'fallidos': 0, 'terminadas': 0}
+
+        # Dependencias, prioridades y recursos de cada app (config.json)
+        planificador = self.crear_planificador(self.cola_instalacion)
+
+        # Comprobar de una vez que hay espacio local para toda la cola
+        try:
+            with tramo('verificar_espacio', 'cola'):
+                espacio = self.cache.verificar_espacio(
+                    [self.aplicaciones[app] for app in self.cola_instalacion
+                     if self.es_ruta_red(self.aplicaciones[app])]
+                )
+            if not espacio['suficiente']:
+                self.mostrar_mensaje(
+                    f"⚠️ Espacio insuficiente para la caché: se necesitan "
+                    f"{espacio['necesario'] // (1024 * 1024)} MB, disponibles "
+                    f"{espacio['disponible'] // (1024 * 1024)} MB"
+                )
+        except Exception as e:
+            self.mostrar_mensaje(f"⚠️ No se pudo comprobar el espacio libre: {e}")
+
+        # Avance ponderado por lo que tardó cada app en instalaciones anteriores
+        with tramo('prever_duraciones', 'cola'):
+            orden = planificador.orden_previsto()
+            previsiones = EstimadorDuraciones(self.historial).previsiones(orden)
+        self.progreso = ProgresoPonderado(orden, previsiones, {app: self.aplicaciones[app] for app in orden})
+        self.mostrar_mensaje(f"⏱️ Tiempo previsto de la cola: {formatear_duracion(self.progreso.total_previsto)} "
+                             f"({sum(1 for p in previsiones.values() if p['muestras'])}/{total} apps con historial)")
+
+        # Copiadores en segundo plano: mientras se instala una app se copian las
+        # siguientes, en el orden en que el planificador las irá lanzando
+        prefetch = PrefetchInstaladores.desde_configuracion(
+            self.preparar_instalador_local,
+            [(app, self.aplicaciones[app]) for app in orden],
+            self.configuracion.get('prefetch')
+        )
+        prefetch.iniciar()
+        pausa = self.configuracion.get('planificacion', {}).get('pausa_entre_instalaciones', 2)
+        ejecucion_id = self.historial.iniciar_ejecucion(total)
+        intentos = {}
+
+        def instalar(app_name):
+            with self._lock_contadores:
+                numero = contadores['terminadas'] + 1
+                intentos[app_name] = intentos.get(app_name, 0) + 1
+            self.actualizar_estado(f"🔧 Preparando {app_name}... ({numero}/{total})")
+            ruta_instalador = None
+            resultado = False
+            registro = {}
+            inicio, inicio_monotonic = time.time(), time.monotonic()
+            self.progreso.preparando(app_name)
+            with tramo(app_name, 'app', intento=intentos[app_name]) as tramo_app:
+                try:
+                    with tramo('esperar_copia', 'copia', app=app_name):
+                        ruta_instalador = prefetch.obtener(app_name)
+                    self.progreso.instalando(app_name)
+                    resultado = self.instalar_aplicacion(app_name, ruta_instalador, registro)
+                    return resultado
+                finally:
+                    # La copia ya se usó: puede desalojarse si la caché necesita espacio
+                    if ruta_instalador:
+                        self.cache.liberar(ruta_instalador)
+                    with self._lock_contadores:
+                        medida = self._medidas_copia.pop(self.aplicaciones[app_name], {})
+                    estado = 'exitoso' if resultado is True else ('reintentar' if resultado == REINTENTAR else 'fallido')
+                    self.historial.registrar_intento(
+                        ejecucion_id, app_name, reintento=intentos[app_name] - 1, estado=estado,
+                        inicio=inicio, fin=time.time(), duracion_total=time.monotonic() - inicio_monotonic,
+                        **medida, **registro)
+                    tramo_app.anotar(resultado=str(resultado), estrategia=registro.get('estrategia'),
+                                     codigo_salida=registro.get('codigo_salida'))
+                    with tramo('pausa', 'cola', segundos=pausa):
+                        time.sleep(pausa)
+
+        def al_terminar(app_name, estado):
+            with self._lock_contadores:
+                contadores['terminadas'] += 1
+                if estado == 'exitoso':
+                    contadores['exitosos'] += 1
+                else:
+                    contadores['fallidos'] += 1
+                terminadas = contadores['terminadas']
+            self.progreso.terminar(app_name, estado)
+            if estado == 'omitido':
+                self.mostrar_mensaje(f"⏭️ {app_name} omitida: falló una de sus dependencias")
+                self.historial.registrar_intento(ejecucion_id, app_name, estado='omitido')
+            self.actualizar_progreso(terminadas)
+
+        def al_reintentar(app_name, espera, reintento):
+            trazador.instante('reintento', 'cola', app=app_name, espera=espera, reintento=reintento)
+            self.mostrar_mensaje(f"🔁 {app_name}: fallo transitorio, se reintentará en {espera:.0f}s "
+                                 f"(reintento {reintento})")
+
+        self.actualizar_progreso(0)
+        try:
+            estados = planificador.ejecutar(instalar, al_terminar, al_reintentar)
+        finally:
+            with tramo('cerrar_cola', 'cola'):
+                prefetch.cerrar()
+                self.cerrar_broker()
+                self.cache.liberar()
+                self.historial.finalizar_ejecucion(ejecucion_id, contadores['exitosos'], contadores['fallidos'])
+
+                # Limpiar archivos temporales
+                self.limpiar_temporales()
+
+        if self.reinicio_requerido:
+            self.mostrar_mensaje(f"🔄 Requieren reiniciar el equipo: {', '.join(self.reinicio_requerido)}")
+
+        stats = self.cache.resumen_estadisticas()
+        self.mostrar_mensaje(
+            f"📦 Caché: {stats['aciertos']} aciertos, {stats['fallos']} fallos "
+            f"({stats['tasa_aciertos']:.0%}), {stats['bytes_copiados'] // (1024 * 1024)} MB copiados de la red"
+        )
+
+        # Mostrar resumen
+        self.actualizar_progreso(total)
+        self.eventos.mostrar_resumen_instalacion(contadores['exitosos'], contadores['fallidos'], total,
+                                                 tiempos=self.progreso.tiempos())
+        return estados
+
+    def ejecutar_proceso(self, app_name, comando, timeout, codificacion='latin-1', **kwargs):
+        """Lanza el instalador y transmite su salida al log de la app mientras corre.
+
+        Espera a todo el árbol de procesos (no solo al instalador lanzado) y
+        devuelve el código de salida; ante timeout mata el árbol entero y
+        relanza `subprocess.TimeoutExpired`.
+        """
+        proceso = subprocess.Popen(comando, stdout=subprocess.PIPE, stderr=subprocess.PIPE, **opciones_popen(**kwargs))
+        arbol = ArbolProcesos.crear(proceso, intervalo=self.supervision.get('intervalo', 1.0),
+                                    espera_residuales=self.supervision.get('espera_residuales', 30))
+        salida = self.salidas.nueva(app_name, codificacion).seguir(proceso)
+        try:
+            with tramo('instalador', 'instalador', app=app_name, modo='usuario_actual', pid=proceso.pid) as tramo_instalador:
+                codigo = arbol.esperar(timeout, **self._opciones_inactividad(app_name))
+                tramo_instalador.anotar(residuales=arbol.residuales)
+            return codigo
+        finally:
+            # Los procesos residuales heredan las tuberías y no las cierran: no se espera por ellos
+            salida.terminar(timeout=1 if arbol.residuales else 5)
+            arbol.cerrar()
+            self._finalizar_salida(app_name, salida)
+
+    def _opciones_inactividad(self, app_name):
+        """Argumentos de inactividad para `ArbolProcesos.esperar` y el broker"""
+        def al_inactivo(segundos):
+            trazador.instante('inactivo', 'instalador', app=app_name, segundos=round(segundos))
+            logger.warning(f"{app_name}: sin actividad de CPU ni disco durante {segundos:.0f}s")
+            self.mostrar_mensaje(f"💤 {app_name} - Sin actividad de CPU ni disco desde hace "
+                                 f"{formatear_duracion(segundos)}; puede estar esperando una ventana")
+        return {'inactividad': self.supervision.get('inactividad', 180),
+                'terminar_inactivos': self.supervision.get('terminar_inactivos', False),
+                'al_inactivo': al_inactivo}
+
+    def ejecutar_en_broker(self, app_name, comando, timeout, codificacion='latin-1'):
+        """Como `ejecutar_proceso`, pero el instalador lo lanza el broker elevado"""
+        salida = self.salidas.nueva(app_name, codificacion)
+        try:
+            broker = self.obtener_broker()
+            with tramo('instalador', 'instalador', app=app_name, modo='broker_elevado'):
+                return broker.ejecutar(comando, timeout, codificacion=codificacion,
+                                       al_recibir_linea=salida.agregar_linea,
+                                       **self._opciones_inactividad(app_name))
+        finally:
+            salida.terminar()
+            self._finalizar_salida(app_name, salida)
+
+    def _finalizar_salida(self, app_name, salida):
+        self.salidas.finalizar(app_name)
+        lineas = salida.ultimas_lineas(5)
+        if lineas:
+            self.mostrar_mensaje(f"📄 {app_name} ({salida.lineas_totales} líneas, log: {salida.ruta_log}):\n"
+                                 + "\n".join(lineas))
+
+    def obtener_broker(self):
+        """Arranca el broker elevado la primera vez que se necesita en la cola"""
+        with self._lock_broker:
+            if self.broker is None or not self.broker.activo:
+                credenciales = self.auth.credenciales_admin or {}
+                lanzador = None
+                if os.name == 'nt':
+                    if not credenciales.get('password'):
+                        raise PermissionError("No hay contraseña de administrador para el broker elevado")
+                    lanzador = lanzador_con_credenciales(credenciales['usuario'], credenciales['password'])
+                self.mostrar_mensaje("🔐 Iniciando proceso elevado para las instalaciones con credenciales...")
+                with tramo('iniciar_broker', 'autenticacion'):
+                    self.broker = ClienteBroker(lanzador).iniciar()
+            return self.broker
+
+    def cerrar_broker(self):
+        with self._lock_broker:
+            if self.broker is not None:
+                self.broker.cerrar()
+                self.broker = None
+
+    def registrar_resultado(self, app_name, codigo_salida, clase):
+        """Traduce la clase del código de salida al resultado que espera el planificador"""
+        if clase == REINICIO:
+            with self._lock_contadores:
+                self.reinicio_requerido.append(app_name)
+            self.mostrar_mensaje(f"✅ {app_name} instalado, requiere reinicio (código: {codigo_salida})")
+            return True
+        if clase == EXITO:
+            return True
+        if clase == REINTENTAR:
+            return REINTENTAR
+        return False
+
+    def instalar_aplicacion(self, app_name, ruta_instalador, registro=None):
+        """Instala una aplicación ya copiada en local.
+
+        Devuelve True si tuvo éxito, False si falló o `REINTENTAR` si el código
+        de salida indica un fallo transitorio. Si se pasa `registro` (dict) se
+        completa con los datos del intento para el historial.
+        """
+        registro = {} if registro is None else registro
+        try:
+            if not os.path.exists(ruta_instalador):
+                self.mostrar_mensaje(f"❌ {app_name} - Archivo no accesible: {ruta_instalador}")
+                return False
+
+            # Detectar la tecnología del binario para elegir parámetros y códigos de salida
+            inicio_verificacion = time.monotonic()
+            with tramo('detectar', 'verificacion', app=app_name) as tramo_deteccion:
+                hash_contenido = self.cache.hash_de(ruta_instalador) or self.detector.hash_archivo(ruta_instalador)
+                deteccion = self.detector.detectar(ruta_instalador, hash_contenido)
+                tramo_deteccion.anotar(tecnologia=deteccion['tecnologia'])
+            tecnologia = deteccion['tecnologia']
+            registro.update(hash=hash_contenido, tecnologia=tecnologia,
+                            bytes_instalador=os.path.getsize(ruta_instalador),
+                            duracion_verificacion=time.monotonic() - inicio_verificacion,
+                            duracion_ejecucion=0.0)
+            familia = familia_de_tecnologia(tecnologia) or self.clasificador.familia_por_nombre(ruta_instalador)
+
+            # Obtener parámetros silenciosos
+            config = preparar_instalacion_especifica(app_name, ruta_instalador, tecnologia)
+            parametros = config['parametros']
+            limite = self.timeouts.timeout_para(app_name, config['timeout'])
+            config['timeout'] = limite['timeout']
+
+            self.mostrar_mensaje(f"⚙️ Instalando: {os.path.basename(ruta_instalador)}")
+            self.mostrar_mensaje(f"📁 Ruta: {ruta_instalador}")
+            self.mostrar_mensaje(f"🔍 Tecnología: {tecnologia} ({deteccion['motivo']})")
+            self.mostrar_mensaje(f"📋 Parámetros: {' '.join(parametros[1:]) if len(parametros) > 1 else 'ninguno'}")
+            if limite['p95'] is not None:
+                self.mostrar_mensaje(f"⏱️ Timeout: {formatear_duracion(limite['timeout'])} "
+                                     f"(p95 {formatear_duracion(limite['p95'])} en {limite['muestras']} instalaciones)")
+
+            # Construir argumentos
+            args_list = parametros[1:] if len(parametros) > 1 else []
+            args_str = ' '.join([f'"{arg}"' for arg in args_list])
+
+            # Primero la estrategia que funcionó la última vez con este instalador
+            # (por defecto: usuario actual y, si falla, credenciales de administrador)
+            orden = self.estrategias.orden_para(app_name, hash_contenido)
+            if orden[0] != USUARIO_ACTUAL:
+                self.mostrar_mensaje(f"🧠 {app_name}: se usa directamente la estrategia aprendida ({orden[0]})")
+
+            codigo_salida, clase = None, FATAL
+            for intento, estrategia in enumerate(orden):
+                if intento:
+                    self.mostrar_mensaje(f"⚠️ Intento con {orden[intento - 1]} falló (código {codigo_salida}), "
+                                         f"intentando con {estrategia}...")
+                registro['estrategia'] = estrategia
+                inicio_ejecucion = time.monotonic()
+                try:
+                    if estrategia == USUARIO_ACTUAL:
+                        codigo_salida, clase = self._ejecutar_como_usuario(app_name, parametros, args_str, config, familia)
+                    else:
+                        codigo_salida, clase = self._ejecutar_con_credenciales(app_name, ruta_instalador, args_str, config, familia)
+                except InstalacionInactiva as e:
+                    self.mostrar_mensaje(f"💤 {app_name} - Detenido tras {formatear_duracion(e.inactividad)} "
+                                         f"sin actividad (árbol de procesos terminado)")
+                    registro['clase'] = 'inactivo'
+                    return False
+                except subprocess.TimeoutExpired:
+                    self.mostrar_mensaje(f"⏰ {app_name} - Timeout de {formatear_duracion(config['timeout'])} "
+                                         f"(árbol de procesos terminado)")
+                    registro['clase'] = 'timeout'
+                    return False
+                finally:
+                    registro['duracion_ejecucion'] += time.monotonic() - inicio_ejecucion
+                registro.update(codigo_salida=codigo_salida, clase=clase)
+
+                if clase != FATAL:
+                    # Éxito, reinicio pendiente o fallo transitorio: no probar otra estrategia
+                    if clase != REINTENTAR:
+                        self.estrategias.registrar(app_name, hash_contenido, estrategia, True)
+                    return self.registrar_resultado(app_name, codigo_salida, clase)
+                self.estrategias.registrar(app_name, hash_contenido, estrategia, False)
+
+            self.mostrar_mensaje(f"❌ {app_name} - Falló con todas las estrategias (código: {codigo_salida})")
+            return self.registrar_resultado(app_name, codigo_salida, clase)
+
+        except Exception as e:
+            self.mostrar_mensaje(f"❌ {app_name} - Error: {str(e)}")
+            self.mostrar_mensaje(f"Traceback: {traceback.format_exc()[:300]}")
+            return False
+
+    def _ejecutar_como_usuario(self, app_name, parametros, args_str, config, familia='comun'):
+        """Ejecuta el instalador con el usuario actual. Devuelve (código, clase)"""
+        self.mostrar_mensaje(f"📋 Ejecutando instalador sin credenciales (probando)...")
+        codigo_salida = self.ejecutar_proceso(
+            app_name,
+            f'"{parametros[0]}" {args_str}',
+            config['timeout'],
+            shell=True,
+            creationflags=CREATE_NO_WINDOW
+        )
+        clase = self.clasificador.clasificar(codigo_salida, familia)
+        if clase == EXITO:
+            self.mostrar_mensaje(f"✅ {app_name} instalado exitosamente (código: {codigo_salida})")
+        return codigo_salida, clase
+
+    def _ejecutar_con_credenciales(self, app_name, ruta_instalador, args_str, config, familia='comun'):
+        """Ejecuta la instalación FORZANDO modo completamente silencioso, en el broker elevado.
+
+        Devuelve (código, clase); el timeout se propaga como `subprocess.TimeoutExpired`.
+        """
+        try:
+            # El broker (elevado una sola vez por cola) lanza el instalador y devuelve su salida
+            codigo_salida = self.ejecutar_en_broker(
+                app_name,
+                config['parametros'],  # Usar la lista completa de parámetros
+                config['timeout'] + 60,
+                codificacion='utf-8'
+            )
+
+            clase = self.clasificador.clasificar(codigo_salida, familia)
+            if clase == EXITO:
+                self.mostrar_mensaje(f"✅ {app_name} instalado COMPLETAMENTE EN SILENCIO")
+            elif clase == REINTENTAR:
+                self.mostrar_mensaje(f"⏳ {app_name} - Fallo transitorio (código: {codigo_salida})")
+            return codigo_salida, clase
+
+        except subprocess.TimeoutExpired:
+            raise
+        except Exception as e:
+            self.mostrar_mensaje(f"❌ {app_name} - Error en modo silencioso: {str(e)}")
+            return None, FATAL
+
+    @trazado('red')
+    def limpiar_temporales(self):
+        """Limpia archivos temporales y desconecta unidades de red"""
+        try:
+            # Desconectar unidad T: si existe
+            subprocess.run('net use T: /delete /y', shell=True,
+                        stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                        creationflags=CREATE_NO_WINDOW)
+        except:
+            pass
+
+    @trazado('red')
+    def mapear_unidad_red(self, ruta_completa):
+        """Mapea automáticamente la unidad de red usando credenciales guardadas"""
+        credenciales = getattr(self.auth, 'credenciales_dominio', None)
+        if not credenciales or not credenciales.get('usuario'):
+            self.mostrar_mensaje("⚠️ Sin credenciales de dominio: no se mapea la unidad de red")
+            return ruta_completa
+        try:
+            # Extraer información de la ruta de red
+            if ruta_completa.startswith('\\\\'):
+                partes = ruta_completa.split('\\')
+                servidor = partes[2]
+                recurso = '\\'.join(partes[3:])
+
+                # Unidad temporal a usar
+                unidad = 'T:'
+
+                # Primero desconectar si ya existe
+                subprocess.run(f'net use {unidad} /delete /y',
+                            shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                            creationflags=CREATE_NO_WINDOW)
+
+                # Intentar mapear con credenciales de dominio
+                usuario_dominio = credenciales['usuario']
+                password_dominio = credenciales.get('password', '')
+
+                comando = f'net use {unidad} "\\\\{servidor}\\aplicaciones" /user:{usuario_dominio} {password_dominio} /persistent:no'
+                resultado = subprocess.run(comando, shell=True,
+                                        stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                        creationflags=CREATE_NO_WINDOW)
+
+                if resultado.returncode == 0:
+                    self.mostrar_mensaje("✅ Unidad de red mapeada con credenciales de dominio")
+                    nueva_ruta = f"{unidad}\\{recurso}"
+                    return nueva_ruta
+                else:
+                    error_output = resultado.stderr.decode('latin-1', errors='ignore')
+                    self.mostrar_mensaje(f"❌ Error mapeando red: {error_output}")
+                    return ruta_completa
+
+            return ruta_completa
+
+        except Exception as e:
+            self.mostrar_mensaje(f"⚠️ Error mapeando red: {e}")
+            return ruta_completa
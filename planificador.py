@@ -0,0 +1,233 @@
+import os
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from codigos_salida import REINTENTAR
+
+# Clases de recurso (metadatos_aplicaciones.<app>.recurso en config.json)
+RECURSO_MSI = 'msi-mutex'            # Usa el mutex de Windows Installer: de a una
+RECURSO_EXCLUSIVO = 'exclusive'      # No puede convivir con ninguna otra instalación
+RECURSO_COPIA = 'file-copy'          # Solo copia archivos (instalaciones especiales)
+RECURSO_PARALELO = 'parallel-safe'   # Puede ejecutarse junto a cualquier otra
+RECURSOS = (RECURSO_MSI, RECURSO_EXCLUSIVO, RECURSO_COPIA, RECURSO_PARALELO)
+
+LIMITES_RECURSO_POR_DEFECTO = {RECURSO_MSI: 1, RECURSO_COPIA: 2}
+
+
+class PlanificadorInstalaciones:
+    """Decide qué aplicaciones de la cola pueden ejecutarse y cuándo.
+
+    Respeta dependencias entre aplicaciones de la cola, prioridades (mayor
+    primero, empate por orden de la cola), la clase de recurso de cada app y
+    un límite global de concurrencia. Las apps con fallos transitorios vuelven
+    a la cola con espera exponencial sin frenar al resto.
+    """
+
+    def __init__(self, cola, metadatos=None, aplicaciones=None, maximo_concurrente=2,
+                 limites_recurso=None, recurso_por_defecto=RECURSO_MSI, reintentos=None):
+        self.logger = logging.getLogger(__name__)
+        self.cola = list(cola)
+        self.maximo_concurrente = max(1, int(maximo_concurrente))
+        reintentos = reintentos or {}
+        self.maximo_reintentos = int(reintentos.get('maximo', 3))
+        self.espera_base = float(reintentos.get('espera_base', 30))
+        self.espera_maxima = float(reintentos.get('espera_maxima', 300))
+        self.limites_recurso = dict(LIMITES_RECURSO_POR_DEFECTO)
+        self.limites_recurso.update(limites_recurso or {})
+        metadatos = metadatos or {}
+        aplicaciones = aplicaciones or {}
+
+        en_cola = set(self.cola)
+        self.tareas = {}
+        for orden, app_name in enumerate(self.cola):
+            meta = metadatos.get(app_name, {})
+            recurso = meta.get('recurso') or self._recurso_inferido(aplicaciones.get(app_name), recurso_por_defecto)
+            if recurso not in RECURSOS:
+                raise ValueError(f"Recurso desconocido para {app_name}: {recurso}")
+            dependencias = []
+            for dep in meta.get('depende_de', []):
+                if dep in en_cola:
+                    dependencias.append(dep)
+                else:
+                    # Si no está en la cola se asume ya instalada
+                    self.logger.info(f"{app_name}: dependencia {dep} fuera de la cola, se asume instalada")
+            self.tareas[app_name] = {
+                'orden': orden,
+                'prioridad': meta.get('prioridad', 0),
+                'recurso': recurso,
+                'depende_de': dependencias,
+                'estado': 'pendiente',  # pendiente | ejecutando | exitoso | fallido | omitido
+                'reintentos': 0,
+                'no_antes_de': 0.0,
+            }
+        self._validar_ciclos()
+
+    @classmethod
+    def desde_configuracion(cls, cola, configuracion):
+        """Crea el planificador a partir de config.json (planificacion + metadatos_aplicaciones)"""
+        ajustes = configuracion.get('planificacion', {})
+        return cls(cola,
+                   metadatos=configuracion.get('metadatos_aplicaciones', {}),
+                   aplicaciones=configuracion.get('aplicaciones', {}),
+                   maximo_concurrente=ajustes.get('maximo_concurrente', 2),
+                   limites_recurso=ajustes.get('limites_recurso'),
+                   recurso_por_defecto=ajustes.get('recurso_por_defecto', RECURSO_MSI),
+                   reintentos=ajustes.get('reintentos'))
+
+    @staticmethod
+    def _recurso_inferido(ruta, recurso_por_defecto):
+        if ruta and os.path.splitext(ruta)[1].lower() in ('.msi', '.msp'):
+            return RECURSO_MSI
+        return recurso_por_defecto
+
+    def _validar_ciclos(self):
+        """Lanza ValueError si las dependencias forman un ciclo"""
+        visitando, visitadas = set(), set()
+
+        def visitar(app_name, camino):
+            if app_name in visitadas:
+                return
+            if app_name in visitando:
+                raise ValueError(f"Dependencia circular: {' -> '.join(camino + [app_name])}")
+            visitando.add(app_name)
+            for dep in self.tareas[app_name]['depende_de']:
+                visitar(dep, camino + [app_name])
+            visitando.discard(app_name)
+            visitadas.add(app_name)
+
+        for app_name in self.cola:
+            visitar(app_name, [])
+
+    def _clave_orden(self, app_name):
+        tarea = self.tareas[app_name]
+        return (-tarea['prioridad'], tarea['orden'])
+
+    def orden_previsto(self):
+        """Orden topológico por prioridad: el orden en que se ejecutaría de a una"""
+        hechas, orden = set(), []
+        pendientes = sorted(self.cola, key=self._clave_orden)
+        while pendientes:
+            for app_name in pendientes:
+                if all(dep in hechas for dep in self.tareas[app_name]['depende_de']):
+                    orden.append(app_name)
+                    hechas.add(app_name)
+                    pendientes.remove(app_name)
+                    break
+        return orden
+
+    def _puede_iniciar(self, app_name, en_ejecucion):
+        tarea = self.tareas[app_name]
+        if any(self.tareas[dep]['estado'] != 'exitoso' for dep in tarea['depende_de']):
+            return False
+        if len(en_ejecucion) >= self.maximo_concurrente:
+            return False
+        recursos_activos = [self.tareas[app]['recurso'] for app in en_ejecucion]
+        if RECURSO_EXCLUSIVO in recursos_activos:
+            return False
+        if tarea['recurso'] == RECURSO_EXCLUSIVO:
+            return not en_ejecucion
+        limite = self.limites_recurso.get(tarea['recurso'])
+        if limite is not None and recursos_activos.count(tarea['recurso']) >= limite:
+            return False
+        return True
+
+    def _omitir_dependientes(self, app_name):
+        """Marca como omitidas las apps que dependen (directa o indirectamente) de una fallida"""
+        omitidas = []
+        for otra, tarea in self.tareas.items():
+            if tarea['estado'] == 'pendiente' and app_name in tarea['depende_de']:
+                tarea['estado'] = 'omitido'
+                omitidas.append(otra)
+                omitidas.extend(self._omitir_dependientes(otra))
+        return omitidas
+
+    def listas_para_iniciar(self, en_ejecucion, ahora=None):
+        """Devuelve las apps pendientes que pueden arrancar ya, en orden de prioridad"""
+        ahora = time.monotonic() if ahora is None else ahora
+        seleccion = []
+        for app_name in sorted(self.cola, key=self._clave_orden):
+            tarea = self.tareas[app_name]
+            if tarea['estado'] != 'pendiente' or tarea['no_antes_de'] > ahora:
+                continue
+            if self._puede_iniciar(app_name, list(en_ejecucion) + seleccion):
+                seleccion.append(app_name)
+        return seleccion
+
+    def _espera_reintento(self, reintento):
+        return min(self.espera_base * (2 ** (reintento - 1)), self.espera_maxima)
+
+    def _proximo_diferido(self, ahora=None):
+        """Momento (monotonic) en que vence la próxima app en espera de reintento.
+
+        Las apps cuya espera ya venció no cuentan: si siguen pendientes es por
+        un recurso o por la concurrencia, y eso solo cambia cuando termina otra.
+        """
+        ahora = time.monotonic() if ahora is None else ahora
+        momentos = [tarea['no_antes_de'] for tarea in self.tareas.values()
+                    if tarea['estado'] == 'pendiente' and tarea['no_antes_de'] > ahora]
+        return min(momentos) if momentos else None
+
+    def ejecutar(self, instalar, al_terminar=None, al_reintentar=None):
+        """Ejecuta la cola llamando a `instalar(app_name)` en un pool de hilos.
+
+        `instalar` devuelve True si la instalación fue exitosa o
+        `codigos_salida.REINTENTAR` si el fallo es transitorio; en ese caso la
+        app se difiere (`al_reintentar(app, espera, reintento)`) y se vuelve a
+        lanzar cuando vence la espera. `al_terminar(app, estado)` se invoca al
+        finalizar cada app (incluidas las omitidas). Devuelve {app_name: estado}.
+        """
+        en_ejecucion = {}
+
+        with ThreadPoolExecutor(max_workers=self.maximo_concurrente,
+                                thread_name_prefix='instalacion') as pool:
+            while True:
+                for app_name in self.listas_para_iniciar(en_ejecucion.values()):
+                    self.tareas[app_name]['estado'] = 'ejecutando'
+                    en_ejecucion[pool.submit(instalar, app_name)] = app_name
+
+                ahora = time.monotonic()
+                proximo = self._proximo_diferido(ahora)
+                # Sin reintentos por vencer (None) solo se espera a que termine una instalación
+                espera = max(proximo - ahora, 0) if proximo is not None else None
+                if not en_ejecucion:
+                    if espera is None:
+                        break
+                    # Solo quedan apps diferidas: esperar a que venza la primera
+                    time.sleep(espera)
+                    continue
+
+                terminados, _ = wait(list(en_ejecucion), timeout=espera, return_when=FIRST_COMPLETED)
+                for futuro in terminados:
+                    app_name = en_ejecucion.pop(futuro)
+                    tarea = self.tareas[app_name]
+                    try:
+                        resultado = futuro.result()
+                    except Exception as e:
+                        self.logger.error(f"{app_name}: error no controlado: {e}")
+                        resultado = False
+
+                    if resultado == REINTENTAR and tarea['reintentos'] < self.maximo_reintentos:
+                        tarea['reintentos'] += 1
+                        espera_app = self._espera_reintento(tarea['reintentos'])
+                        tarea['estado'] = 'pendiente'
+                        tarea['no_antes_de'] = time.monotonic() + espera_app
+                        self.logger.info(f"{app_name}: fallo transitorio, reintento "
+                                         f"{tarea['reintentos']}/{self.maximo_reintentos} en {espera_app:.0f}s")
+                        if al_reintentar:
+                            al_reintentar(app_name, espera_app, tarea['reintentos'])
+                        continue
+
+                    exitoso = resultado is True
+                    tarea['estado'] = 'exitoso' if exitoso else 'fallido'
+                    omitidas = [] if exitoso else self._omitir_dependientes(app_name)
+                    if al_terminar:
+                        al_terminar(app_name, self.tareas[app_name]['estado'])
+                        for otra in omitidas:
+                            al_terminar(otra, 'omitido')
+
+        for app_name, tarea in self.tareas.items():
+            if tarea['estado'] == 'pendiente':
+                tarea['estado'] = 'omitido'
+                if al_terminar:
+                    al_terminar(app_name, 'omitido')
+        return {app_name: tarea['estado'] for app_name, tarea in self.tareas.items()}
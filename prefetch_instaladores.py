@@ -0,0 +1,70 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class PrefetchInstaladores:
+    """Copia en segundo plano los próximos instaladores de la cola.
+
+    Mientras se ejecuta la aplicación i, un pool acotado de copiadores prepara
+    las aplicaciones i+1 .. i+profundidad mediante la función `preparar`
+    (normalmente `preparar_instalador_local`).
+    """
+
+    def __init__(self, preparar, cola, profundidad=2, copiadores=2):
+        self.preparar = preparar
+        self.cola = list(cola)  # [(app_name, ruta_origen), ...]
+        self.profundidad = max(0, int(profundidad))
+        self.logger = logging.getLogger(__name__)
+        self._posiciones = {app_name: i for i, (app_name, _) in enumerate(self.cola)}
+        self._futuros = {}
+        self._siguiente = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, int(copiadores)),
+                                            thread_name_prefix='prefetch')
+
+    @classmethod
+    def desde_configuracion(cls, preparar, cola, config):
+        """Crea el pipeline a partir de la sección `prefetch` de config.json"""
+        config = config or {}
+        return cls(preparar, cola,
+                   profundidad=config.get('profundidad', 2),
+                   copiadores=config.get('copiadores', 2))
+
+    def _encolar_hasta(self, limite):
+        """Lanza las copias pendientes hasta la posición `limite` (incluida)"""
+        limite = min(limite, len(self.cola) - 1)
+        while self._siguiente <= limite:
+            app_name, ruta = self.cola[self._siguiente]
+            if app_name not in self._futuros:
+                self.logger.info(f"Prefetch: preparando {app_name}")
+                self._futuros[app_name] = self._executor.submit(self.preparar, ruta)
+            self._siguiente += 1
+
+    def iniciar(self):
+        """Arranca la copia de las primeras aplicaciones de la cola"""
+        with self._lock:
+            self._encolar_hasta(self.profundidad)
+
+    def obtener(self, app_name):
+        """Devuelve la ruta local de `app_name`, esperando si su copia sigue en curso.
+
+        Al consumir una posición se adelanta la ventana de prefetch.
+        """
+        with self._lock:
+            posicion = self._posiciones[app_name]
+            self._encolar_hasta(posicion + self.profundidad)
+            futuro = self._futuros.pop(app_name, None)
+            if futuro is None:
+                # Fuera de orden (o ya consumida): preparar ahora
+                _, ruta = self.cola[posicion]
+                futuro = self._executor.submit(self.preparar, ruta)
+        return futuro.result()
+
+    def cerrar(self):
+        """Cancela las copias que no llegaron a empezar y libera el pool"""
+        with self._lock:
+            for futuro in self._futuros.values():
+                futuro.cancel()
+            self._futuros.clear()
+        self._executor.shutdown(wait=True)
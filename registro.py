@@ -0,0 +1,192 @@
+import os
+import sys
+import copy
+import json
+import queue
+import atexit
+import logging
+import tempfile
+import threading
+import collections
+import logging.handlers
+from datetime import datetime
+
+NIVEL_POR_DEFECTO = 'INFO'
+TAMANO_MAXIMO_MB = 5
+COPIAS = 5
+LINEAS_MEMORIA = 500
+
+# Atributos propios de LogRecord: lo demás son datos añadidos con `extra=`
+_ATRIBUTOS_REGISTRO = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'taskName'}
+
+
+def directorio_registro_por_defecto():
+    """Carpeta de los logs de la aplicación (JSON por líneas, rotativos)"""
+    base = os.environ.get('LOCALAPPDATA') or os.environ.get('TEMP') or tempfile.gettempdir()
+    return os.path.join(base, 'InstaladorMultiApp', 'registro')
+
+
+def _nivel(nombre):
+    nivel = logging.getLevelName(str(nombre).upper())
+    return nivel if isinstance(nivel, int) else logging.INFO
+
+
+class FormatoJSON(logging.Formatter):
+    """Un objeto JSON por registro: ts, nivel, subsistema, hilo, mensaje y los datos de `extra`"""
+
+    def format(self, record):
+        datos = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'nivel': record.levelname,
+            'subsistema': record.name,
+            'hilo': record.threadName,
+            'mensaje': record.getMessage(),
+        }
+        for clave, valor in vars(record).items():
+            if clave not in _ATRIBUTOS_REGISTRO and clave not in datos:
+                datos[clave] = valor
+        if record.exc_info:
+            datos['excepcion'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            datos['excepcion'] = record.exc_text
+        return json.dumps(datos, ensure_ascii=False, default=str)
+
+
+class ManejadorCola(logging.handlers.QueueHandler):
+    """QueueHandler que deja el traceback aparte (en `exc_text`) y no dentro del mensaje.
+
+    El estándar pega el traceback al mensaje: el JSON se quedaría sin
+    `excepcion` y el panel de la interfaz mostraría la pila entera.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            # Como en el estándar, el traceback vivo no viaja por la cola: solo su texto
+            record.exc_text = record.exc_text or logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class AnilloRegistro(logging.Handler):
+    """Últimos registros en memoria (acotados) para el panel de log de la interfaz.
+
+    Cada entrada lleva un número de secuencia creciente: la interfaz pide
+    `desde(ultima)` y recibe solo lo nuevo, aunque el anillo haya descartado
+    entradas antiguas entretanto.
+    """
+
+    def __init__(self, capacidad=LINEAS_MEMORIA, nivel=logging.NOTSET):
+        super().__init__(nivel)
+        self._entradas = collections.deque(maxlen=capacidad)
+        self.secuencia = 0
+
+    def emit(self, record):
+        # Handler.handle ya toma self.lock alrededor de emit
+        self.secuencia += 1
+        self._entradas.append({
+            'secuencia': self.secuencia,
+            'ts': record.created,
+            'nivel': record.levelname,
+            'subsistema': record.name,
+            'mensaje': record.getMessage(),
+        })
+
+    def desde(self, secuencia=0):
+        """Entradas con número de secuencia mayor que `secuencia`"""
+        with self.lock:
+            if not self._entradas or self._entradas[-1]['secuencia'] <= secuencia:
+                return []
+            return [entrada for entrada in self._entradas if entrada['secuencia'] > secuencia]
+
+
+class RegistroAplicacion:
+    """Tubería de logging sin bloqueos para toda la aplicación.
+
+    Los hilos de trabajo solo encolan el registro (QueueHandler); un hilo del
+    QueueListener lo escribe en el archivo JSON rotativo, en el anillo de
+    memoria de la interfaz y, si se pide, en stderr. Los niveles se ajustan
+    por subsistema (nombre del logger, que es el del módulo) desde config.json.
+    """
+
+    def __init__(self, config=None, consola=False):
+        config = config or {}
+        self.directorio = config.get('directorio') or directorio_registro_por_defecto()
+        self.ruta = os.path.join(self.directorio, 'instalador.jsonl')
+        self.anillo = AnilloRegistro(config.get('lineas_memoria', LINEAS_MEMORIA),
+                                     _nivel(config.get('nivel_panel', NIVEL_POR_DEFECTO)))
+        manejadores = [self.anillo]
+        try:
+            os.makedirs(self.directorio, exist_ok=True)
+            archivo = logging.handlers.RotatingFileHandler(
+                self.ruta, maxBytes=int(config.get('tamano_maximo_mb', TAMANO_MAXIMO_MB) * 1024 * 1024),
+                backupCount=config.get('copias', COPIAS), encoding='utf-8', delay=True)
+            archivo.setFormatter(FormatoJSON())
+            manejadores.append(archivo)
+        except OSError as e:
+            self.ruta = None
+            print(f"⚠️ No se pudo abrir el log en {self.directorio}: {e}", file=sys.stderr)
+        if consola:
+            salida = logging.StreamHandler(sys.stderr)
+            salida.setFormatter(logging.Formatter('%(levelname)s: %(message)s'))
+            manejadores.append(salida)
+        self.manejadores = manejadores
+
+        self.cola = queue.SimpleQueue()
+        self.manejador_cola = ManejadorCola(self.cola)
+        self.oyente = logging.handlers.QueueListener(self.cola, *manejadores, respect_handler_level=True)
+        self.nivel = _nivel(config.get('nivel', NIVEL_POR_DEFECTO))
+        self.niveles = {nombre: _nivel(nivel) for nombre, nivel in (config.get('niveles') or {}).items()}
+        self._activo = False
+
+    def iniciar(self):
+        raiz = logging.getLogger()
+        raiz.setLevel(self.nivel)
+        raiz.addHandler(self.manejador_cola)
+        for nombre, nivel in self.niveles.items():
+            logging.getLogger(nombre).setLevel(nivel)
+        self.oyente.start()
+        self._activo = True
+        return self
+
+    def detener(self):
+        """Vacía la cola (escribe lo pendiente) y quita el manejador"""
+        logging.getLogger().removeHandler(self.manejador_cola)
+        for nombre in self.niveles:
+            logging.getLogger(nombre).setLevel(logging.NOTSET)
+        if self._activo:
+            self._activo = False
+            self.oyente.stop()
+        for manejador in self.manejadores:
+            manejador.close()
+
+
+_registro = None
+_lock_registro = threading.Lock()
+
+
+def configurar_registro(config=None, consola=False):
+    """Instala la tubería de logging (sección `registro` de config.json). Se puede llamar de nuevo"""
+    global _registro
+    with _lock_registro:
+        if _registro is None:
+            atexit.register(detener_registro)
+        else:
+            _registro.detener()
+        _registro = RegistroAplicacion(config, consola).iniciar()
+        return _registro
+
+
+def registro_actual():
+    """Tubería instalada, o None si nadie llamó a `configurar_registro`"""
+    return _registro
+
+
+def detener_registro():
+    global _registro
+    with _lock_registro:
+        if _registro is not None:
+            _registro.detener()
+            _registro = None
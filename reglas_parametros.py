@@ -0,0 +1,147 @@
+import os
+import json
+import logging
+from collections import deque
+from functools import lru_cache
+from deteccion_instalador import MSI, DESCONOCIDA
+
+logger = logging.getLogger(__name__)
+
+ARCHIVO_PARAMETROS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'parametros_silenciosos.json')
+PARAMETROS_POR_DEFECTO = ['/VERYSILENT', '/SUPPRESSMSGBOXES', '/NORESTART', '/SP-']
+# Tecnologías cuyos parámetros se pasan a msiexec y no al archivo: una regla
+# por nombre (pensada para el .exe) solo se les aplica si lo declara
+TECNOLOGIAS_PAQUETE = (MSI,)
+
+
+def _regla(valor):
+    """Normaliza una regla: lista de parámetros u objeto {"parametros": [...], "tecnologias": [...]}"""
+    if isinstance(valor, dict):
+        tecnologias = valor.get('tecnologias')
+        return {'parametros': list(valor.get('parametros', [])),
+                'tecnologias': tuple(t.lower() for t in tecnologias) if tecnologias else None}
+    return {'parametros': list(valor), 'tecnologias': None}
+
+
+def regla_aplicable(regla, tecnologia):
+    """True si la regla vale para la tecnología detectada (None: sin analizar)"""
+    if regla['tecnologias'] is not None:
+        return (tecnologia or DESCONOCIDA) in regla['tecnologias']
+    return tecnologia not in TECNOLOGIAS_PAQUETE
+
+
+def cargar_reglas(ruta=ARCHIVO_PARAMETROS, adicional=None):
+    """Carga las reglas del archivo de datos y les aplica las de config.json.
+
+    Devuelve (reglas, por_tecnologia, por_defecto) donde `reglas` es
+    {fragmento: {'parametros', 'tecnologias'}} con los fragmentos en
+    minúsculas. Las entradas de `adicional` añaden o reemplazan a las del archivo.
+    """
+    try:
+        with open(ruta, 'r', encoding='utf-8') as f:
+            datos = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.error(f"No se pudo cargar {ruta}: {e}")
+        datos = {}
+
+    adicional = adicional or {}
+    reglas = {}
+    for origen in (datos.get('reglas', {}), adicional.get('reglas', {})):
+        for fragmento, parametros in origen.items():
+            if fragmento:
+                reglas[fragmento.lower()] = _regla(parametros)
+    por_tecnologia = dict(datos.get('por_tecnologia', {}))
+    por_tecnologia.update(adicional.get('por_tecnologia', {}))
+    por_defecto = adicional.get('por_defecto') or datos.get('por_defecto') or PARAMETROS_POR_DEFECTO
+    return reglas, por_tecnologia, list(por_defecto)
+
+
+class AutomataPatrones:
+    """Autómata de Aho-Corasick: encuentra todos los patrones en una sola pasada del texto"""
+
+    def __init__(self, patrones):
+        self.transiciones = [{}]
+        self.fallo = [0]
+        self.salidas = [[]]
+        for patron in patrones:
+            self._agregar(patron)
+        self._enlazar()
+
+    def _agregar(self, patron):
+        estado = 0
+        for caracter in patron:
+            siguiente = self.transiciones[estado].get(caracter)
+            if siguiente is None:
+                siguiente = len(self.transiciones)
+                self.transiciones[estado][caracter] = siguiente
+                self.transiciones.append({})
+                self.fallo.append(0)
+                self.salidas.append([])
+            estado = siguiente
+        self.salidas[estado].append(patron)
+
+    def _enlazar(self):
+        """Calcula los enlaces de fallo en anchura (BFS) y hereda sus salidas"""
+        pendientes = deque(self.transiciones[0].values())
+        while pendientes:
+            estado = pendientes.popleft()
+            for caracter, siguiente in self.transiciones[estado].items():
+                pendientes.append(siguiente)
+                fallo = self.fallo[estado]
+                while fallo and caracter not in self.transiciones[fallo]:
+                    fallo = self.fallo[fallo]
+                destino = self.transiciones[fallo].get(caracter, 0)
+                self.fallo[siguiente] = destino if destino != siguiente else 0
+                self.salidas[siguiente] = self.salidas[siguiente] + self.salidas[self.fallo[siguiente]]
+
+    def buscar(self, texto):
+        """Devuelve [(posición_inicial, patrón)] de todas las apariciones"""
+        encontrados = []
+        estado = 0
+        for posicion, caracter in enumerate(texto):
+            while estado and caracter not in self.transiciones[estado]:
+                estado = self.fallo[estado]
+            estado = self.transiciones[estado].get(caracter, 0)
+            for patron in self.salidas[estado]:
+                encontrados.append((posicion - len(patron) + 1, patron))
+        return encontrados
+
+    def mas_largo(self, texto, admite=None):
+        """Patrón más largo presente en el texto (a igual longitud, el que aparece antes).
+
+        Con `admite(patron)` solo se consideran los patrones que lo cumplen.
+        """
+        encontrados = self.buscar(texto)
+        if admite is not None:
+            encontrados = [e for e in encontrados if admite(e[1])]
+        if not encontrados:
+            return None
+        return min(encontrados, key=lambda e: (-len(e[1]), e[0]))[1]
+
+
+class ReglasParametros:
+    """Reglas de parámetros silenciosos compiladas una vez en un autómata.
+
+    Si varias reglas coinciden con el nombre del instalador gana la más
+    específica (la más larga), así 'rar' o '7z' no tapan a 'winrar' o '7zip'.
+    Sin regla por nombre se usan los parámetros de la tecnología detectada.
+    Las reglas sin "tecnologias" no se aplican a paquetes MSI: sus parámetros
+    son los del .exe y msiexec los rechazaría. Los resultados se memorizan por
+    nombre de archivo y tecnología.
+    """
+
+    def __init__(self, ruta=ARCHIVO_PARAMETROS, adicional=None):
+        self.reglas, self.por_tecnologia, self.por_defecto = cargar_reglas(ruta, adicional)
+        self.automata = AutomataPatrones(self.reglas)
+        self.parametros_para = lru_cache(maxsize=1024)(self._parametros_para)
+
+    def regla_para(self, nombre_archivo, tecnologia=None):
+        """Fragmento de la regla que se aplica al archivo, o None si usa los parámetros por defecto"""
+        return self.automata.mas_largo(nombre_archivo.lower(),
+                                       lambda fragmento: regla_aplicable(self.reglas[fragmento], tecnologia))
+
+    def _parametros_para(self, nombre_archivo, tecnologia=None):
+        regla = self.regla_para(nombre_archivo, tecnologia)
+        if regla:
+            return tuple(self.reglas[regla]['parametros'])
+        return tuple(self.por_tecnologia.get(tecnologia) or self.por_defecto)
@@ -0,0 +1,175 @@
+import os
+import re
+import time
+import logging
+import tempfile
+import threading
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+TAMANO_MAXIMO_LOG = 5 * 1024 * 1024
+COPIAS_LOG = 3
+LINEAS_RECIENTES = 200
+TAMANO_BLOQUE = 64 * 1024
+LIMITE_LINEA = 16 * 1024
+SEPARADOR_LINEAS = re.compile(rb'\r\n|\r|\n')
+
+
+def directorio_logs_por_defecto():
+    """Carpeta donde se guardan los logs de cada instalación"""
+    base = os.environ.get('LOCALAPPDATA') or os.environ.get('TEMP') or tempfile.gettempdir()
+    return os.path.join(base, 'InstaladorMultiApp', 'logs')
+
+
+def lineas_acotadas(flujo, limite=LIMITE_LINEA, tamano_bloque=TAMANO_BLOQUE):
+    """Parte un flujo binario en líneas de como mucho `limite` bytes.
+
+    Corta en '\\n', '\\r\\n' y también en '\\r' suelto (las barras de progreso
+    reescriben la línea con '\\r' y nunca envían '\\n'). Lee por bloques, así
+    un instalador que no emite saltos de línea no hace crecer la memoria.
+    """
+    leer = getattr(flujo, 'read1', flujo.read)
+    pendiente = b''
+    while True:
+        bloque = leer(tamano_bloque)
+        if not bloque:
+            break
+        pendiente += bloque
+        # Un \r al final puede ser la mitad de un \r\n: se decide con el siguiente bloque
+        retenido = b'\r' if pendiente.endswith(b'\r') else b''
+        partes = SEPARADOR_LINEAS.split(pendiente[:-1] if retenido else pendiente)
+        pendiente = partes.pop() + retenido
+        yield from partes
+        while len(pendiente) > limite:
+            yield pendiente[:limite]
+            pendiente = pendiente[limite:]
+    pendiente = pendiente.rstrip(b'\r')
+    if pendiente:
+        yield pendiente
+
+
+class ArchivoRotativo:
+    """Archivo de log que rota al superar `tamano_maximo` (app.log, app.log.1, ...)"""
+
+    def __init__(self, ruta, tamano_maximo=TAMANO_MAXIMO_LOG, copias=COPIAS_LOG):
+        self.ruta = ruta
+        self.tamano_maximo = tamano_maximo
+        self.copias = copias
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        self._archivo = open(ruta, 'a', encoding='utf-8', errors='replace')
+
+    def _rotar(self):
+        self._archivo.close()
+        for i in range(self.copias - 1, 0, -1):
+            anterior = f"{self.ruta}.{i}"
+            if os.path.exists(anterior):
+                os.replace(anterior, f"{self.ruta}.{i + 1}")
+        os.replace(self.ruta, f"{self.ruta}.1")
+        self._archivo = open(self.ruta, 'a', encoding='utf-8', errors='replace')
+
+    def escribir(self, texto):
+        with self._lock:
+            self._archivo.write(texto)
+            if self._archivo.tell() >= self.tamano_maximo:
+                self._rotar()
+
+    def cerrar(self):
+        with self._lock:
+            self._archivo.close()
+
+
+class SalidaInstalador:
+    """Lee stdout/stderr de un instalador en streaming.
+
+    Cada línea se escribe al momento en un log rotativo por aplicación y se
+    guarda en un buffer circular acotado para mostrarla en la interfaz, así la
+    memoria usada no depende de cuánto escriba el instalador.
+    """
+
+    def __init__(self, app_name, directorio=None, lineas_recientes=LINEAS_RECIENTES,
+                 tamano_maximo=TAMANO_MAXIMO_LOG, codificacion='latin-1'):
+        self.app_name = app_name
+        self.codificacion = codificacion
+        self.recientes = deque(maxlen=lineas_recientes)
+        self.lineas_totales = 0
+        self._lock = threading.Lock()
+        self._hilos = []
+        nombre = re.sub(r'[^\w.-]+', '_', app_name).strip('_') or 'app'
+        self.ruta_log = os.path.join(directorio or directorio_logs_por_defecto(), f"{nombre}.log")
+        self.log = ArchivoRotativo(self.ruta_log, tamano_maximo=tamano_maximo)
+        self.log.escribir(f"\n===== {time.strftime('%Y-%m-%d %H:%M:%S')} · {app_name} =====\n")
+
+    def agregar_linea(self, texto, etiqueta='OUT'):
+        """Registra una línea ya decodificada (p.ej. recibida del broker elevado)"""
+        self.log.escribir(f"[{etiqueta}] {texto}\n")
+        with self._lock:
+            self.recientes.append(f"{etiqueta}: {texto}" if etiqueta == 'ERR' else texto)
+            self.lineas_totales += 1
+
+    def _leer(self, flujo, etiqueta):
+        try:
+            for linea in lineas_acotadas(flujo):
+                self.agregar_linea(linea.decode(self.codificacion, errors='ignore'), etiqueta)
+        except (OSError, ValueError) as e:
+            logger.debug(f"Lectura de salida de {self.app_name} interrumpida: {e}")
+        finally:
+            flujo.close()
+
+    def seguir(self, proceso):
+        """Empieza a leer la salida del proceso (Popen con stdout/stderr=PIPE)"""
+        for flujo, etiqueta in ((proceso.stdout, 'OUT'), (proceso.stderr, 'ERR')):
+            if flujo is None:
+                continue
+            hilo = threading.Thread(target=self._leer, args=(flujo, etiqueta),
+                                    name=f"salida-{self.app_name}-{etiqueta}", daemon=True)
+            hilo.start()
+            self._hilos.append(hilo)
+        return self
+
+    def terminar(self, timeout=5):
+        """Espera a los lectores (brevemente) y cierra el log"""
+        for hilo in self._hilos:
+            hilo.join(timeout)
+        self.log.cerrar()
+
+    def ultimas_lineas(self, cantidad=20):
+        with self._lock:
+            return list(self.recientes)[-cantidad:]
+
+
+class RegistroSalidas:
+    """Salidas de las instalaciones en curso, consultables desde la interfaz"""
+
+    def __init__(self, directorio=None, lineas_recientes=LINEAS_RECIENTES, tamano_maximo=TAMANO_MAXIMO_LOG):
+        self.directorio = directorio or directorio_logs_por_defecto()
+        self.lineas_recientes = lineas_recientes
+        self.tamano_maximo = tamano_maximo
+        self._activas = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def desde_configuracion(cls, config):
+        """Crea el registro a partir de la sección `logs` de config.json"""
+        config = config or {}
+        return cls(directorio=config.get('directorio'),
+                   lineas_recientes=config.get('lineas_recientes', LINEAS_RECIENTES),
+                   tamano_maximo=int(config.get('tamano_maximo_mb', 5)) * 1024 * 1024)
+
+    def nueva(self, app_name, codificacion='latin-1'):
+        salida = SalidaInstalador(app_name, self.directorio, self.lineas_recientes,
+                                  self.tamano_maximo, codificacion)
+        with self._lock:
+            self._activas[app_name] = salida
+        return salida
+
+    def finalizar(self, app_name):
+        with self._lock:
+            self._activas.pop(app_name, None)
+
+    def cola_activa(self, cantidad=20):
+        """Devuelve {app_name: últimas líneas} de las instalaciones en curso"""
+        with self._lock:
+            activas = dict(self._activas)
+        return {app_name: salida.ultimas_lineas(cantidad) for app_name, salida in activas.items()}
@@ -0,0 +1,234 @@
+import os
+import time
+import queue
+import base64
+import atexit
+import logging
+import secrets
+import threading
+import subprocess
+
+logger = logging.getLogger(__name__)
+
+CREATE_NO_WINDOW = getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+
+POWERSHELL = 'powershell'
+SH = 'sh'   # Sustituto en Linux (pruebas y desarrollo)
+
+TIMEOUT_POR_DEFECTO = 30
+TIMEOUT_PING = 10
+
+# Bucle que corre dentro del shell. Protocolo, una petición por línea:
+#   petición:  "<id> <script en base64 UTF-8>"
+#   respuesta: la salida del script y una línea "<<<FIN-<marca> <id> <estado>>>"
+# El estado es $LASTEXITCODE (o 1 si el script lanza una excepción). Los
+# scripts no deben usar `exit`: cerrarían el shell; para devolver un código
+# se asigna $global:LASTEXITCODE.
+BUCLE_POWERSHELL = r"""
+$ErrorActionPreference = 'Continue'
+$ProgressPreference = 'SilentlyContinue'
+[Console]::OutputEncoding = New-Object System.Text.UTF8Encoding $false
+while ($true) {
+    $linea = [Console]::In.ReadLine()
+    if ($linea -eq $null) { break }
+    $partes = $linea.Split(' ', 2)
+    $global:LASTEXITCODE = 0
+    try {
+        $script = [Text.Encoding]::UTF8.GetString([Convert]::FromBase64String($partes[1]))
+        $salida = & ([ScriptBlock]::Create($script)) 2>&1 | Out-String
+        $estado = $global:LASTEXITCODE
+    } catch {
+        $salida = $_ | Out-String
+        $estado = 1
+    }
+    [Console]::Out.Write($salida)
+    [Console]::Out.WriteLine('')
+    [Console]::Out.WriteLine("<<<FIN-__MARCA__ $($partes[0]) $estado>>>")
+    [Console]::Out.Flush()
+}
+"""
+
+# Mismo protocolo con sh; el script lee stdin de /dev/null para no consumir peticiones
+BUCLE_SH = r"""
+while IFS=' ' read -r id datos; do
+    script=$(printf '%s' "$datos" | base64 -d)
+    ( eval "$script" ) </dev/null 2>&1
+    estado=$?
+    printf '\n<<<FIN-__MARCA__ %s %s>>>\n' "$id" "$estado"
+done
+"""
+
+
+def dialecto_por_defecto():
+    return POWERSHELL if os.name == 'nt' else SH
+
+
+class ShellPersistente:
+    """Un único proceso de PowerShell (o sh) que atiende scripts cortos por stdin.
+
+    Arrancar `powershell.exe` cuesta varios segundos en un equipo frío; aquí
+    se paga una vez y cada script posterior es una ida y vuelta por tubería.
+    Si el proceso muere, no responde al ping o un script agota su timeout,
+    se mata y se arranca otro en la siguiente petición.
+    """
+
+    def __init__(self, dialecto=None, comando=None):
+        self.dialecto = dialecto or dialecto_por_defecto()
+        self._comando = comando
+        self._proceso = None
+        self._salida = None           # Cola de líneas de stdout (hilo lector)
+        self._marca = None
+        self._siguiente_id = 0
+        self._lock = threading.Lock()
+        self.reinicios = 0
+
+    def _comando_arranque(self, marca):
+        if self._comando:
+            return self._comando
+        if self.dialecto == POWERSHELL:
+            bucle = BUCLE_POWERSHELL.replace('__MARCA__', marca)
+            codificado = base64.b64encode(bucle.encode('utf-16-le')).decode('ascii')
+            return ['powershell.exe', '-NoProfile', '-NoLogo', '-NonInteractive',
+                    '-ExecutionPolicy', 'Bypass', '-EncodedCommand', codificado]
+        return ['sh', '-c', BUCLE_SH.replace('__MARCA__', marca)]
+
+    # ------------------------------------------------------------------
+    # Ciclo de vida
+    # ------------------------------------------------------------------
+    @property
+    def vivo(self):
+        return self._proceso is not None and self._proceso.poll() is None
+
+    def _arrancar(self):
+        if self._marca is not None:
+            self.reinicios += 1
+        self._marca = secrets.token_hex(8)
+        self._proceso = subprocess.Popen(
+            self._comando_arranque(self._marca),
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            encoding='utf-8', errors='replace', bufsize=1,
+            creationflags=CREATE_NO_WINDOW
+        )
+        self._salida = queue.Queue()
+        threading.Thread(target=self._leer, args=(self._proceso, self._salida), daemon=True).start()
+        logger.debug(f"Shell persistente ({self.dialecto}) iniciado, PID {self._proceso.pid}")
+
+    @staticmethod
+    def _leer(proceso, cola):
+        # En Windows no se puede usar select() sobre tuberías: un hilo lee y reparte
+        for linea in proceso.stdout:
+            cola.put(linea)
+        cola.put(None)
+
+    def _detener(self, forzar=False):
+        proceso, self._proceso = self._proceso, None
+        if proceso is None:
+            return
+        try:
+            proceso.stdin.close()
+        except OSError:
+            pass
+        try:
+            proceso.wait(timeout=0 if forzar else 2)
+        except subprocess.TimeoutExpired:
+            proceso.kill()
+            proceso.wait()
+
+    def iniciar(self):
+        """Arranca el shell si no está corriendo (se puede llamar en segundo plano para adelantarlo)"""
+        with self._lock:
+            if not self.vivo:
+                self._arrancar()
+        return self
+
+    def iniciar_en_segundo_plano(self):
+        threading.Thread(target=self.iniciar, daemon=True).start()
+        return self
+
+    def reiniciar(self):
+        with self._lock:
+            self._detener(forzar=True)
+            self._arrancar()
+
+    def cerrar(self):
+        with self._lock:
+            self._detener()
+
+    # ------------------------------------------------------------------
+    # Peticiones
+    # ------------------------------------------------------------------
+    def _enviar(self, script, timeout):
+        self._siguiente_id += 1
+        id_peticion = str(self._siguiente_id)
+        datos = base64.b64encode(script.encode('utf-8')).decode('ascii')
+        self._proceso.stdin.write(f"{id_peticion} {datos}\n")
+        self._proceso.stdin.flush()
+
+        fin = f"<<<FIN-{self._marca} {id_peticion} "
+        limite = time.monotonic() + timeout
+        lineas = []
+        while True:
+            restante = limite - time.monotonic()
+            if restante <= 0:
+                raise subprocess.TimeoutExpired(script, timeout)
+            try:
+                linea = self._salida.get(timeout=restante)
+            except queue.Empty:
+                raise subprocess.TimeoutExpired(script, timeout)
+            if linea is None:
+                raise BrokenPipeError("El shell persistente terminó durante el script")
+            if linea.startswith(fin):
+                estado = linea[len(fin):].strip().rstrip('>')
+                # El salto de línea antes de la marca lo añade el protocolo
+                salida = ''.join(lineas)
+                if salida.endswith('\n'):
+                    salida = salida[:-1]
+                return int(estado) if estado.lstrip('-').isdigit() else 1, salida
+            lineas.append(linea)
+
+    def ejecutar(self, script, timeout=TIMEOUT_POR_DEFECTO):
+        """Ejecuta `script` en el shell. Devuelve {'codigo', 'salida', 'duracion'}.
+
+        Ante un timeout mata el shell (el script puede seguir colgado) y relanza
+        `subprocess.TimeoutExpired`; si el shell había muerto lo reinicia y
+        reintenta una vez.
+        """
+        inicio = time.monotonic()
+        with self._lock:
+            for _ in range(2):
+                if not self.vivo:
+                    self._detener(forzar=True)
+                    self._arrancar()
+                try:
+                    codigo, salida = self._enviar(script, timeout)
+                    return {'codigo': codigo, 'salida': salida, 'duracion': time.monotonic() - inicio}
+                except subprocess.TimeoutExpired:
+                    logger.warning(f"Shell persistente sin respuesta en {timeout}s: se reiniciará")
+                    self._detener(forzar=True)
+                    raise
+                except (BrokenPipeError, OSError) as e:
+                    logger.warning(f"Shell persistente caído ({e}); reintentando con uno nuevo")
+                    self._detener(forzar=True)
+            raise BrokenPipeError("El shell persistente no responde")
+
+    def ping(self, timeout=TIMEOUT_PING):
+        """Comprobación de salud: True si el shell responde a un script trivial"""
+        script = "Write-Output 'pong'" if self.dialecto == POWERSHELL else "echo pong"
+        try:
+            return self.ejecutar(script, timeout=timeout)['salida'].strip() == 'pong'
+        except (subprocess.TimeoutExpired, OSError):
+            return False
+
+
+_shell = None
+_lock_shell = threading.Lock()
+
+
+def shell_compartido():
+    """Shell persistente de la aplicación (se cierra al salir)"""
+    global _shell
+    with _lock_shell:
+        if _shell is None:
+            _shell = ShellPersistente()
+            atexit.register(_shell.cerrar)
+        return _shell
@@ -0,0 +1,226 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import fnmatch
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from copia_archivos import copiar_archivo, formatear_bytes
+
+logger = logging.getLogger(__name__)
+
+ARCHIVO_MANIFIESTO = '.instalador_manifiesto.json'
+TOLERANCIA_MTIME = 2.0  # FAT/SMB redondean el mtime a 2 segundos
+TRABAJADORES_POR_DEFECTO = 8
+
+
+def cargar_manifiesto(destino):
+    """Carga el manifiesto de la última sincronización de `destino` (o uno vacío)"""
+    try:
+        with open(os.path.join(destino, ARCHIVO_MANIFIESTO), 'r', encoding='utf-8') as f:
+            return json.load(f).get('archivos', {})
+    except (OSError, ValueError):
+        return {}
+
+
+def guardar_manifiesto(destino, archivos):
+    ruta = os.path.join(destino, ARCHIVO_MANIFIESTO)
+    temporal = ruta + '.tmp'
+    with open(temporal, 'w', encoding='utf-8') as f:
+        json.dump({'generado': time.time(), 'archivos': archivos}, f, indent=1, ensure_ascii=False)
+    os.replace(temporal, ruta)
+
+
+def coincide_patrones(relativa, incluir=None, excluir=None):
+    """Indica si la ruta relativa (con '/') pasa los filtros glob de inclusión/exclusión.
+
+    Cada patrón se compara con la ruta relativa completa y con el nombre del archivo.
+    """
+    nombre = relativa.rsplit('/', 1)[-1]
+
+    def coincide(patron):
+        return fnmatch.fnmatch(relativa, patron) or fnmatch.fnmatch(nombre, patron)
+
+    if incluir and not any(coincide(p) for p in incluir):
+        return False
+    if excluir and any(coincide(p) for p in excluir):
+        return False
+    return True
+
+
+def _hash_archivo(ruta, tamano_bloque=1024 * 1024):
+    sha = hashlib.sha256()
+    with open(ruta, 'rb') as f:
+        for bloque in iter(lambda: f.read(tamano_bloque), b''):
+            sha.update(bloque)
+    return sha.hexdigest()
+
+
+def _recorrer(base, incluir=None, excluir=None):
+    """Devuelve ({ruta_relativa: stat}, [directorios]) de `base`, aplicando los filtros a los archivos"""
+    archivos = {}
+    directorios = []
+    pendientes = ['']
+    while pendientes:
+        relativa_dir = pendientes.pop()
+        with os.scandir(os.path.join(base, relativa_dir) if relativa_dir else base) as entradas:
+            for entrada in entradas:
+                relativa = f"{relativa_dir}/{entrada.name}" if relativa_dir else entrada.name
+                if entrada.is_dir(follow_symlinks=False):
+                    pendientes.append(relativa)
+                    directorios.append(relativa)
+                elif relativa != ARCHIVO_MANIFIESTO and coincide_patrones(relativa, incluir, excluir):
+                    archivos[relativa] = entrada.stat()
+    return archivos, directorios
+
+
+def _sin_cambios(stat_origen, ruta_destino, entrada_manifiesto, verificar_hash):
+    """Decide si el archivo destino ya corresponde a la versión actual del origen"""
+    try:
+        stat_destino = os.stat(ruta_destino)
+    except OSError:
+        return False
+    if stat_destino.st_size != stat_origen.st_size:
+        return False
+    if abs(stat_destino.st_mtime - stat_origen.st_mtime) > TOLERANCIA_MTIME:
+        return False
+    if entrada_manifiesto:
+        if (entrada_manifiesto.get('tamano') != stat_origen.st_size
+                or abs(entrada_manifiesto.get('mtime', 0) - stat_origen.st_mtime) > TOLERANCIA_MTIME):
+            return False
+        if verificar_hash and entrada_manifiesto.get('hash'):
+            # Solo se lee la copia local: detecta archivos dañados o modificados en destino
+            return _hash_archivo(ruta_destino) == entrada_manifiesto['hash']
+    return True
+
+
+def planificar_sincronizacion(origen, destino, incluir=None, excluir=None, verificar_hash=False,
+                              forzar=False):
+    """Compara origen y destino y devuelve qué hay que copiar y qué sobra.
+
+    El resultado es un dict con `copiar` y `sin_cambios` (rutas relativas),
+    `huerfanos` (archivos del destino que ya no existen en el origen),
+    `directorios` (del origen, en orden padre -> hijo), `origen`
+    ({relativa: stat}) y `manifiesto` (el anterior). Con `forzar` se copian
+    todos los archivos aunque no hayan cambiado.
+    """
+    manifiesto = cargar_manifiesto(destino)
+    archivos_origen, directorios = _recorrer(origen, incluir, excluir)
+
+    copiar, sin_cambios = [], []
+    for relativa, stat in archivos_origen.items():
+        ruta_destino = os.path.join(destino, *relativa.split('/'))
+        if not forzar and _sin_cambios(stat, ruta_destino, manifiesto.get(relativa), verificar_hash):
+            sin_cambios.append(relativa)
+        else:
+            copiar.append(relativa)
+
+    huerfanos = []
+    if os.path.isdir(destino):
+        huerfanos = sorted(set(_recorrer(destino, incluir, excluir)[0]) - set(archivos_origen))
+
+    return {
+        'copiar': sorted(copiar),
+        'sin_cambios': sin_cambios,
+        'huerfanos': huerfanos,
+        'directorios': sorted(directorios),
+        'origen': archivos_origen,
+        'manifiesto': manifiesto,
+    }
+
+
+def copiar_en_paralelo(origen, destino, relativas, stats_origen, trabajadores=TRABAJADORES_POR_DEFECTO):
+    """Copia la lista de archivos relativos con un pool de hilos.
+
+    En SMB el coste de cada archivo pequeño es sobre todo latencia, así que
+    solapar aperturas y transferencias acelera mucho los árboles grandes. Los
+    directorios deben existir de antemano. Devuelve (hashes, errores, bytes)
+    donde `hashes` es {relativa: sha256} y `errores` {relativa: mensaje}.
+    """
+    hashes, errores = {}, {}
+    bytes_copiados = [0]
+    lock = threading.Lock()
+
+    def copiar(relativa):
+        ruta_origen = os.path.join(origen, *relativa.split('/'))
+        ruta_destino = os.path.join(destino, *relativa.split('/'))
+        try:
+            hash_contenido = copiar_archivo(ruta_origen, ruta_destino, reanudar=False)
+        except Exception as e:
+            with lock:
+                errores[relativa] = str(e)
+            logger.error(f"Error copiando {relativa}: {e}")
+            return
+        with lock:
+            hashes[relativa] = hash_contenido
+            bytes_copiados[0] += stats_origen[relativa].st_size
+
+    if trabajadores <= 1 or len(relativas) <= 1:
+        for relativa in relativas:
+            copiar(relativa)
+    else:
+        with ThreadPoolExecutor(max_workers=trabajadores, thread_name_prefix='copia') as pool:
+            list(pool.map(copiar, relativas))
+    return hashes, errores, bytes_copiados[0]
+
+
+def sincronizar_arbol(origen, destino, incluir=None, excluir=None,
+                      eliminar_huerfanos=False, verificar_hash=False, forzar=False,
+                      trabajadores=TRABAJADORES_POR_DEFECTO):
+    """Sincroniza incrementalmente `origen` en `destino` usando el manifiesto guardado.
+
+    Solo copia archivos nuevos o modificados (todos con `forzar`), en paralelo
+    con `trabajadores` hilos; opcionalmente elimina los que ya no existen en el
+    origen. Devuelve un dict con contadores, velocidad y errores por archivo.
+    """
+    origen, destino = str(origen), str(destino)
+    inicio = time.monotonic()
+    plan = planificar_sincronizacion(origen, destino, incluir, excluir, verificar_hash, forzar)
+    manifiesto = {rel: plan['manifiesto'][rel] for rel in plan['sin_cambios'] if rel in plan['manifiesto']}
+    for relativa in plan['sin_cambios']:
+        if relativa not in manifiesto:
+            stat = plan['origen'][relativa]
+            manifiesto[relativa] = {'tamano': stat.st_size, 'mtime': stat.st_mtime}
+
+    resultado = {
+        'copiados': 0,
+        'sin_cambios': len(plan['sin_cambios']),
+        'eliminados': 0,
+        'bytes': 0,
+        'errores': {},
+    }
+
+    os.makedirs(destino, exist_ok=True)
+    for relativa in plan['directorios']:
+        os.makedirs(os.path.join(destino, *relativa.split('/')), exist_ok=True)
+
+    inicio_copia = time.monotonic()
+    hashes, errores, bytes_copiados = copiar_en_paralelo(
+        origen, destino, plan['copiar'], plan['origen'], trabajadores)
+    duracion_copia = time.monotonic() - inicio_copia
+    for relativa, hash_contenido in hashes.items():
+        stat = plan['origen'][relativa]
+        manifiesto[relativa] = {'tamano': stat.st_size, 'mtime': stat.st_mtime, 'hash': hash_contenido}
+    resultado['copiados'] = len(hashes)
+    resultado['bytes'] = bytes_copiados
+    resultado['errores'].update(errores)
+    resultado['archivos_por_segundo'] = len(hashes) / duracion_copia if duracion_copia > 0 else 0.0
+    resultado['bytes_por_segundo'] = bytes_copiados / duracion_copia if duracion_copia > 0 else 0.0
+
+    if eliminar_huerfanos:
+        for relativa in plan['huerfanos']:
+            try:
+                os.remove(os.path.join(destino, *relativa.split('/')))
+                resultado['eliminados'] += 1
+            except OSError as e:
+                resultado['errores'][relativa] = str(e)
+                logger.error(f"Error eliminando {relativa}: {e}")
+
+    guardar_manifiesto(destino, manifiesto)
+    resultado['duracion'] = time.monotonic() - inicio
+    logger.info(f"Sincronizado {origen} -> {destino}: {resultado['copiados']} copiados, "
+                f"{resultado['sin_cambios']} sin cambios, {resultado['eliminados']} eliminados "
+                f"en {resultado['duracion']:.1f}s ({resultado['archivos_por_segundo']:.0f} archivos/s, "
+                f"{formatear_bytes(resultado['bytes_por_segundo'])}/s, {trabajadores} hilos)")
+    return resultado
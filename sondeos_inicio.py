@@ -0,0 +1,243 @@
+import os
+import json
+import time
+import ctypes
+import socket
+import getpass
+import logging
+import tempfile
+import threading
+import subprocess
+from concurrent.futures import Future
+from trazas import tramo, trazador
+
+logger = logging.getLogger(__name__)
+
+SERVIDOR_POR_DEFECTO = '10.99.8.108'
+RECURSO_POR_DEFECTO = '\\\\10.99.8.108\\aplicaciones'
+TTL_POR_DEFECTO = 600        # Segundos que se reutilizan los resultados entre arranques
+TIMEOUT_POR_DEFECTO = 8      # Segundos máximos por sondeo
+
+CREATE_NO_WINDOW = getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+
+
+def ruta_cache_por_defecto():
+    """Archivo donde se guardan los últimos resultados de los sondeos"""
+    base = os.environ.get('LOCALAPPDATA') or os.environ.get('TEMP') or tempfile.gettempdir()
+    return os.path.join(base, 'InstaladorMultiApp', 'sondeos_inicio.json')
+
+
+def _en_segundo_plano(funcion):
+    """Ejecuta `funcion` en un hilo daemon y devuelve un Future con su resultado.
+
+    Se usan hilos daemon (y no un ThreadPoolExecutor) para que un acceso a la
+    red que se quede colgado nunca impida cerrar la aplicación.
+    """
+    futuro = Future()
+
+    def correr():
+        if not futuro.set_running_or_notify_cancel():
+            return
+        try:
+            futuro.set_result(funcion())
+        except BaseException as e:
+            futuro.set_exception(e)
+
+    threading.Thread(target=correr, daemon=True).start()
+    return futuro
+
+
+def _salida_comando(comando, timeout):
+    proceso = subprocess.run(comando, capture_output=True, text=True, timeout=timeout,
+                             creationflags=CREATE_NO_WINDOW)
+    return (proceso.stdout or '') + (proceso.stderr or '')
+
+
+class SondeosInicio:
+    """Comprobaciones del equipo que decide el diálogo de autenticación.
+
+    Antes se lanzaban una tras otra (`cmdkey`, PowerShell `Test-Path`,
+    `whoami` hasta tres veces, `net localgroup`); ahora se lanzan a la vez,
+    cada una con su timeout, `whoami` se calcula una sola vez y el resultado
+    se guarda en disco durante `ttl` segundos para los siguientes arranques.
+    """
+
+    def __init__(self, servidor=SERVIDOR_POR_DEFECTO, recurso=RECURSO_POR_DEFECTO,
+                 ttl=TTL_POR_DEFECTO, timeout=TIMEOUT_POR_DEFECTO, ruta_cache=None):
+        self.servidor = servidor
+        self.recurso = recurso
+        self.ttl = ttl
+        self.timeout = timeout
+        self.ruta_cache = ruta_cache or ruta_cache_por_defecto()
+        self.tiempos = {}          # {sondeo: segundos}
+        self.desde_cache = False
+        self._resultados = None
+        self._futuros = {}
+        self._admin_proceso = False
+        self._inicio = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def desde_configuracion(cls, config):
+        """Crea los sondeos a partir de la sección `autenticacion` de config.json"""
+        config = config or {}
+        return cls(servidor=config.get('servidor') or SERVIDOR_POR_DEFECTO,
+                   recurso=config.get('recurso') or RECURSO_POR_DEFECTO,
+                   ttl=config.get('ttl_sondeos', TTL_POR_DEFECTO),
+                   timeout=config.get('timeout_sondeo', TIMEOUT_POR_DEFECTO),
+                   ruta_cache=config.get('cache_sondeos'))
+
+    @property
+    def clave(self):
+        # Los resultados dependen del equipo, del usuario y del recurso compartido
+        return f"{socket.gethostname()}|{getpass.getuser()}|{self.recurso}".lower()
+
+    # ------------------------------------------------------------------
+    # Caché entre arranques
+    # ------------------------------------------------------------------
+    def _leer_cache(self):
+        if not self.ttl:
+            return None
+        try:
+            with open(self.ruta_cache, 'r', encoding='utf-8') as f:
+                datos = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if datos.get('clave') != self.clave or time.time() - datos.get('momento', 0) > self.ttl:
+            return None
+        return datos.get('resultados')
+
+    def _guardar_cache(self, resultados):
+        if not self.ttl:
+            return
+        temporal = self.ruta_cache + '.tmp'
+        try:
+            os.makedirs(os.path.dirname(self.ruta_cache), exist_ok=True)
+            with open(temporal, 'w', encoding='utf-8') as f:
+                json.dump({'clave': self.clave, 'momento': time.time(), 'resultados': resultados}, f)
+            os.replace(temporal, self.ruta_cache)
+        except OSError as e:
+            logger.warning(f"No se pudo guardar {self.ruta_cache}: {e}")
+
+    # ------------------------------------------------------------------
+    # Sondeos
+    # ------------------------------------------------------------------
+    def _medir(self, nombre, funcion):
+        def medida():
+            inicio = time.perf_counter()
+            try:
+                with tramo(f"sondeo_{nombre}", 'autenticacion'):
+                    return funcion()
+            finally:
+                with self._lock:
+                    self.tiempos[nombre] = time.perf_counter() - inicio
+        return medida
+
+    def _sondear_credencial(self):
+        """Texto de `cmdkey /list` (credenciales guardadas en el Administrador de credenciales)"""
+        return _salida_comando(['cmdkey', '/list'], self.timeout)
+
+    def _sondear_recurso(self):
+        """Accesibilidad del recurso compartido con la sesión actual (equivale a Test-Path)"""
+        return os.path.isdir(self.recurso)
+
+    def _sondear_whoami(self):
+        try:
+            who = _salida_comando(['whoami'], self.timeout).strip()
+            if who:
+                return who
+        except (OSError, subprocess.SubprocessError):
+            pass
+        return f"{socket.gethostname()}\\{getpass.getuser()}"
+
+    def _sondear_grupo_administradores(self):
+        """Texto de `net localgroup Administrators`"""
+        return _salida_comando(['net', 'localgroup', 'Administrators'], self.timeout)
+
+    @staticmethod
+    def _es_administrador_proceso():
+        try:
+            return bool(ctypes.windll.shell32.IsUserAnAdmin())
+        except Exception:
+            return False
+
+    def iniciar(self):
+        """Lanza los sondeos en segundo plano (no bloquea). Se puede llamar varias veces"""
+        if self._inicio is not None:
+            return self
+        self._inicio = time.perf_counter()
+        self._resultados = self._leer_cache()
+        if self._resultados is not None:
+            self.desde_cache = True
+            self.tiempos['cache'] = time.perf_counter() - self._inicio
+            trazador.instante('sondeos_desde_cache', 'autenticacion')
+            return self
+
+        # IsUserAnAdmin es una llamada en proceso: si ya es administrador no hace falta `net localgroup`
+        self._admin_proceso = self._es_administrador_proceso()
+        sondeos = {
+            'cmdkey': self._sondear_credencial,
+            'recurso': self._sondear_recurso,
+            'whoami': self._sondear_whoami,
+        }
+        if not self._admin_proceso:
+            sondeos['net_localgroup'] = self._sondear_grupo_administradores
+        self._futuros = {nombre: _en_segundo_plano(self._medir(nombre, funcion))
+                         for nombre, funcion in sondeos.items()}
+        return self
+
+    def _resultado(self, nombre, por_defecto):
+        futuro = self._futuros.get(nombre)
+        if futuro is None:
+            return por_defecto
+        restante = max(self.timeout - (time.perf_counter() - self._inicio), 0)
+        try:
+            return futuro.result(timeout=restante)
+        except Exception as e:
+            # Timeout o error del sondeo: se toma el valor conservador
+            logger.warning(f"Sondeo '{nombre}' sin resultado: {e!r}")
+            with self._lock:
+                self.tiempos.setdefault(nombre, time.perf_counter() - self._inicio)
+            return por_defecto
+
+    def resultados(self):
+        """Espera a los sondeos y devuelve {'credencial_dominio', 'administrador_local', 'whoami'}"""
+        self.iniciar()
+        if self._resultados is not None:
+            return self._resultados
+
+        with tramo('esperar_sondeos', 'autenticacion'):
+            salida_cmdkey = self._resultado('cmdkey', '').lower()
+            recurso_accesible = self._resultado('recurso', False)
+            whoami = self._resultado('whoami', f"{socket.gethostname()}\\{getpass.getuser()}")
+
+        # La política requiere una credencial del dominio ua\ (o del servidor) que dé acceso al share
+        tiene_credencial = 'ua\\' in salida_cmdkey or self.servidor in salida_cmdkey \
+            or self.recurso.lower() in salida_cmdkey
+        credencial_dominio = bool(tiene_credencial and recurso_accesible)
+
+        administrador = self._admin_proceso
+        if not administrador:
+            miembros = self._resultado('net_localgroup', '').lower()
+            cuenta = whoami.split('\\', 1)[1] if '\\' in whoami else whoami
+            administrador = bool(miembros) and (cuenta.lower() in miembros or whoami.lower() in miembros)
+
+        self.tiempos['total'] = time.perf_counter() - self._inicio
+        self._resultados = {
+            'credencial_dominio': credencial_dominio,
+            'administrador_local': administrador,
+            'whoami': whoami,
+        }
+        # Los sondeos que no terminaron no se guardan: el siguiente arranque los repite
+        if all(futuro.done() and not futuro.exception() for futuro in self._futuros.values()):
+            self._guardar_cache(self._resultados)
+        return self._resultados
+
+    def resumen_tiempos(self):
+        """Texto con lo que tardó cada sondeo, p.ej. 'sondeos 0.41s (cmdkey 0.05s, recurso 0.40s)'"""
+        if self.desde_cache:
+            return f"sondeos desde caché ({self.tiempos.get('cache', 0) * 1000:.0f} ms)"
+        with self._lock:
+            detalle = ', '.join(f"{nombre} {segundos:.2f}s" for nombre, segundos in self.tiempos.items()
+                                if nombre != 'total')
+        return f"sondeos {self.tiempos.get('total', 0):.2f}s ({detalle})"
@@ -4,6 +4,8 @@ import subprocess
 import logging
 import json
 from pathlib import Path
+from sincronizacion import sincronizar_arbol, TRABAJADORES_POR_DEFECTO
+from trazas import tramo, trazado
 
 class InstalacionesEspeciales:
     def __init__(self, auth_manager):
@@ -45,6 +47,7 @@ class InstalacionesEspeciales:
         # Si no es una instalación especial, retornar None para usar el flujo normal
         return None
     
+    @trazado('especial', 'instalacion_especial')
     def ejecutar_instalacion_configurada(self, app_name, config):
         """Ejecuta una instalación basada en la configuración"""
         try:
@@ -74,7 +77,7 @@ class InstalacionesEspeciales:
             if tipo == "copia_carpetas":
                 resultado = self.copiar_carpetas_especificas(origen_base, destino_base, config)
             elif tipo == "copia_contenido":
-                resultado = self.copiar_contenido_completo(origen_base, destino_base)
+                resultado = self.copiar_contenido_completo(origen_base, destino_base, config)
             else:
                 resultado = {
                     'exitoso': False,
@@ -96,6 +99,7 @@ class InstalacionesEspeciales:
                 'tipo': 'especial'
             }
     
+    @trazado('especial')
     def copiar_carpetas_especificas(self, origen_base, destino_base, config):
         """Copia solo las carpetas especificadas en la configuración"""
         try:
@@ -114,7 +118,7 @@ class InstalacionesEspeciales:
                 
                 if origen_carpeta.exists():
                     self.logger.info(f"Copiando {carpeta}...")
-                    self.copiar_carpeta(origen_carpeta, destino_carpeta)
+                    self.copiar_carpeta(origen_carpeta, destino_carpeta, config)
                 else:
                     self.logger.warning(f"No se encontró: {origen_carpeta}")
             
@@ -128,7 +132,31 @@ class InstalacionesEspeciales:
             self.logger.error(f"Error copiando carpetas específicas: {str(e)}")
             raise
     
-    def copiar_contenido_completo(self, origen_base, destino_base):
+    def es_modo_incremental(self, config):
+        """Indica si la instalación usa sincronización incremental (por defecto) o copia completa"""
+        return (config or {}).get("modo_copia", "incremental") == "incremental"
+
+    def sincronizar(self, origen, destino, config, forzar=False):
+        """Sincroniza origen -> destino copiando solo lo nuevo o modificado (todo con `forzar`)"""
+        config = config or {}
+        with tramo('sincronizar', 'especial', origen=str(origen), forzar=forzar) as tramo_sincronizacion:
+            resultado = sincronizar_arbol(
+                origen, destino,
+                incluir=config.get("incluir"),
+                excluir=config.get("excluir"),
+                eliminar_huerfanos=config.get("eliminar_huerfanos", False),
+                verificar_hash=config.get("verificar_hash", False),
+                forzar=forzar,
+                trabajadores=config.get("trabajadores_copia", TRABAJADORES_POR_DEFECTO)
+            )
+            tramo_sincronizacion.anotar(copiados=resultado['copiados'], sin_cambios=resultado['sin_cambios'])
+        if resultado['errores']:
+            raise Exception(f"{len(resultado['errores'])} archivo(s) no se pudieron sincronizar: "
+                            f"{', '.join(list(resultado['errores'])[:5])}")
+        return resultado
+
+    @trazado('especial')
+    def copiar_contenido_completo(self, origen_base, destino_base, config=None):
         """Copia todo el contenido de la carpeta origen, SOBREESCRIBIENDO siempre"""
         try:
             self.logger.info(f"Copiando contenido completo de {origen_base}...")
@@ -140,27 +168,27 @@ class InstalacionesEspeciales:
                     'mensaje': 'La carpeta de origen está vacía',
                     'tipo': 'especial'
                 }
+
+            if self.es_modo_incremental(config):
+                resultado = self.sincronizar(origen_base, destino_base, config)
+                return {
+                    'exitoso': True,
+                    'mensaje': (f"Instalación completada - {resultado['copiados']} archivos actualizados, "
+                                f"{resultado['sin_cambios']} sin cambios, {resultado['eliminados']} eliminados"),
+                    'tipo': 'especial'
+                }
             
             # Copiar todos los archivos y subcarpetas SOBREESCRIBIENDO
-            items_copiados = 0
             for item in origen_base.iterdir():
                 destino_item = destino_base / item.name
-                
-                if item.is_dir():
-                    # Para carpetas: eliminar si existe y copiar nueva
-                    if destino_item.exists():
-                        shutil.rmtree(destino_item)
-                    shutil.copytree(item, destino_item)
-                    items_copiados += 1
-                else:
-                    # Para archivos: siempre copiar (sobreescribe)
-                    shutil.copy2(item, destino_item)
-                    items_copiados += 1
-                self.logger.info(f"✓ {'Sobreescrito' if destino_item.exists() else 'Copiado'}: {item.name}")
+                # Para carpetas: eliminar si existe (los archivos se sobreescriben)
+                if item.is_dir() and destino_item.exists():
+                    shutil.rmtree(destino_item)
+            resultado = self.sincronizar(origen_base, destino_base, config, forzar=True)
             
             return {
                 'exitoso': True,
-                'mensaje': f'Instalación completada - {items_copiados} elementos copiados/sobreescritos',
+                'mensaje': f"Instalación completada - {resultado['copiados']} archivos copiados/sobreescritos",
                 'tipo': 'especial'
             }
             
@@ -175,7 +203,8 @@ class InstalacionesEspeciales:
             if archivo_completo.exists():
                 try:
                     self.logger.info(f"Ejecutando: {archivo_completo}")
-                    subprocess.run([str(archivo_completo)], check=True, timeout=300)
+                    with tramo('ejecutar_archivo', 'especial', archivo=archivo_relativo):
+                        subprocess.run([str(archivo_completo)], check=True, timeout=300)
                     self.logger.info(f"✓ Ejecutado: {archivo_completo}")
                 except subprocess.TimeoutExpired:
                     self.logger.warning(f"Timeout en: {archivo_completo}")
@@ -184,12 +213,16 @@ class InstalacionesEspeciales:
             else:
                 self.logger.warning(f"Archivo no encontrado: {archivo_completo}")
     
-    def copiar_carpeta(self, origen, destino):
+    def copiar_carpeta(self, origen, destino, config=None):
         """Copia una carpeta completa manteniendo estructura"""
         try:
+            if self.es_modo_incremental(config):
+                self.sincronizar(origen, destino, config)
+                self.logger.info(f"✓ Carpeta sincronizada: {origen.name}")
+                return
             if destino.exists():
                 shutil.rmtree(destino)
-            shutil.copytree(origen, destino)
+            self.sincronizar(origen, destino, config, forzar=True)
             self.logger.info(f"✓ Carpeta copiada: {origen.name}")
         except Exception as e:
             self.logger.error(f"Error copiando {origen}: {str(e)}")
@@ -0,0 +1,381 @@
+import os
+import time
+import signal
+import ctypes
+import logging
+import subprocess
+
+logger = logging.getLogger(__name__)
+
+INTERVALO = 1.0              # Segundos entre muestras del árbol
+PRIMER_PASO = 0.05           # Primera muestra; el intervalo se dobla hasta INTERVALO
+INACTIVIDAD = 180            # Sin CPU ni disco durante este tiempo: la instalación parece atascada
+ESPERA_RESIDUALES = 30       # Raíz terminada y el resto inactivo este tiempo: se da por acabada
+TIMEOUT_POR_DEFECTO = 600
+CREATE_SUSPENDED = 0x00000004
+
+
+class InstalacionInactiva(subprocess.TimeoutExpired):
+    """El árbol del instalador dejó de consumir CPU y disco y se detuvo antes del timeout"""
+
+    def __init__(self, cmd, timeout, inactividad):
+        super().__init__(cmd, timeout)
+        self.inactividad = inactividad
+
+    def __str__(self):
+        return f"Comando '{self.cmd}' sin actividad durante {self.inactividad:.0f}s"
+
+
+def opciones_popen(**kwargs):
+    """Argumentos de Popen (los dados más los de supervisión) para que el árbol se pueda seguir.
+
+    En POSIX el instalador abre una sesión (y grupo de procesos) propia; en
+    Windows se crea suspendido y `ArbolProcesos.crear` lo reanuda después de
+    asignarlo al Job Object, así ningún hijo nace fuera del job.
+    """
+    if os.name == 'nt':
+        kwargs['creationflags'] = kwargs.get('creationflags', 0) | CREATE_SUSPENDED
+    else:
+        kwargs['start_new_session'] = True
+    return kwargs
+
+
+class ArbolProcesos:
+    """Un instalador y todos los procesos que lanza.
+
+    `esperar` no da la instalación por terminada cuando sale el proceso raíz
+    (los metainstaladores como el de Chrome delegan en hijos que siguen
+    trabajando) sino cuando ya no queda ningún descendiente activo. Ante el
+    timeout mata el árbol entero. Con `inactividad`, avisa (o detiene) si el
+    árbol deja de consumir CPU y disco.
+    """
+
+    def __init__(self, proceso, intervalo=INTERVALO, espera_residuales=ESPERA_RESIDUALES):
+        self.proceso = proceso
+        self.intervalo = intervalo
+        self.espera_residuales = espera_residuales
+        self.residuales = 0     # Procesos que quedaron vivos (e inactivos) al terminar
+
+    @classmethod
+    def crear(cls, proceso, **kwargs):
+        """Árbol adecuado a la plataforma; si no se puede seguir, solo el proceso raíz.
+
+        En Windows el proceso debe venir de Popen con `opciones_popen` (suspendido):
+        se reanuda aquí, ya dentro del job o, si no se pudo crear, sin él.
+        """
+        arbol = None
+        try:
+            if os.name == 'nt':
+                arbol = ArbolJobWindows(proceso, **kwargs)
+            elif os.path.isdir('/proc'):
+                arbol = ArbolSesionPosix(proceso, **kwargs)
+        except OSError as e:
+            logger.warning(f"No se puede supervisar el árbol de procesos de {proceso.pid}: {e}")
+        finally:
+            if os.name == 'nt':
+                try:
+                    reanudar(proceso)
+                except OSError:
+                    proceso.kill()
+                    raise
+        return arbol or cls(proceso, **kwargs)
+
+    # Lo que cada plataforma implementa
+    def muestra(self):
+        """(descendientes vivos sin contar la raíz, medida acumulada de CPU y disco del árbol).
+
+        Si la medida no cambia entre dos muestras, nadie en el árbol trabaja.
+        """
+        return 0, None
+
+    def _matar(self):
+        self.proceso.kill()
+
+    def cerrar(self):
+        pass
+
+    def terminar(self):
+        """Mata el proceso raíz y todos sus descendientes"""
+        try:
+            self._matar()
+        except OSError as e:
+            logger.warning(f"No se pudo terminar el árbol de {self.proceso.pid}: {e}")
+        try:
+            self.proceso.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            pass
+
+    def esperar(self, timeout=None, inactividad=None, terminar_inactivos=False, al_inactivo=None):
+        """Espera al árbol completo y devuelve el código de salida del proceso raíz.
+
+        Lanza `InstalacionInactiva` si `terminar_inactivos` y el árbol pasa
+        `inactividad` segundos sin consumo, y `subprocess.TimeoutExpired` al
+        agotar `timeout`; en ambos casos el árbol ya está muerto.
+        `al_inactivo(segundos)` se llama una vez por racha de inactividad.
+        """
+        inicio = time.monotonic()
+        limite = inicio + timeout if timeout else None
+        ultimo_consumo, ultimo_cambio, avisado = None, inicio, False
+        codigo = None
+        # Las primeras muestras van seguidas para ver a los hijos que el instalador lanza (y
+        # separa con setsid) nada más arrancar, antes de que termine y se pierda su rastro
+        paso = min(PRIMER_PASO, self.intervalo)
+        while True:
+            espera = paso if limite is None else min(paso, max(limite - time.monotonic(), 0.01))
+            paso = min(paso * 2, self.intervalo)
+            if codigo is None:
+                # Mientras la raíz vive basta con esperarla: el árbol se mira una vez por intervalo
+                try:
+                    codigo = self.proceso.wait(timeout=espera)
+                except subprocess.TimeoutExpired:
+                    pass
+            else:
+                time.sleep(espera)  # Solo quedan descendientes
+            activos, consumo = self.muestra()
+            if codigo is not None and not activos:
+                return codigo
+            ahora = time.monotonic()
+            if consumo is None or consumo != ultimo_consumo:
+                ultimo_consumo, ultimo_cambio, avisado = consumo, ahora, False
+            quieto = ahora - ultimo_cambio
+            if codigo is not None and quieto >= self.espera_residuales:
+                # La raíz terminó y lo que queda no trabaja (p.ej. la app que el instalador abrió al acabar)
+                self.residuales = activos
+                logger.info(f"Proceso {self.proceso.pid} terminado; {activos} proceso(s) residual(es) "
+                            f"inactivo(s) se dejan en marcha")
+                return codigo
+            if inactividad and codigo is None and not avisado and quieto >= inactividad:
+                avisado = True
+                if al_inactivo:
+                    al_inactivo(quieto)
+                if terminar_inactivos:
+                    self.terminar()
+                    raise InstalacionInactiva(self.proceso.args, timeout, quieto)
+            if limite is not None and ahora >= limite:
+                self.terminar()
+                raise subprocess.TimeoutExpired(self.proceso.args, timeout)
+
+
+class ArbolSesionPosix(ArbolProcesos):
+    """Árbol en POSIX: la sesión propia del instalador más los descendientes por ppid (vía /proc).
+
+    Los descendientes que salen de la sesión (setsid) se recuerdan por PID y
+    momento de arranque: si el PID se reutiliza, el proceso nuevo no cuenta
+    como del árbol ni recibe señales.
+    """
+
+    def __init__(self, proceso, **kwargs):
+        super().__init__(proceso, **kwargs)
+        self.sesion = os.getsid(proceso.pid)
+        self.conocidos = {proceso.pid: self._stat(proceso.pid)['inicio']}   # {pid: arranque}
+
+    @staticmethod
+    def _stat(pid):
+        with open(f"/proc/{pid}/stat", 'rb') as f:
+            datos = f.read()
+        # El nombre (campo 2) puede llevar espacios y paréntesis: se parte por el último ')'
+        campos = datos[datos.rindex(b')') + 2:].split()
+        return {'estado': campos[0], 'ppid': int(campos[1]), 'sesion': int(campos[3]),
+                'cpu': int(campos[11]) + int(campos[12]), 'inicio': int(campos[19])}
+
+    @staticmethod
+    def _io(pid):
+        try:
+            with open(f"/proc/{pid}/io", 'rb') as f:
+                valores = dict(linea.split(b': ') for linea in f.read().splitlines())
+            return int(valores.get(b'rchar', 0)) + int(valores.get(b'wchar', 0))
+        except (OSError, ValueError):
+            return 0
+
+    def _miembros(self):
+        """{pid: stat} de los procesos vivos del árbol (sin zombis)"""
+        procesos = {}
+        for nombre in os.listdir('/proc'):
+            if nombre.isdigit():
+                try:
+                    procesos[int(nombre)] = self._stat(nombre)
+                except (OSError, ValueError, IndexError):
+                    pass  # Terminó mientras se leía
+        miembros = {pid: stat for pid, stat in procesos.items()
+                    if stat['sesion'] == self.sesion or self.conocidos.get(pid) == stat['inicio']}
+        # Descendientes que abrieron su propia sesión (setsid): se siguen por ppid
+        pendientes = list(miembros)
+        while pendientes:
+            padre = pendientes.pop()
+            for pid, stat in procesos.items():
+                if stat['ppid'] == padre and pid not in miembros:
+                    miembros[pid] = stat
+                    pendientes.append(pid)
+        # Solo se recuerdan los que siguen vivos: un PID que desaparece no se vuelve a tocar
+        self.conocidos = {pid: stat['inicio'] for pid, stat in miembros.items()}
+        return {pid: stat for pid, stat in miembros.items() if stat['estado'] != b'Z'}
+
+    def muestra(self):
+        miembros = self._miembros()
+        return (sum(1 for pid in miembros if pid != self.proceso.pid),
+                (sum(stat['cpu'] for stat in miembros.values()), sum(self._io(pid) for pid in miembros)))
+
+    def _matar(self):
+        # El grupo del instalador (mismo número que su sesión) de una vez; después, los
+        # miembros que cambiaron de grupo o de sesión, uno a uno y comprobando que son los mismos
+        try:
+            os.killpg(self.sesion, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+        for pid, stat in self._miembros().items():
+            self._senal(pid, stat['inicio'])
+
+    def _senal(self, pid, inicio):
+        """SIGKILL a `pid` solo si sigue siendo el proceso que arrancó en `inicio`"""
+        try:
+            if hasattr(os, 'pidfd_open'):
+                # El pidfd fija el proceso: comprobado el arranque, el PID ya no puede cambiar de dueño
+                fd = os.pidfd_open(pid)
+                try:
+                    if self._stat(pid)['inicio'] == inicio:
+                        signal.pidfd_send_signal(fd, signal.SIGKILL)
+                finally:
+                    os.close(fd)
+            elif self._stat(pid)['inicio'] == inicio:
+                os.kill(pid, signal.SIGKILL)
+        except (OSError, ValueError, IndexError):
+            pass  # Ya terminó o no es nuestro
+
+
+# Job Objects de Windows (ctypes)
+class _CONTABILIDAD_BASICA(ctypes.Structure):
+    _fields_ = [('TotalUserTime', ctypes.c_int64), ('TotalKernelTime', ctypes.c_int64),
+                ('ThisPeriodTotalUserTime', ctypes.c_int64), ('ThisPeriodTotalKernelTime', ctypes.c_int64),
+                ('TotalPageFaultCount', ctypes.c_uint32), ('TotalProcesses', ctypes.c_uint32),
+                ('ActiveProcesses', ctypes.c_uint32), ('TotalTerminatedProcesses', ctypes.c_uint32)]
+
+
+class _CONTADORES_IO(ctypes.Structure):
+    _fields_ = [('ReadOperationCount', ctypes.c_uint64), ('WriteOperationCount', ctypes.c_uint64),
+                ('OtherOperationCount', ctypes.c_uint64), ('ReadTransferCount', ctypes.c_uint64),
+                ('WriteTransferCount', ctypes.c_uint64), ('OtherTransferCount', ctypes.c_uint64)]
+
+
+class _CONTABILIDAD_BASICA_E_IO(ctypes.Structure):
+    _fields_ = [('BasicInfo', _CONTABILIDAD_BASICA), ('IoInfo', _CONTADORES_IO)]
+
+
+JobObjectBasicAndIoAccountingInformation = 8
+PROCESS_SET_QUOTA = 0x0100
+PROCESS_TERMINATE = 0x0001
+PROCESS_SUSPEND_RESUME = 0x0800
+
+
+def reanudar(proceso):
+    """Reanuda un proceso creado con CREATE_SUSPENDED (todos sus hilos)"""
+    kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    kernel32.OpenProcess.restype = ctypes.c_void_p
+    manejador = kernel32.OpenProcess(PROCESS_SUSPEND_RESUME, False, proceso.pid)
+    if not manejador:
+        raise ctypes.WinError(ctypes.get_last_error())
+    try:
+        estado = ctypes.WinDLL('ntdll').NtResumeProcess(ctypes.c_void_p(manejador))
+        if estado:
+            raise OSError(f"NtResumeProcess devolvió 0x{estado & 0xFFFFFFFF:08X}")
+    finally:
+        kernel32.CloseHandle(ctypes.c_void_p(manejador))
+
+
+class ArbolJobWindows(ArbolProcesos):
+    """Árbol en Windows: el instalador se asigna a un Job Object y sus hijos heredan el job.
+
+    El proceso llega suspendido (`opciones_popen`) y no se reanuda hasta estar
+    en el job, así que ningún hijo puede nacer fuera.
+    """
+
+    def __init__(self, proceso, **kwargs):
+        super().__init__(proceso, **kwargs)
+        kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+        kernel32.CreateJobObjectW.restype = ctypes.c_void_p
+        kernel32.OpenProcess.restype = ctypes.c_void_p
+        for funcion in ('AssignProcessToJobObject', 'QueryInformationJobObject', 'TerminateJobObject',
+                        'CloseHandle'):
+            getattr(kernel32, funcion).argtypes = None
+        self._kernel32 = kernel32
+        self.job = kernel32.CreateJobObjectW(None, None)
+        if not self.job:
+            raise ctypes.WinError(ctypes.get_last_error())
+        manejador = kernel32.OpenProcess(PROCESS_SET_QUOTA | PROCESS_TERMINATE, False, proceso.pid)
+        try:
+            if not manejador or not kernel32.AssignProcessToJobObject(ctypes.c_void_p(self.job),
+                                                                      ctypes.c_void_p(manejador)):
+                error = ctypes.WinError(ctypes.get_last_error())
+                kernel32.CloseHandle(ctypes.c_void_p(self.job))
+                raise error
+        finally:
+            if manejador:
+                kernel32.CloseHandle(ctypes.c_void_p(manejador))
+
+    def _contabilidad(self):
+        info = _CONTABILIDAD_BASICA_E_IO()
+        if not self._kernel32.QueryInformationJobObject(ctypes.c_void_p(self.job),
+                                                        JobObjectBasicAndIoAccountingInformation,
+                                                        ctypes.byref(info), ctypes.sizeof(info), None):
+            raise ctypes.WinError(ctypes.get_last_error())
+        return info
+
+    def muestra(self):
+        info = self._contabilidad()
+        activos = max(info.BasicInfo.ActiveProcesses - (1 if self.proceso.poll() is None else 0), 0)
+        return activos, (info.BasicInfo.TotalUserTime + info.BasicInfo.TotalKernelTime,
+                         info.IoInfo.ReadTransferCount + info.IoInfo.WriteTransferCount)
+
+    def _matar(self):
+        if not self._kernel32.TerminateJobObject(ctypes.c_void_p(self.job), 1):
+            raise ctypes.WinError(ctypes.get_last_error())
+
+    def cerrar(self):
+        # Sin KILL_ON_JOB_CLOSE: cerrar el job no mata lo que el instalador dejó abierto a propósito
+        if self.job:
+            self._kernel32.CloseHandle(ctypes.c_void_p(self.job))
+            self.job = None
+
+
+def percentil(valores, p):
+    """Percentil `p` (0-100) por rango más cercano"""
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, max(int(-(-p * len(ordenados) // 100)) - 1, 0))]
+
+
+class PoliticaTimeouts:
+    """Timeout por app a partir del p95 de sus ejecuciones exitosas en el historial.
+
+    timeout = p95 * factor + margen, acotado a [minimo, maximo]. Sin
+    suficientes muestras se usa el timeout por defecto de la app.
+    """
+
+    def __init__(self, historial, factor=2.0, margen=60, minimo=120, maximo=3600, muestras=20, minimo_muestras=3):
+        self.historial = historial
+        self.factor = factor
+        self.margen = margen
+        self.minimo = minimo
+        self.maximo = maximo
+        self.muestras = muestras
+        self.minimo_muestras = minimo_muestras
+
+    @classmethod
+    def desde_configuracion(cls, historial, config):
+        """Crea la política a partir de la sección `supervision` de config.json"""
+        config = config or {}
+        return cls(historial,
+                   factor=config.get('factor_p95', 2.0),
+                   margen=config.get('margen_timeout', 60),
+                   minimo=config.get('timeout_minimo', 120),
+                   maximo=config.get('timeout_maximo', 3600),
+                   muestras=config.get('muestras', 20),
+                   minimo_muestras=config.get('minimo_muestras', 3))
+
+    def timeout_para(self, app_name, por_defecto=TIMEOUT_POR_DEFECTO):
+        """Devuelve {'timeout', 'p95', 'muestras'} (p95 None si no hay historial suficiente)"""
+        intentos = [i for i in self.historial.intentos(app_name, limite=self.muestras * 3)
+                    if i['estado'] == 'exitoso' and i['duracion_ejecucion']][:self.muestras]
+        if len(intentos) < self.minimo_muestras:
+            return {'timeout': por_defecto, 'p95': None, 'muestras': len(intentos)}
+        p95 = percentil([i['duracion_ejecucion'] for i in intentos], 95)
+        timeout = min(max(p95 * self.factor + self.margen, self.minimo), self.maximo)
+        return {'timeout': timeout, 'p95': p95, 'muestras': len(intentos)}
@@ -0,0 +1,91 @@
+import os
+import sys
+import json
+import time
+import socket
+import threading
+import unittest
+import subprocess
+
+from broker_elevado import ClienteBroker, VARIABLE_TOKEN, lanzador_usuario_actual
+
+PYTHON = sys.executable
+
+
+class PruebasBroker(unittest.TestCase):
+
+    def setUp(self):
+        self.cliente = None
+
+    def tearDown(self):
+        if self.cliente is not None:
+            self.cliente.cerrar()
+
+    def test_ida_y_vuelta(self):
+        lanzados = []
+
+        def lanzador(comando, entorno):
+            lanzados.append((comando, entorno))
+            return lanzador_usuario_actual(comando, entorno)
+
+        self.cliente = ClienteBroker(lanzador, timeout_conexion=20).iniciar()
+        self.assertTrue(self.cliente.ping())
+        lineas = []
+        codigo = self.cliente.ejecutar(
+            [PYTHON, '-c', "import sys; print('uno'); print('dos', file=sys.stderr); sys.exit(4)"], 30,
+            al_recibir_linea=lambda texto, etiqueta: lineas.append((etiqueta, texto)))
+        self.assertEqual(codigo, 4)
+        self.assertEqual(sorted(lineas), [('ERR', 'dos'), ('OUT', 'uno')])
+
+        # El token va en el entorno, nunca en la línea de comandos
+        comando, entorno = lanzados[0]
+        token = entorno[VARIABLE_TOKEN]
+        self.assertNotIn(token, ' '.join(comando))
+        if os.path.exists(f"/proc/{self.cliente.pid}/cmdline"):
+            with open(f"/proc/{self.cliente.pid}/cmdline", 'rb') as f:
+                self.assertNotIn(token.encode(), f.read())
+
+    def test_token_incorrecto_se_rechaza(self):
+        rechazos = []
+        hilos = []
+
+        def esperar_rechazo(conexion):
+            with conexion:
+                conexion.settimeout(10)
+                rechazos.append(conexion.recv(1) == b'')
+
+        def lanzador(comando, entorno):
+            # Otro proceso se adelanta con un token falso; después arranca el broker de verdad
+            puerto = int(comando[-1].rsplit(':', 1)[1])
+            conexion = socket.create_connection(('127.0.0.1', puerto))
+            conexion.sendall(json.dumps({'tipo': 'hola', 'token': 'falso', 'pid': 0}).encode() + b'\n')
+            hilos.append(threading.Thread(target=esperar_rechazo, args=(conexion,)))
+            hilos[-1].start()
+            return lanzador_usuario_actual(comando, entorno)
+
+        self.cliente = ClienteBroker(lanzador, timeout_conexion=20).iniciar()
+        hilos[0].join()
+        self.assertEqual(rechazos, [True])
+        self.assertEqual(self.cliente.ejecutar([PYTHON, '-c', 'pass'], 30), 0)
+
+    def test_sin_token_valido_no_conecta(self):
+        def lanzador(comando, entorno):
+            return lanzador_usuario_actual(comando, {VARIABLE_TOKEN: 'otro'})
+
+        inicio = time.monotonic()
+        with self.assertRaises(ConnectionError):
+            ClienteBroker(lanzador, timeout_conexion=1.5).iniciar()
+        self.assertLess(time.monotonic() - inicio, 10)
+
+    def test_timeout(self):
+        self.cliente = ClienteBroker(timeout_conexion=20).iniciar()
+        inicio = time.monotonic()
+        with self.assertRaises(subprocess.TimeoutExpired):
+            self.cliente.ejecutar([PYTHON, '-c', 'import time; time.sleep(30)'], 1)
+        self.assertLess(time.monotonic() - inicio, 10)
+        # El broker sigue atendiendo después del timeout
+        self.assertEqual(self.cliente.ejecutar([PYTHON, '-c', 'pass'], 30), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import os
+import json
+import struct
+import tempfile
+import unittest
+from unittest import mock
+
+import deteccion_instalador
+from deteccion_instalador import (DetectorInstaladores, analizar_instalador, FIRMA_OLE, MSI, NSIS, INNO,
+                                  WIX_BURN, DESCONOCIDA)
+
+
+def crear_pe(ruta, secciones=('.text',), cuerpo=b'', overlay=b''):
+    """PE mínimo: cabecera DOS, cabecera COFF sin cabecera opcional y una tabla de secciones"""
+    inicio_pe = 0x40
+    inicio_datos = inicio_pe + 24 + 40 * len(secciones)
+    cuerpo = cuerpo or b'\0' * 16
+    dos = b'MZ' + b'\0' * 0x3A + struct.pack('<I', inicio_pe)
+    coff = b'PE\0\0' + struct.pack('<HHIIIHH', 0x14C, len(secciones), 0, 0, 0, 0, 0)
+    tabla = b''.join(nombre.encode('ascii').ljust(8, b'\0') + struct.pack('<IIII', 0, 0, len(cuerpo), inicio_datos)
+                     + b'\0' * 16 for nombre in secciones)
+    with open(ruta, 'wb') as f:
+        f.write(dos + coff + tabla + cuerpo + overlay)
+    return ruta
+
+
+class PruebasDeteccion(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directorio.cleanup()
+
+    def ruta(self, nombre):
+        return os.path.join(self.directorio.name, nombre)
+
+    def test_tecnologias(self):
+        with open(self.ruta('paquete.msi'), 'wb') as f:
+            f.write(FIRMA_OLE + b'\0' * 512)
+        casos = {
+            self.ruta('paquete.msi'): MSI,
+            crear_pe(self.ruta('nsis.exe'), overlay=b'\xef\xbe\xad\xdeNullsoftInst' + b'\0' * 64): NSIS,
+            crear_pe(self.ruta('inno.exe'), cuerpo='Inno Setup Setup Data'.encode('utf-16-le')): INNO,
+            crear_pe(self.ruta('burn.exe'), secciones=('.text', '.wixburn')): WIX_BURN,
+            crear_pe(self.ruta('otro.exe')): DESCONOCIDA,
+        }
+        with open(self.ruta('texto.exe'), 'wb') as f:
+            f.write(b'#!/bin/sh\nexit 0\n')
+        casos[self.ruta('texto.exe')] = DESCONOCIDA
+        for ruta, tecnologia in casos.items():
+            self.assertEqual(analizar_instalador(ruta)['tecnologia'], tecnologia, os.path.basename(ruta))
+
+    def test_veredicto_por_hash(self):
+        cache = self.ruta('cache')
+        original = crear_pe(self.ruta('setup.exe'), overlay=b'NullsoftInst')
+        copia = crear_pe(self.ruta('setup_renombrado.exe'), overlay=b'NullsoftInst')
+        with mock.patch.object(deteccion_instalador, 'analizar_instalador',
+                               wraps=analizar_instalador) as analizar:
+            detector = DetectorInstaladores(cache)
+            self.assertEqual(detector.detectar(original)['tecnologia'], NSIS)
+            # Mismo contenido con otro nombre: no se vuelve a analizar
+            self.assertEqual(detector.detectar(copia)['tecnologia'], NSIS)
+            # El veredicto sobrevive a la sesión
+            self.assertEqual(DetectorInstaladores(cache).detectar(original)['tecnologia'], NSIS)
+            self.assertEqual(analizar.call_count, 1)
+
+            # Contenido nuevo (otro hash): se analiza de nuevo
+            crear_pe(original, overlay=b'Inno Setup Messages')
+            os.utime(original, (1, 1))
+            self.assertEqual(detector.detectar(original)['tecnologia'], INNO)
+            self.assertEqual(analizar.call_count, 2)
+
+    def test_otra_version_de_deteccion_descarta_veredictos(self):
+        cache = self.ruta('cache')
+        ruta = crear_pe(self.ruta('setup.exe'), overlay=b'NullsoftInst')
+        detector = DetectorInstaladores(cache)
+        detector.detectar(ruta)
+        with open(detector.ruta, 'r', encoding='utf-8') as f:
+            datos = json.load(f)
+        self.assertEqual(len(datos['veredictos']), 1)
+        datos['version'] -= 1
+        with open(detector.ruta, 'w', encoding='utf-8') as f:
+            json.dump(datos, f)
+        self.assertEqual(DetectorInstaladores(cache).veredictos, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+
+from estimacion import EstimadorDuraciones, ProgresoPonderado, DURACION_POR_DEFECTO
+
+MB = 1024 * 1024
+
+
+class HistorialFijo:
+    """Historial en memoria con la forma de HistorialInstalaciones.intentos"""
+
+    def __init__(self, intentos):
+        self._intentos = intentos
+
+    def intentos(self, app_name, limite=None):
+        return [i for i in self._intentos if i['app'] == app_name][:limite]
+
+
+def intento(app, duracion, copia=0.0, tamano=0, estado='exitoso'):
+    return {'app': app, 'estado': estado, 'duracion_total': duracion,
+            'duracion_copia': copia, 'bytes_instalador': tamano}
+
+
+class PruebasEstimacion(unittest.TestCase):
+
+    def setUp(self):
+        self.historial = HistorialFijo([
+            intento('Office', 100, copia=50, tamano=500 * MB),
+            intento('Office', 120, copia=50, tamano=500 * MB),
+            intento('Office', 900, estado='fallido'),
+            intento('Local', 20, tamano=10 * MB),
+        ])
+
+    def test_previsiones(self):
+        previsiones = EstimadorDuraciones(self.historial).previsiones(['Office', 'Local', 'Nueva'])
+        self.assertEqual(previsiones['Office'], {'duracion': 110, 'copia': 50, 'bytes': 500 * MB, 'muestras': 2})
+        # Sin historial: la mediana del resto
+        self.assertEqual(previsiones['Nueva']['duracion'], 65)
+        self.assertEqual(EstimadorDuraciones(HistorialFijo([])).previsiones(['Nueva'])['Nueva']['duracion'],
+                         DURACION_POR_DEFECTO)
+
+    def test_copia_pendiente_se_pondera_con_la_velocidad_actual(self):
+        cola = ['Office', 'Local']
+        previsiones = EstimadorDuraciones(self.historial).previsiones(cola)
+        progreso = ProgresoPonderado(cola, previsiones, {'Office': r'\\srv\office.exe', 'Local': r'C:\local.exe'})
+        self.assertAlmostEqual(progreso.instantanea()['eta'], 130)
+
+        # La red va a 1 MB/s: copiar los 500 MB de Office llevará 500 s y no los 50 de la mediana
+        progreso.actualizar_copia(r'\\srv\otro.exe', 1 * MB, 10 * MB, 1 * MB)
+        self.assertAlmostEqual(progreso._duracion_prevista('Office'), 60 + 500)
+        self.assertAlmostEqual(progreso._parte_copia('Office'), 500 / 560)
+        # La app local no se copia: su tamaño no cuenta
+        self.assertEqual(progreso._duracion_prevista('Local'), 20)
+        self.assertAlmostEqual(progreso.instantanea()['eta'], 580)
+
+        # A mitad de la copia va por la mitad de su parte de copia
+        progreso.actualizar_copia(r'\\srv\office.exe', 250 * MB, 500 * MB, 1 * MB)
+        self.assertAlmostEqual(progreso.instantanea()['fraccion'], 250 / 580)
+        # Al terminar la copia se conserva la última velocidad vista
+        progreso.actualizar_copia(r'\\srv\office.exe', 500 * MB, 500 * MB, 1 * MB)
+        self.assertEqual(progreso.instantanea()['bytes_por_segundo'], 0.0)
+        self.assertEqual(progreso.velocidad_copia, 1 * MB)
+
+
+if __name__ == '__main__':
+    unittest.main()
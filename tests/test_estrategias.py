@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+
+from estrategias import TablaEstrategias, USUARIO_ACTUAL, CREDENCIALES_ADMIN
+
+POR_DEFECTO = [USUARIO_ACTUAL, CREDENCIALES_ADMIN]
+
+
+class PruebasTablaEstrategias(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.tabla = TablaEstrategias(self.directorio.name)
+
+    def tearDown(self):
+        self.directorio.cleanup()
+
+    def test_aprende_la_estrategia_que_funciono(self):
+        self.assertEqual(self.tabla.orden_para('Chrome', 'h1'), POR_DEFECTO)
+        # El usuario actual falla y las credenciales funcionan: la próxima vez se empieza por ellas
+        self.tabla.registrar('Chrome', 'h1', USUARIO_ACTUAL, False)
+        self.tabla.registrar('Chrome', 'h1', CREDENCIALES_ADMIN, True)
+        self.assertEqual(self.tabla.orden_para('Chrome', 'h1'), [CREDENCIALES_ADMIN, USUARIO_ACTUAL])
+        # Sobrevive a la sesión
+        self.assertEqual(TablaEstrategias(self.directorio.name).orden_para('Chrome', 'h1'),
+                         [CREDENCIALES_ADMIN, USUARIO_ACTUAL])
+
+    def test_si_la_aprendida_falla_se_vuelve_a_la_otra(self):
+        self.tabla.registrar('Chrome', 'h1', CREDENCIALES_ADMIN, True)
+        self.tabla.registrar('Chrome', 'h1', CREDENCIALES_ADMIN, False)
+        self.assertEqual(self.tabla.orden_para('Chrome', 'h1'), POR_DEFECTO)
+        self.tabla.registrar('Chrome', 'h1', USUARIO_ACTUAL, True)
+        self.assertEqual(self.tabla.orden_para('Chrome', 'h1')[0], USUARIO_ACTUAL)
+        # Un fallo de otra estrategia no borra la aprendida
+        self.tabla.registrar('Chrome', 'h1', CREDENCIALES_ADMIN, False)
+        self.assertEqual(self.tabla.orden_para('Chrome', 'h1')[0], USUARIO_ACTUAL)
+        entrada, = self.tabla.entradas()
+        self.assertEqual(entrada['exitos'], {CREDENCIALES_ADMIN: 1, USUARIO_ACTUAL: 1})
+        self.assertEqual(entrada['fallos'], {CREDENCIALES_ADMIN: 2})
+
+    def test_instalador_nuevo_empieza_por_defecto(self):
+        self.tabla.registrar('Chrome', 'h1', CREDENCIALES_ADMIN, True)
+        self.assertEqual(self.tabla.orden_para('Chrome', 'h2'), POR_DEFECTO)
+        self.assertEqual(self.tabla.orden_para('Firefox', 'h1'), POR_DEFECTO)
+
+    def test_reiniciar(self):
+        self.tabla.registrar('Chrome', 'h1', CREDENCIALES_ADMIN, True)
+        self.tabla.registrar('Chrome', 'h2', CREDENCIALES_ADMIN, True)
+        self.tabla.registrar('Zoom', 'h3', CREDENCIALES_ADMIN, True)
+        self.assertEqual([entrada['app'] for entrada in self.tabla.entradas()], ['Chrome', 'Chrome', 'Zoom'])
+
+        self.assertEqual(self.tabla.reiniciar('Chrome'), 2)
+        self.assertEqual(self.tabla.orden_para('Chrome', 'h1'), POR_DEFECTO)
+        self.assertEqual(self.tabla.orden_para('Zoom', 'h3')[0], CREDENCIALES_ADMIN)
+        self.assertEqual(self.tabla.reiniciar(), 1)
+        self.assertEqual(TablaEstrategias(self.directorio.name).entradas(), [])
+        self.assertTrue(os.path.exists(self.tabla.ruta))
+
+
+if __name__ == '__main__':
+    unittest.main()
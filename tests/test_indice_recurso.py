@@ -0,0 +1,106 @@
+import os
+import tempfile
+import unittest
+
+from indice_recurso import IndiceRecurso, nombre_aplicacion
+
+
+class PruebasIndiceRecurso(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.raiz = os.path.join(self.directorio.name, 'aplicaciones')
+        self.ruta_indice = os.path.join(self.directorio.name, 'indice.json')
+        self.crear('Chrome/ChromeSetup.exe', b'chrome')
+        self.crear('Polichequeos/instalador/polichequeos_setup.exe', b'poli')
+        self.crear('Polichequeos/ultima_version/notas.txt', b'no es instalador')
+        self.crear('7z2301-x64.msi', b'7zip')
+
+    def tearDown(self):
+        self.directorio.cleanup()
+
+    def crear(self, relativo, contenido):
+        ruta = os.path.join(self.raiz, *relativo.split('/'))
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        with open(ruta, 'wb') as f:
+            f.write(contenido)
+        return ruta
+
+    def marcar_cambio(self, relativo):
+        # El mtime del directorio puede no avanzar dentro de la misma resolución del sistema de archivos
+        ruta = os.path.join(self.raiz, *relativo.split('/')) if relativo else self.raiz
+        mtime = os.stat(ruta).st_mtime + 10
+        os.utime(ruta, (mtime, mtime))
+
+    def indice(self):
+        return IndiceRecurso([self.raiz], ruta_indice=self.ruta_indice)
+
+    def test_escaneo_y_resolucion(self):
+        indice = self.indice()
+        estadisticas = indice.escanear()
+        self.assertEqual(estadisticas['archivos'], 3)
+        self.assertEqual(estadisticas['directorios_listados'], 5)
+        self.assertEqual(indice.resolver('chromesetup.EXE'),
+                         os.path.join(self.raiz, 'Chrome', 'ChromeSetup.exe'))
+        # El nombre se toma de una ruta UNC aunque no exista en este equipo
+        self.assertEqual(indice.resolver('\\\\10.99.8.108\\d\\polichequeos_setup.exe'),
+                         os.path.join(self.raiz, 'Polichequeos', 'instalador', 'polichequeos_setup.exe'))
+        self.assertIsNone(indice.resolver('notas.txt'))
+        self.assertEqual(len(indice.informacion('7z2301-x64.msi')['hash']), 64)
+
+    def test_reescaneo_incremental_omite_directorios_sin_cambios(self):
+        self.indice().escanear()
+        indice = self.indice()
+        # Sin cambios: ningún directorio se vuelve a listar y ningún archivo se analiza
+        estadisticas = indice.escanear()
+        self.assertEqual(estadisticas['directorios_listados'], 0)
+        self.assertEqual(estadisticas['directorios_sin_cambios'], 5)
+        self.assertEqual(estadisticas['archivos_analizados'], 0)
+
+        # Un alta en una carpeta: solo esa se lista y solo el archivo nuevo se analiza
+        self.crear('Polichequeos/instalador/polichequeos_v2.exe', b'poli2')
+        self.marcar_cambio('Polichequeos/instalador')
+        estadisticas = indice.escanear()
+        self.assertEqual(estadisticas['directorios_listados'], 1)
+        self.assertEqual(estadisticas['archivos_analizados'], 1)
+        self.assertIsNotNone(indice.resolver('polichequeos_v2.exe'))
+
+        # Una baja desaparece del índice
+        os.remove(os.path.join(self.raiz, 'Chrome', 'ChromeSetup.exe'))
+        self.marcar_cambio('Chrome')
+        indice.escanear()
+        self.assertIsNone(indice.resolver('ChromeSetup.exe'))
+
+        # Completo: se listan todos aunque no hayan cambiado
+        self.assertEqual(indice.escanear(completo=True)['directorios_listados'], 5)
+
+    def test_indice_persistente(self):
+        self.indice().escanear()
+        self.assertIsNotNone(self.indice().resolver('ChromeSetup.exe'))
+
+    def test_generar_aplicaciones_conserva_y_combina(self):
+        indice = self.indice()
+        indice.escanear()
+        existentes = {
+            'Google Chrome': '\\\\10.99.8.108\\aplicaciones\\CHROMESETUP.exe',
+            '7z2301 x64': 'C:\\otro\\7zip.exe',
+        }
+        combinadas = indice.generar_aplicaciones(existentes)
+        # Las entradas existentes no se tocan y lo ya referenciado no se duplica
+        for nombre, ruta in existentes.items():
+            self.assertEqual(combinadas[nombre], ruta)
+        self.assertNotIn('ChromeSetup', combinadas)
+        self.assertEqual(combinadas['Polichequeos Setup'],
+                         os.path.join(self.raiz, 'Polichequeos', 'instalador', 'polichequeos_setup.exe'))
+        # Nombre repetido con otra ruta: se distingue por el archivo
+        self.assertEqual(combinadas['7z2301 x64 (7z2301-x64.msi)'], os.path.join(self.raiz, '7z2301-x64.msi'))
+        self.assertEqual(len(combinadas), 4)
+        self.assertEqual(indice.generar_aplicaciones(combinadas), combinadas)
+
+    def test_nombre_aplicacion(self):
+        self.assertEqual(nombre_aplicacion('acrobat_reader-x64.exe'), 'Acrobat Reader x64')
+        self.assertEqual(nombre_aplicacion('VLC-3.0.20-win64.exe'), 'VLC 3 0 20 win64')
+
+
+if __name__ == '__main__':
+    unittest.main()
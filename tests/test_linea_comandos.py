@@ -0,0 +1,68 @@
+import os
+import json
+import tempfile
+import unittest
+from unittest import mock
+
+from linea_comandos import CredencialesEntorno, guardar_aplicaciones, resolver_patrones
+from motor_instalacion import MotorInstalacion, EventosInstalacion
+
+CONFIG = ('{\r\n'
+          '    "logs": {"directorio": null},\r\n'
+          '    "aplicaciones": {\r\n'
+          '        "Chrome": "\\\\\\\\srv\\\\ChromeSetup.exe"\r\n'
+          '    },\r\n'
+          '    "interfaz": {\r\n'
+          '        "_comentario": "sin { ni } que confundan",\r\n'
+          '        "frecuencia_hz": 20\r\n'
+          '    }\r\n'
+          '\r\n'
+          '}\r\n')
+
+
+class PruebasLineaComandos(unittest.TestCase):
+
+    def test_guardar_aplicaciones_solo_toca_su_clave(self):
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, 'config.json')
+            with open(ruta, 'w', encoding='utf-8', newline='') as f:
+                f.write(CONFIG)
+            aplicaciones = {'Chrome': '\\\\srv\\ChromeSetup.exe', 'Ñandú': 'C:\\nandu.msi'}
+            guardar_aplicaciones(ruta, aplicaciones)
+            with open(ruta, 'r', encoding='utf-8', newline='') as f:
+                texto = f.read()
+        self.assertEqual(json.loads(texto)['aplicaciones'], aplicaciones)
+        self.assertEqual(list(json.loads(texto)), ['logs', 'aplicaciones', 'interfaz'])
+        # Fuera de `aplicaciones` el archivo queda idéntico, con sus saltos CRLF
+        self.assertTrue(texto.startswith(CONFIG[:CONFIG.index('"Chrome"')]))
+        self.assertTrue(texto.endswith(CONFIG[CONFIG.index('    },\r\n    "interfaz"'):]))
+        self.assertNotIn('\n', texto.replace('\r\n', ''))
+
+    def test_resolver_patrones(self):
+        aplicaciones = {'Adobe Reader': '', 'Chrome': '', 'Adobe Acrobat': ''}
+        self.assertEqual(resolver_patrones(aplicaciones, ['adobe*', 'nada']),
+                         (['Adobe Reader', 'Adobe Acrobat'], ['nada']))
+
+    def test_credenciales_de_dominio_del_entorno(self):
+        with mock.patch.dict(os.environ, {'INSTALADOR_DOMINIO_USUARIO': 'ua\\operador',
+                                          'INSTALADOR_DOMINIO_PASSWORD': 'clave'}):
+            self.assertEqual(CredencialesEntorno().credenciales_dominio,
+                             {'usuario': 'ua\\operador', 'password': 'clave'})
+        with mock.patch.dict(os.environ, {'INSTALADOR_DOMINIO_USUARIO': ''}):
+            self.assertIsNone(CredencialesEntorno().credenciales_dominio)
+
+    def test_sin_credenciales_de_dominio_no_se_mapea(self):
+        motor = MotorInstalacion.__new__(MotorInstalacion)
+        motor.eventos = EventosInstalacion()
+        with mock.patch.dict(os.environ, {'INSTALADOR_DOMINIO_USUARIO': ''}):
+            motor.auth = CredencialesEntorno()
+        ruta = '\\\\10.99.8.108\\aplicaciones\\setup.exe'
+        with mock.patch('motor_instalacion.subprocess.run') as ejecutar, \
+                mock.patch.object(EventosInstalacion, 'mostrar_mensaje') as mostrar:
+            self.assertEqual(motor.mapear_unidad_red(ruta), ruta)
+        ejecutar.assert_not_called()
+        self.assertIn('Sin credenciales de dominio', mostrar.call_args[0][0])
+
+
+if __name__ == '__main__':
+    unittest.main()
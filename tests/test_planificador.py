@@ -0,0 +1,66 @@
+import threading
+import unittest
+from unittest import mock
+
+import planificador
+from planificador import PlanificadorInstalaciones
+from codigos_salida import REINTENTAR
+
+
+class PruebasPlanificador(unittest.TestCase):
+
+    def test_dependencias_y_prioridad(self):
+        plan = PlanificadorInstalaciones(
+            ['a', 'b', 'c'],
+            metadatos={'a': {'depende_de': ['c']}, 'b': {'prioridad': 5}},
+            maximo_concurrente=1)
+        self.assertEqual(plan.orden_previsto(), ['b', 'c', 'a'])
+
+    def test_reintento_diferido(self):
+        intentos = {'a': 0}
+
+        def instalar(app_name):
+            intentos[app_name] += 1
+            return REINTENTAR if intentos[app_name] == 1 else True
+
+        plan = PlanificadorInstalaciones(['a'], reintentos={'espera_base': 0.01})
+        self.assertEqual(plan.ejecutar(instalar), {'a': 'exitoso'})
+        self.assertEqual(intentos['a'], 2)
+
+    def test_reintento_bloqueado_por_recurso_no_gira(self):
+        """Un reintento vencido que espera al mutex MSI no debe despertar el bucle en vacío"""
+        lenta_en_marcha = threading.Event()
+        soltar_lenta = threading.Event()
+        intentos = {'rapida': 0, 'lenta': 0}
+
+        def instalar(app_name):
+            intentos[app_name] += 1
+            if app_name == 'rapida':
+                return REINTENTAR if intentos['rapida'] == 1 else True
+            lenta_en_marcha.set()
+            soltar_lenta.wait(5)
+            return True
+
+        llamadas = []
+        wait_original = planificador.wait
+
+        def contar_wait(*args, **kwargs):
+            llamadas.append(kwargs.get('timeout'))
+            return wait_original(*args, **kwargs)
+
+        plan = PlanificadorInstalaciones(
+            ['rapida', 'lenta'], metadatos={'rapida': {'prioridad': 1}},
+            limites_recurso={'msi-mutex': 1}, reintentos={'espera_base': 0.01})
+        # La lenta ocupa el mutex mientras vence la espera del reintento de la rápida
+        threading.Timer(0.5, soltar_lenta.set).start()
+        with mock.patch.object(planificador, 'wait', side_effect=contar_wait):
+            estados = plan.ejecutar(instalar)
+
+        self.assertTrue(lenta_en_marcha.is_set())
+        self.assertEqual(estados, {'rapida': 'exitoso', 'lenta': 'exitoso'})
+        self.assertLess(len(llamadas), 10, f"{len(llamadas)} llamadas a wait en 0,5 s")
+        self.assertIn(None, llamadas)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import json
+import logging
+import tempfile
+import unittest
+
+from registro import RegistroAplicacion
+
+
+class PruebasRegistro(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.registro = RegistroAplicacion({'directorio': self.directorio.name}).iniciar()
+
+    def tearDown(self):
+        self.registro.detener()
+        self.directorio.cleanup()
+
+    def leer(self):
+        # Detener vacía la cola: el oyente ya escribió todo
+        self.registro.detener()
+        with open(self.registro.ruta, 'r', encoding='utf-8') as f:
+            return [json.loads(linea) for linea in f]
+
+    def test_excepcion_va_aparte_del_mensaje(self):
+        logger = logging.getLogger('pruebas.registro')
+        try:
+            {}['falta']
+        except KeyError:
+            logger.exception("Falló %s", 'la copia', extra={'app': 'Chrome'})
+        registros = self.leer()
+        entradas = self.registro.anillo.desde(0)
+
+        self.assertEqual([entrada['mensaje'] for entrada in entradas], ['Falló la copia'])
+        self.assertEqual(len(registros), 1)
+        self.assertEqual(registros[0]['mensaje'], 'Falló la copia')
+        self.assertEqual(registros[0]['app'], 'Chrome')
+        self.assertIn('Traceback', registros[0]['excepcion'])
+        self.assertIn("KeyError: 'falta'", registros[0]['excepcion'])
+
+    def test_sin_excepcion_no_hay_campo(self):
+        logging.getLogger('pruebas.registro').warning("Sin red")
+        registros = self.leer()
+        self.assertEqual(registros[0]['nivel'], 'WARNING')
+        self.assertNotIn('excepcion', registros[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
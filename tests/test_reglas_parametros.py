@@ -0,0 +1,104 @@
+import os
+import json
+import tempfile
+import unittest
+
+import apps_manager
+from deteccion_instalador import analizar_instalador
+from reglas_parametros import ReglasParametros, AutomataPatrones
+from tests.test_deteccion_instalador import crear_pe
+
+
+class PruebasReglasParametros(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.directorio.name, 'parametros.json')
+        with open(self.ruta, 'w', encoding='utf-8') as f:
+            json.dump({
+                'reglas': {
+                    'rar': ['/S'],
+                    'winrar': ['/S', '/D=C:\\Program Files\\WinRAR'],
+                    '7z': ['/S'],
+                    '7zip': ['/S', '/D=C:\\Program Files\\7-Zip'],
+                    'chrome': ['--silent', '--install'],
+                    'zoom': ['/quiet', '/nogoogle'],
+                    'zoomrooms': {'parametros': ['/qn', 'ZRAUTOUPDATE=0'], 'tecnologias': ['msi']},
+                },
+                'por_tecnologia': {'msi': ['/qn', '/norestart'], 'nsis': ['/S']},
+                'por_defecto': ['/VERYSILENT'],
+            }, f)
+
+    def tearDown(self):
+        self.directorio.cleanup()
+        apps_manager.cargar_reglas_parametros()
+
+    def test_gana_la_regla_mas_larga(self):
+        reglas = ReglasParametros(self.ruta)
+        self.assertEqual(reglas.regla_para('winrar-x64-701es.exe'), 'winrar')
+        self.assertEqual(reglas.regla_para('7zip2301-x64.exe'), '7zip')
+        self.assertEqual(reglas.regla_para('rarreg.exe'), 'rar')
+        self.assertEqual(reglas.parametros_para('winrar-x64.exe'), ('/S', '/D=C:\\Program Files\\WinRAR'))
+
+    def test_automata_encuentra_solapados(self):
+        automata = AutomataPatrones(['he', 'she', 'hers', 'his'])
+        self.assertEqual(sorted(automata.buscar('ushers')), [(1, 'she'), (2, 'he'), (2, 'hers')])
+        self.assertEqual(automata.mas_largo('ushers'), 'hers')
+        self.assertIsNone(automata.mas_largo('xyz'))
+
+    def test_sin_regla_usa_la_tecnologia(self):
+        reglas = ReglasParametros(self.ruta)
+        self.assertEqual(reglas.parametros_para('setup_contable.exe', 'nsis'), ('/S',))
+        # Tecnología sin parámetros propios o no detectada: los por defecto
+        self.assertEqual(reglas.parametros_para('setup_contable.exe', 'squirrel'), ('/VERYSILENT',))
+        self.assertEqual(reglas.parametros_para('setup_contable.exe'), ('/VERYSILENT',))
+
+    def test_recargar_invalida_lo_memorizado(self):
+        apps_manager.cargar_reglas_parametros()
+        ruta = r'C:\temp\herramienta_interna.exe'
+        antes = apps_manager.obtener_parametros_silenciosos(ruta, 'nsis')
+        self.assertEqual(antes, [ruta, '/S'])
+        apps_manager.cargar_reglas_parametros({'reglas': {'herramienta_interna': ['/quiet']}})
+        self.assertEqual(apps_manager.obtener_parametros_silenciosos(ruta, 'nsis'), [ruta, '/quiet'])
+        apps_manager.cargar_reglas_parametros()
+        self.assertEqual(apps_manager.obtener_parametros_silenciosos(ruta, 'nsis'), antes)
+
+    def test_msi_no_usa_reglas_de_ejecutable(self):
+        reglas = ReglasParametros(self.ruta)
+        self.assertEqual(reglas.parametros_para('googlechromestandaloneenterprise64.msi', 'msi'),
+                         ('/qn', '/norestart'))
+        self.assertEqual(reglas.parametros_para('zoominstallerfull.msi', 'msi'), ('/qn', '/norestart'))
+        self.assertEqual(reglas.parametros_para('chromesetup.exe', 'nsis'), ('--silent', '--install'))
+
+    def test_regla_que_declara_msi(self):
+        reglas = ReglasParametros(self.ruta)
+        self.assertEqual(reglas.parametros_para('zoomrooms.msi', 'msi'), ('/qn', 'ZRAUTOUPDATE=0'))
+        # Para el .exe la regla declarada solo para MSI no cuenta: queda la de 'zoom'
+        self.assertEqual(reglas.parametros_para('zoomrooms.exe', None), ('/quiet', '/nogoogle'))
+
+    def test_comando_msiexec_con_reglas_reales(self):
+        apps_manager.cargar_reglas_parametros()
+        comando = apps_manager.obtener_parametros_silenciosos(
+            r'C:\temp\googlechromestandaloneenterprise64.msi', 'msi')
+        self.assertEqual(comando[:3], ['msiexec', '/i', r'C:\temp\googlechromestandaloneenterprise64.msi'])
+        self.assertNotIn('--silent', comando)
+        self.assertIn('/qn', comando)
+
+    def test_regla_generica_no_tapa_la_tecnologia_detectada(self):
+        apps_manager.cargar_reglas_parametros()
+        ruta = crear_pe(os.path.join(self.directorio.name, 'UltraVNC_Setup.exe'),
+                        overlay=b'\xef\xbe\xad\xdeNullsoftInst' + b'\0' * 64)
+        tecnologia = analizar_instalador(ruta)['tecnologia']
+        self.assertEqual(tecnologia, 'nsis')
+        self.assertEqual(apps_manager.obtener_parametros_silenciosos(ruta, tecnologia), [ruta, '/S'])
+        ergo = r'C:\temp\ergo_cliente.exe'
+        self.assertEqual(apps_manager.obtener_parametros_silenciosos(ergo, 'installshield'),
+                         [ergo, '/s', '/v/qn /norestart'])
+        # Inno o sin reconocer: la regla por nombre sigue valiendo
+        for tecnologia in ('inno', 'desconocida', None):
+            self.assertEqual(apps_manager.obtener_parametros_silenciosos(ergo, tecnologia),
+                             [ergo, '/VERYSILENT', '/SUPPRESSMSGBOXES', '/NORESTART', '/SP-'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import io
+import sys
+import tempfile
+import unittest
+import subprocess
+
+from salida_instalador import SalidaInstalador, lineas_acotadas
+
+
+class FlujoPorBloques(io.RawIOBase):
+    """Flujo que entrega los datos en los trozos indicados, como una tubería"""
+
+    def __init__(self, bloques):
+        self.bloques = list(bloques)
+
+    def readable(self):
+        return True
+
+    def read1(self, tamano=-1):
+        return self.bloques.pop(0) if self.bloques else b''
+
+
+class PruebasLineasAcotadas(unittest.TestCase):
+
+    def lineas(self, *bloques, **kwargs):
+        return list(lineas_acotadas(FlujoPorBloques(bloques), **kwargs))
+
+    def test_separadores(self):
+        self.assertEqual(self.lineas(b'uno\ndos\r\ntres\r10%\r20%\rfin'),
+                         [b'uno', b'dos', b'tres', b'10%', b'20%', b'fin'])
+        self.assertEqual(self.lineas(b'a\n\nb\n'), [b'a', b'', b'b'])
+
+    def test_crlf_partido_entre_bloques(self):
+        self.assertEqual(self.lineas(b'uno\r', b'\ndos\r', b'tres\r'), [b'uno', b'dos', b'tres'])
+
+    def test_linea_sin_salto_queda_acotada(self):
+        lineas = self.lineas(*[b'x' * 1000] * 50, b'\nfin', limite=4096)
+        self.assertTrue(all(len(linea) <= 4096 for linea in lineas))
+        self.assertEqual(b''.join(lineas[:-1]), b'x' * 50000)
+        self.assertEqual(lineas[-1], b'fin')
+
+
+class PruebasSalidaInstalador(unittest.TestCase):
+
+    def test_sigue_un_proceso(self):
+        with tempfile.TemporaryDirectory() as directorio:
+            proceso = subprocess.Popen(
+                [sys.executable, '-c',
+                 "import sys; sys.stdout.write('a\\r\\nb\\rc\\n'); sys.stderr.write('mal\\n')"],
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            salida = SalidaInstalador('Mi App', directorio).seguir(proceso)
+            proceso.wait()
+            salida.terminar()
+            self.assertEqual(sorted(salida.ultimas_lineas()), ['ERR: mal', 'a', 'b', 'c'])
+            with open(salida.ruta_log, 'r', encoding='utf-8') as f:
+                self.assertIn('[OUT] b\n', f.read())
+
+
+if __name__ == '__main__':
+    unittest.main()
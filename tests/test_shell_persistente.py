@@ -0,0 +1,38 @@
+import shutil
+import unittest
+import subprocess
+
+from shell_persistente import ShellPersistente, SH
+
+
+@unittest.skipIf(shutil.which('sh') is None or shutil.which('base64') is None, "shell sustituto (sh)")
+class PruebasShellPersistente(unittest.TestCase):
+
+    def setUp(self):
+        self.shell = ShellPersistente(dialecto=SH)
+
+    def tearDown(self):
+        self.shell.cerrar()
+
+    def test_un_solo_proceso_para_varios_scripts(self):
+        primero = self.shell.ejecutar("echo hola")
+        pid = self.shell._proceso.pid
+        segundo = self.shell.ejecutar("printf 'a\\nb\\n'; exit 3")
+        self.assertEqual(primero['codigo'], 0)
+        self.assertEqual(primero['salida'].strip(), 'hola')
+        self.assertEqual(segundo['codigo'], 3)
+        self.assertEqual(segundo['salida'].split(), ['a', 'b'])
+        self.assertEqual(self.shell._proceso.pid, pid)
+        self.assertTrue(self.shell.ping())
+
+    def test_reinicia_tras_timeout_y_caida(self):
+        with self.assertRaises(subprocess.TimeoutExpired):
+            self.shell.ejecutar("sleep 5", timeout=0.3)
+        self.assertEqual(self.shell.ejecutar("echo otra")['salida'].strip(), 'otra')
+        self.shell._proceso.kill()
+        self.shell._proceso.wait()
+        self.assertEqual(self.shell.ejecutar("echo de nuevo")['salida'].strip(), 'de nuevo')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import os
+import json
+import time
+import tempfile
+import unittest
+from unittest import mock
+
+from sondeos_inicio import SondeosInicio
+
+CMDKEY = "Destino: Domain:target=10.99.8.108\n    Usuario: UA\\operador\n"
+ADMINISTRADORES = "Administrator\r\nUA\\Domain Admins\r\noperador\r\n"
+
+
+class SondeosSimulados(SondeosInicio):
+    """Sondeos con respuestas fijas y un retardo configurable por sondeo"""
+
+    def __init__(self, retardos=None, admin=False, **kwargs):
+        super().__init__(recurso='\\\\10.99.8.108\\aplicaciones', **kwargs)
+        self.retardos = retardos or {}
+        self.admin = admin
+        self.llamadas = []
+
+    def _simular(self, nombre, valor):
+        self.llamadas.append(nombre)
+        time.sleep(self.retardos.get(nombre, 0))
+        return valor
+
+    def _sondear_credencial(self):
+        return self._simular('cmdkey', CMDKEY)
+
+    def _sondear_recurso(self):
+        return self._simular('recurso', True)
+
+    def _sondear_whoami(self):
+        return self._simular('whoami', 'EQUIPO\\operador')
+
+    def _sondear_grupo_administradores(self):
+        return self._simular('net_localgroup', ADMINISTRADORES)
+
+    def _es_administrador_proceso(self):
+        return self.admin
+
+
+class PruebasSondeosInicio(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.cache = os.path.join(self.directorio.name, 'sondeos.json')
+
+    def tearDown(self):
+        self.directorio.cleanup()
+
+    def test_sondeos_en_paralelo(self):
+        retardos = {'cmdkey': 0.3, 'recurso': 0.3, 'whoami': 0.3, 'net_localgroup': 0.3}
+        sondeos = SondeosSimulados(retardos, ruta_cache=self.cache)
+        inicio = time.perf_counter()
+        resultados = sondeos.resultados()
+        # En serie serían 1,2 s
+        self.assertLess(time.perf_counter() - inicio, 0.8)
+        self.assertEqual(resultados, {'credencial_dominio': True, 'administrador_local': True,
+                                      'whoami': 'EQUIPO\\operador'})
+        self.assertEqual(sorted(sondeos.llamadas), ['cmdkey', 'net_localgroup', 'recurso', 'whoami'])
+        self.assertIn('whoami', sondeos.resumen_tiempos())
+
+    def test_sondeo_colgado_toma_el_valor_conservador(self):
+        sondeos = SondeosSimulados({'net_localgroup': 3}, timeout=0.3, ruta_cache=self.cache)
+        inicio = time.perf_counter()
+        resultados = sondeos.resultados()
+        self.assertLess(time.perf_counter() - inicio, 1.5)
+        self.assertFalse(resultados['administrador_local'])
+        self.assertTrue(resultados['credencial_dominio'])
+        # Un resultado incompleto no se guarda para el siguiente arranque
+        self.assertFalse(os.path.exists(self.cache))
+
+    def test_cache_con_ttl(self):
+        primeros = SondeosSimulados(ruta_cache=self.cache, ttl=60).resultados()
+        segundos = SondeosSimulados(ruta_cache=self.cache, ttl=60)
+        self.assertEqual(segundos.resultados(), primeros)
+        self.assertTrue(segundos.desde_cache)
+        self.assertEqual(segundos.llamadas, [])
+
+        # Caducado: se vuelve a sondear
+        with open(self.cache, 'r', encoding='utf-8') as f:
+            datos = json.load(f)
+        datos['momento'] -= 61
+        with open(self.cache, 'w', encoding='utf-8') as f:
+            json.dump(datos, f)
+        terceros = SondeosSimulados(ruta_cache=self.cache, ttl=60)
+        terceros.resultados()
+        self.assertFalse(terceros.desde_cache)
+        self.assertTrue(terceros.llamadas)
+
+    def test_cache_de_otro_usuario_no_sirve(self):
+        SondeosSimulados(ruta_cache=self.cache, ttl=60).resultados()
+        with mock.patch('sondeos_inicio.getpass.getuser', return_value='otra_persona'):
+            otros = SondeosSimulados(ruta_cache=self.cache, ttl=60)
+            otros.resultados()
+        self.assertFalse(otros.desde_cache)
+
+    def test_ttl_cero_no_usa_cache(self):
+        SondeosSimulados(ruta_cache=self.cache, ttl=0).resultados()
+        self.assertFalse(os.path.exists(self.cache))
+
+    def test_administrador_del_proceso_no_consulta_el_grupo(self):
+        sondeos = SondeosSimulados(admin=True, ruta_cache=self.cache)
+        self.assertTrue(sondeos.resultados()['administrador_local'])
+        self.assertNotIn('net_localgroup', sondeos.llamadas)
+
+
+if __name__ == '__main__':
+    unittest.main()
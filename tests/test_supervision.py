@@ -0,0 +1,118 @@
+import os
+import time
+import tempfile
+import unittest
+import subprocess
+
+from supervision import ArbolProcesos, ArbolSesionPosix, InstalacionInactiva, PoliticaTimeouts, opciones_popen
+from historial import HistorialInstalaciones
+
+
+def lanzar(comando, intervalo=0.2):
+    proceso = subprocess.Popen(comando, shell=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                               **opciones_popen())
+    return proceso, ArbolProcesos.crear(proceso, intervalo=intervalo)
+
+
+def vivo(pid):
+    """True si el proceso existe y no es un zombi"""
+    try:
+        return ArbolSesionPosix._stat(pid)['estado'] != b'Z'
+    except (OSError, ValueError, IndexError):
+        return False
+
+
+def esperar_muertos(pids, segundos=3):
+    limite = time.monotonic() + segundos
+    while any(vivo(pid) for pid in pids) and time.monotonic() < limite:
+        time.sleep(0.05)
+    return [pid for pid in pids if vivo(pid)]
+
+
+@unittest.skipIf(os.name == 'nt' or not os.path.isdir('/proc'), "árbol de procesos POSIX (/proc)")
+class PruebasArbolPosix(unittest.TestCase):
+
+    def test_espera_al_nieto_separado(self):
+        """La raíz sale antes del primer intervalo; un nieto en otra sesión (setsid) sigue trabajando"""
+        proceso, arbol = lanzar("setsid sh -c 'sleep 1' & sleep 0.3; exit 3", intervalo=1.0)
+        self.assertIsInstance(arbol, ArbolSesionPosix)
+        inicio = time.monotonic()
+        self.assertEqual(arbol.esperar(30), 3)
+        self.assertGreaterEqual(time.monotonic() - inicio, 0.9)
+        self.assertEqual(arbol.residuales, 0)
+
+    def test_timeout_mata_el_arbol_sin_supervivientes(self):
+        proceso, arbol = lanzar("sleep 60 & setsid sleep 60 & sleep 60")
+        time.sleep(0.3)
+        pids = list(arbol._miembros())
+        self.assertGreaterEqual(len(pids), 4)
+        with self.assertRaises(subprocess.TimeoutExpired) as error:
+            arbol.esperar(1)
+        self.assertNotIsInstance(error.exception, InstalacionInactiva)
+        self.assertEqual(esperar_muertos(pids), [])
+
+    def test_inactividad(self):
+        avisos = []
+        proceso, arbol = lanzar("sleep 60 & sleep 60")
+        pids = [proceso.pid]
+        with self.assertRaises(InstalacionInactiva) as error:
+            arbol.esperar(30, inactividad=0.5, terminar_inactivos=True, al_inactivo=avisos.append)
+        self.assertGreaterEqual(error.exception.inactividad, 0.5)
+        self.assertEqual(len(avisos), 1)
+        self.assertEqual(esperar_muertos(pids), [])
+
+    def test_ocupado_no_es_inactivo(self):
+        avisos = []
+        proceso, arbol = lanzar("i=0; while [ $i -lt 200000 ]; do i=$((i+1)); done")
+        self.assertEqual(arbol.esperar(30, inactividad=0.5, al_inactivo=avisos.append), 0)
+        self.assertEqual(avisos, [])
+
+    def test_pid_reutilizado_no_recibe_senal(self):
+        ajeno = subprocess.Popen(['sleep', '60'], start_new_session=True)
+        try:
+            proceso, arbol = lanzar("sleep 60")
+            # Como si el PID de un descendiente ya terminado lo hubiera heredado otro proceso
+            arbol.conocidos[ajeno.pid] = ArbolSesionPosix._stat(ajeno.pid)['inicio'] - 1
+            self.assertNotIn(ajeno.pid, arbol._miembros())
+            arbol.terminar()
+            self.assertEqual(esperar_muertos([proceso.pid]), [])
+            self.assertIsNone(ajeno.poll())
+        finally:
+            ajeno.kill()
+            ajeno.wait()
+
+
+class PruebasPoliticaTimeouts(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.historial = HistorialInstalaciones(os.path.join(self.directorio.name, 'historial.db'))
+        ejecucion = self.historial.iniciar_ejecucion(1)
+        for i, duracion in enumerate(range(10, 210, 10)):
+            self.historial.registrar_intento(ejecucion, 'lenta', estado='exitoso', inicio=1000 + i,
+                                             duracion_ejecucion=duracion)
+        # Los fallos no cuentan para el p95
+        self.historial.registrar_intento(ejecucion, 'lenta', estado='fallido', inicio=2000,
+                                         duracion_ejecucion=5000)
+        self.historial.registrar_intento(ejecucion, 'nueva', estado='exitoso', inicio=2001,
+                                         duracion_ejecucion=30)
+
+    def tearDown(self):
+        self.historial.cerrar()
+        self.directorio.cleanup()
+
+    def test_p95_del_historial(self):
+        politica = PoliticaTimeouts(self.historial, factor=2.0, margen=60, minimo=120, maximo=3600)
+        limite = politica.timeout_para('lenta', 600)
+        self.assertEqual(limite['p95'], 190)
+        self.assertEqual(limite['muestras'], 20)
+        self.assertEqual(limite['timeout'], 190 * 2 + 60)
+
+    def test_limites_y_por_defecto(self):
+        self.assertEqual(PoliticaTimeouts(self.historial, maximo=300).timeout_para('lenta')['timeout'], 300)
+        sin_historial = PoliticaTimeouts(self.historial).timeout_para('nueva', 600)
+        self.assertEqual(sin_historial, {'timeout': 600, 'p95': None, 'muestras': 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
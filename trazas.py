@@ -0,0 +1,195 @@
+import os
+import json
+import time
+import logging
+import tempfile
+import threading
+import functools
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+MAXIMO_ARCHIVOS = 20        # Trazas que se conservan en el directorio
+MAXIMO_EVENTOS = 200000     # Tope de memoria si nadie exporta
+
+
+def directorio_trazas_por_defecto():
+    """Carpeta donde se guarda una traza por cola de instalación"""
+    base = os.environ.get('LOCALAPPDATA') or os.environ.get('TEMP') or tempfile.gettempdir()
+    return os.path.join(base, 'InstaladorMultiApp', 'trazas')
+
+
+class _TramoNulo:
+    """Tramo de un trazador desactivado: no mide ni guarda nada"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        return False
+
+    def anotar(self, **argumentos):
+        pass
+
+
+_TRAMO_NULO = _TramoNulo()
+
+
+class _Tramo:
+    __slots__ = ('trazador', 'nombre', 'categoria', 'argumentos', 'inicio')
+
+    def __init__(self, trazador, nombre, categoria, argumentos):
+        self.trazador = trazador
+        self.nombre = nombre
+        self.categoria = categoria
+        self.argumentos = argumentos
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        fin = time.perf_counter()
+        if tipo is not None:
+            self.argumentos['error'] = f"{tipo.__name__}: {valor}"
+        self.trazador._registrar({'name': self.nombre, 'cat': self.categoria, 'ph': 'X',
+                                  'ts': self.trazador._microsegundos(self.inicio),
+                                  'dur': round((fin - self.inicio) * 1e6, 1), 'args': self.argumentos})
+        return False
+
+    def anotar(self, **argumentos):
+        """Añade datos al tramo (se ven en el panel de detalles del visor)"""
+        self.argumentos.update(argumentos)
+
+
+class Trazador:
+    """Tramos con nombre alrededor de cada fase, exportables como traza de Chrome.
+
+    `tramo(nombre, categoria, **datos)` es un context manager; desactivado
+    devuelve siempre el mismo objeto vacío, así que instrumentar el camino
+    caliente solo cuesta una comprobación. Los tramos anidados en el mismo
+    hilo se dibujan anidados en chrome://tracing o https://ui.perfetto.dev.
+    """
+
+    def __init__(self, activo=False, directorio=None, maximo_archivos=MAXIMO_ARCHIVOS):
+        self.activo = activo
+        self.directorio = directorio or directorio_trazas_por_defecto()
+        self.maximo_archivos = maximo_archivos
+        self._lock = threading.Lock()
+        self._eventos = []
+        self._hilos = {}        # {ident: (tid corto, nombre del hilo)}
+        self._descartados = 0
+        self._origen = time.perf_counter()
+        self._origen_reloj = time.time()
+
+    def configurar(self, config):
+        """Aplica la sección `trazas` de config.json (sin perder lo ya registrado)"""
+        config = config or {}
+        self.activo = bool(config.get('activo', False))
+        self.directorio = config.get('directorio') or directorio_trazas_por_defecto()
+        self.maximo_archivos = config.get('maximo_archivos', MAXIMO_ARCHIVOS)
+        return self
+
+    # ------------------------------------------------------------------
+    # Registro
+    # ------------------------------------------------------------------
+    def tramo(self, nombre, categoria='general', **argumentos):
+        if not self.activo:
+            return _TRAMO_NULO
+        return _Tramo(self, nombre, categoria, argumentos)
+
+    def instante(self, nombre, categoria='general', **argumentos):
+        """Marca un momento puntual (p.ej. un reintento)"""
+        if self.activo:
+            self._registrar({'name': nombre, 'cat': categoria, 'ph': 'i', 's': 't',
+                             'ts': self._microsegundos(time.perf_counter()), 'args': argumentos})
+
+    def _microsegundos(self, instante):
+        return round((instante - self._origen) * 1e6, 1)
+
+    def _registrar(self, evento):
+        hilo = threading.current_thread()
+        with self._lock:
+            if len(self._eventos) >= MAXIMO_EVENTOS:
+                self._descartados += 1
+                return
+            tid = self._hilos.get(hilo.ident)
+            if tid is None:
+                tid = self._hilos[hilo.ident] = (len(self._hilos) + 1, hilo.name)
+            evento['tid'] = tid[0]
+            self._eventos.append(evento)
+
+    # ------------------------------------------------------------------
+    # Exportación
+    # ------------------------------------------------------------------
+    def traza(self, limpiar=False):
+        """Documento en formato Trace Event de Chrome: {'traceEvents': [...], ...}"""
+        pid = os.getpid()
+        with self._lock:
+            eventos, hilos, descartados = self._eventos, dict(self._hilos), self._descartados
+            if limpiar:
+                self._eventos, self._descartados = [], 0
+            else:
+                eventos = list(eventos)
+        metadatos = [{'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': 0,
+                      'args': {'name': 'Instalador MultiApp'}}]
+        metadatos += [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': nombre}}
+                      for tid, nombre in hilos.values()]
+        for evento in eventos:
+            evento['pid'] = pid
+        return {
+            'traceEvents': metadatos + eventos,
+            'displayTimeUnit': 'ms',
+            'otherData': {'inicio': datetime.fromtimestamp(self._origen_reloj).isoformat(timespec='seconds'),
+                          'eventos_descartados': descartados},
+        }
+
+    def exportar(self, ruta=None):
+        """Guarda lo registrado hasta ahora y lo vacía. Devuelve la ruta, o None si no había nada"""
+        if not self._eventos:
+            return None
+        documento = self.traza(limpiar=True)
+        ruta = ruta or os.path.join(self.directorio, f"traza_{datetime.now():%Y%m%d_%H%M%S}.json")
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(ruta)), exist_ok=True)
+            with open(ruta, 'w', encoding='utf-8') as f:
+                json.dump(documento, f, ensure_ascii=False)
+        except OSError as e:
+            logger.warning(f"No se pudo guardar la traza {ruta}: {e}")
+            return None
+        self._podar()
+        return ruta
+
+    def _podar(self):
+        """Borra las trazas más antiguas por encima de `maximo_archivos`"""
+        try:
+            trazas = sorted(
+                (os.path.join(self.directorio, nombre) for nombre in os.listdir(self.directorio)
+                 if nombre.startswith('traza_') and nombre.endswith('.json')),
+                key=os.path.getmtime)
+            for ruta in trazas[:max(len(trazas) - self.maximo_archivos, 0)]:
+                os.remove(ruta)
+        except OSError as e:
+            logger.debug(f"No se pudieron podar las trazas antiguas: {e}")
+
+
+# Trazador de la aplicación: la configuración lo activa al cargar config.json
+trazador = Trazador()
+# Atajo (método ligado, sin llamada intermedia: desactivado apenas cuesta nada)
+tramo = trazador.tramo
+
+
+def trazado(categoria='general', nombre=None):
+    """Decorador: cada llamada a la función es un tramo con su nombre"""
+    def decorador(funcion):
+        etiqueta = nombre or funcion.__name__
+
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not trazador.activo:
+                return funcion(*args, **kwargs)
+            with _Tramo(trazador, etiqueta, categoria, {}):
+                return funcion(*args, **kwargs)
+        return envoltura
+    return decorador